@@ -1,35 +1,240 @@
 import os
 import logging
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+import hashlib
+import hmac
+import secrets
+from flask import (Flask, Request, render_template, request, redirect, url_for, flash, session, jsonify, g, Response,
+                   stream_with_context)
 import uuid
-from werkzeug.utils import secure_filename
 import tempfile
-import os.path
+import time
 
-from resume_parser import parse_resume
-from job_analyzer import analyze_job_description
-from skill_matcher import match_skills, calculate_skill_gaps, get_recommendations
+from resume_parser import parse_resume, sniff_format, PARSER_VERSION
+from parse_cache import ParseCache, hash_stream
+from job_cache import JobCache, text_key
+from response_cache import ResponseCache, CachedResponse
+from skill_matcher import analyze_skill_gaps, SIMILARITY_INDEX, LEARNING_PLANNER
+from batch_scoring import rank_resumes, DEFAULT_TOP_K
+from skill_index import SkillIndex
+from session_store import create_session_store
+from task_queue import TaskQueue, QueueFull, parse_resume_task, analyze_job_task
+from job_comparison import JobComparer, rank_comparisons, COMPARE_DEADLINE, COMPARE_MAX_JOBS
+from taxonomy import TAXONOMY
+from metrics import METRICS
+from timing import StageTimer
+from profiling import start_request_profile
+import nlp_resources
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Uploads up to this many bytes stay in memory; larger ones spill to a temporary file
+UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', 4 * 1024 * 1024))
+
+# Bearer token that callers of /api/search_resumes must send (unset disables the endpoint)
+SEARCH_API_TOKEN = os.environ.get('SEARCH_API_TOKEN', '')
+
+# Most resumes one search returns
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 100))
+
+
+class SpooledUploadRequest(Request):
+    """Request that buffers uploaded files in memory up to UPLOAD_SPOOL_BYTES.
+
+    The parser reads the upload stream directly, so a typical resume is
+    never written to disk.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+
+
 # Create the Flask app
 app = Flask(__name__)
-app.secret_key = os.environ.get("SESSION_SECRET", "resume-analyzer-secret")
+app.request_class = SpooledUploadRequest
+app.secret_key = os.environ.get("SESSION_SECRET")
+if not app.secret_key:
+    # Workers forked after the app is imported share it; sessions do not outlive the server
+    logger.warning("SESSION_SECRET is not set; signing sessions with a random key")
+    app.secret_key = secrets.token_hex(32)
 
 # Configure upload settings
-UPLOAD_FOLDER = tempfile.gettempdir()
-ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
 
-# In-memory storage for user data
-user_data = {}
+# Inverted index from skill to the users whose resume lists it
+skill_index = SkillIndex()
+
+def forget_user(user_id):
+    """Drop what is derived from a user's record, once the session store no longer has it."""
+    response_cache.invalidate(user_id)
+    skill_index.remove(user_id)
+
+# Storage for user data, in memory or in a database shared by all workers
+user_store = create_session_store(on_delete=forget_user)
+if not user_store.shared:
+    # The users indexed before this server started are gone with its memory store
+    skill_index.clear()
+
+# Parsed resumes keyed by the SHA-256 of the uploaded bytes
+parse_cache = ParseCache(PARSER_VERSION)
+
+# Analyzed job descriptions keyed by their normalized text, with near-duplicate detection
+job_cache = JobCache()
+
+# Rendered analysis views keyed by user and the version of their record
+response_cache = ResponseCache()
 
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+# Background queue for async uploads and analyses, started on first use
+_task_queue = None
+
+# Process pool matching one resume against many jobs, started on first use
+_job_comparer = None
+
+# Request metrics, exported on /metrics with the pipeline metrics
+REQUEST_SECONDS = METRICS.histogram('http_request_seconds', 'Request handling time.', labels=('endpoint', 'method'))
+REQUESTS = METRICS.counter('http_requests_total', 'Requests handled.', labels=('endpoint', 'method', 'status'))
+METRICS.callback(
+    'parse_cache_lookups_total', 'Parse cache lookups by result.',
+    lambda: {('memory_hit',): parse_cache.hits - parse_cache.disk_hits, ('disk_hit',): parse_cache.disk_hits,
+             ('miss',): parse_cache.misses},
+    kind='counter', labels=('result',)
+)
+METRICS.callback(
+    'job_cache_lookups_total', 'Job analysis cache lookups by result.',
+    lambda: {('hit',): job_cache.hits, ('near_hit',): job_cache.near_hits, ('miss',): job_cache.misses},
+    kind='counter', labels=('result',)
+)
+METRICS.callback(
+    'response_cache_lookups_total', 'Rendered view cache lookups by result.',
+    lambda: {('hit',): response_cache.hits, ('miss',): response_cache.misses},
+    kind='counter', labels=('result',)
+)
+METRICS.callback('session_store_entries', 'Sessions held by the session store.', lambda: user_store.stats()['entries'])
+METRICS.callback('task_queue_pending', 'Background tasks waiting to run.',
+                 lambda: _task_queue.stats()['pending'] if _task_queue else 0)
+METRICS.callback('compare_jobs_pending', 'Comparison jobs queued or running.',
+                 lambda: _job_comparer.stats()['pending'] if _job_comparer else 0)
+
+def get_task_queue():
+    global _task_queue
+    if _task_queue is None:
+        _task_queue = TaskQueue()
+    return _task_queue
+
+def get_job_comparer():
+    global _job_comparer
+    if _job_comparer is None:
+        _job_comparer = JobComparer()
+    return _job_comparer
+
+def wants_async():
+    return request.values.get('async') == '1'
+
+def queue_full_response(error):
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = '5'
+    return response
+
+def store_resume(user_id, resume):
+    record = user_store.get(user_id) or {}
+    record['resume'] = resume
+    record['updated_at'] = time.time()
+    user_store.put(user_id, record)
+    response_cache.invalidate(user_id)
+    skill_index.add(user_id, resume.skills)
+
+def store_job(user_id, record, analysis):
+    """Add a SkillGapAnalysis to the user record and return its index.
+
+    A posting pasted again under the same title replaces its earlier
+    analysis instead of being added twice.
+    """
+    if 'jobs' not in record:
+        record['jobs'] = []
+    
+    # Analyses made outside the job cache, by a background task, carry the text to key them by
+    if analysis.text_key is None:
+        analysis.job.text_key = text_key(analysis.description or '')
+    for job_index, stored in enumerate(record['jobs']):
+        if stored.title == analysis.title and stored.text_key == analysis.text_key:
+            record['jobs'][job_index] = analysis
+            break
+    else:
+        record['jobs'].append(analysis)
+        job_index = len(record['jobs']) - 1
+    record['updated_at'] = time.time()
+    user_store.put(user_id, record)
+    response_cache.invalidate(user_id)
+    return job_index
+
+def cached_view(view, render, mimetype='text/html'):
+    """Serve a view of the user's record from the response cache, rendering it on a miss.
+
+    render takes the record, or None when there is none, and returns the body
+    as a string or a response to send as is, such as a redirect. Responses
+    carry an ETag and Last-Modified, so browsers revalidate them and get a
+    304 while the record is unchanged. Pages are not cached while flashed
+    messages are pending, as the page shows them.
+    """
+    user_id = session.get('user_id')
+    version = user_store.version(user_id) if user_id else None
+    cacheable = version is not None and not (mimetype == 'text/html' and '_flashes' in session)
+    cached = response_cache.get(user_id, view, version) if cacheable else None
+    
+    if cached is None:
+        record = user_store.get(user_id) if version is not None else None
+        body = render(record)
+        if not isinstance(body, str):
+            return body
+        body = body.encode('utf-8')
+        last_modified = record.get('updated_at') or None
+        if cacheable:
+            cached = response_cache.put(user_id, view, record.get('updated_at', 0.0), body, mimetype, last_modified)
+        else:
+            cached = CachedResponse(body, mimetype, last_modified)
+    
+    response = Response(cached.body, mimetype=cached.mimetype)
+    response.set_etag(cached.etag)
+    if cached.last_modified:
+        response.last_modified = cached.last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def warm_up():
+    """Load NLTK data and derived tables before serving, e.g. before gunicorn forks."""
+    start = time.perf_counter()
+    nlp_resources.preload()
+    TAXONOMY.scanner().compile()
+    SIMILARITY_INDEX.preload()
+    LEARNING_PLANNER.preload()
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s")
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    g.profile = start_request_profile(request.headers)
+
+@app.after_request
+def record_request_metrics(response):
+    endpoint = request.endpoint or 'unmatched'
+    if 'request_start' in g:
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint=endpoint, method=request.method)
+    REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    
+    profile = g.pop('profile', None)
+    if profile is not None:
+        response.headers['X-Profile-Report'] = profile.stop(f"{request.method} {request.path}")
+    return response
+
+@app.teardown_request
+def stop_unfinished_profile(error=None):
+    # A request that raised never reached after_request
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop(f"{request.method} {request.path} (failed)")
 
 @app.route('/')
 def index():
@@ -49,57 +254,84 @@ def upload_resume():
         flash('No selected file', 'danger')
         return redirect(request.url)
     
-    # Check if file type is allowed
-    if file and allowed_file(file.filename):
-        # Generate a session ID if not exists
-        if 'user_id' not in session:
-            session['user_id'] = str(uuid.uuid4())
-        
-        user_id = session['user_id']
+    # Check the file type from its content; the filename is not trusted
+    file_format = sniff_format(file.stream)
+    if file_format == 'doc':
+        flash('Legacy Word .doc files are not supported. Please save the resume as .docx or PDF.', 'danger')
+        return redirect(url_for('index'))
+    if file_format is None:
+        flash('File type not allowed. Please upload a PDF or Word document.', 'danger')
+        return redirect(url_for('index'))
+    
+    # Generate a session ID if not exists
+    if 'user_id' not in session:
+        session['user_id'] = str(uuid.uuid4())
+    
+    user_id = session['user_id']
+    
+    # Hash the upload, so a re-upload skips parsing
+    timer = StageTimer(pipeline='upload_resume')
+    with timer.stage('read_upload'):
+        content_hash = hash_stream(file.stream)
+        file.stream.seek(0)
+    with timer.stage('cache_lookup'):
+        resume = parse_cache.get(content_hash)
+    
+    if resume is None and wants_async():
+        # Hand the upload bytes over to a background task
+        try:
+            task_id = get_task_queue().submit(parse_resume_task, file.stream.read(), owner=user_id,
+                                              meta={'content_hash': content_hash})
+        except QueueFull as e:
+            return queue_full_response(e)
+        return jsonify({'task_id': task_id, 'status_url': url_for('task_status', task_id=task_id)}), 202
+    
+    try:
+        if resume is None:
+            # Parse resume straight from the upload stream
+            with timer.stage('parse'):
+                resume = parse_resume(file.stream)
+            parse_cache.put(content_hash, resume)
         
-        # Save file temporarily
-        filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        # Store data
+        with timer.stage('store'):
+            store_resume(user_id, resume)
         
-        try:
-            # Parse resume
-            resume_data = parse_resume(file_path)
-            
-            # Store data in memory
-            if user_id not in user_data:
-                user_data[user_id] = {}
-            
-            user_data[user_id]['resume'] = resume_data
-            
-            # Redirect to resume analysis page
-            return redirect(url_for('resume_analysis'))
-        except Exception as e:
-            logger.error(f"Error parsing resume: {str(e)}")
-            flash(f'Error parsing resume: {str(e)}', 'danger')
-            return redirect(url_for('index'))
-        finally:
-            # Clean up temp file
-            if os.path.exists(file_path):
-                os.remove(file_path)
-    else:
-        flash('File type not allowed. Please upload a PDF or Word document.', 'danger')
+        # Redirect to resume analysis page
+        if wants_async():
+            return jsonify({'status': 'done', 'redirect': url_for('resume_analysis')})
+        return redirect(url_for('resume_analysis'))
+    except Exception as e:
+        logger.error(f"Error parsing resume: {str(e)}")
+        flash(f'Error parsing resume: {str(e)}', 'danger')
         return redirect(url_for('index'))
 
 @app.route('/resume_analysis')
 def resume_analysis():
-    user_id = session.get('user_id')
-    if not user_id or user_id not in user_data or 'resume' not in user_data[user_id]:
+    return cached_view('resume_analysis', _render_resume_analysis)
+
+def _render_resume_analysis(record):
+    if not record or 'resume' not in record:
         flash('Please upload your resume first', 'warning')
         return redirect(url_for('index'))
     
-    resume_data = user_data[user_id]['resume']
-    return render_template('resume_analysis.html', resume=resume_data)
+    return render_template('resume_analysis.html', resume=record['resume'])
+
+@app.route('/api/resume_analysis')
+def api_resume_analysis():
+    return cached_view('api/resume_analysis', _resume_analysis_json, 'application/json')
+
+def _resume_analysis_json(record):
+    if not record or 'resume' not in record:
+        return jsonify({'error': 'No resume uploaded'}), 404
+    
+    return app.json.dumps({'resume': record['resume'].to_dict(keep_raw_text=False)})
 
 @app.route('/analyze_job', methods=['POST'])
 def analyze_job():
     user_id = session.get('user_id')
-    if not user_id or user_id not in user_data or 'resume' not in user_data[user_id]:
+    record = user_store.get(user_id) if user_id else None
+    if not record or 'resume' not in record:
         flash('Please upload your resume first', 'warning')
         return redirect(url_for('index'))
     
@@ -110,43 +342,44 @@ def analyze_job():
         flash('Please enter a job description', 'warning')
         return redirect(url_for('resume_analysis'))
     
-    # Analyze job description
-    job_data = analyze_job_description(job_description, job_title)
+    resume = record['resume']
     
-    # Store job data
-    if 'jobs' not in user_data[user_id]:
-        user_data[user_id]['jobs'] = []
+    if wants_async():
+        try:
+            task_id = get_task_queue().submit(analyze_job_task, resume, job_description, job_title, owner=user_id)
+        except QueueFull as e:
+            return queue_full_response(e)
+        return jsonify({'task_id': task_id, 'status_url': url_for('task_status', task_id=task_id)}), 202
     
-    user_data[user_id]['jobs'].append(job_data)
+    # Analyze job description
+    timer = StageTimer(pipeline='analyze_job')
+    with timer.stage('analyze'):
+        job = job_cache.analyze(job_description, job_title)
     
-    # Match skills and calculate gaps
-    resume_skills = user_data[user_id]['resume']['skills']
-    match_percentage, matching_skills, missing_skills = match_skills(resume_skills, job_data['required_skills'])
-    skill_gaps = calculate_skill_gaps(resume_skills, job_data['required_skills'])
-    recommendations = get_recommendations(missing_skills)
+    # Match skills, calculate gaps and plan what to learn
+    with timer.stage('skill_gaps'):
+        analysis = analyze_skill_gaps(resume, job)
     
-    # Store analysis results
-    job_data['match_percentage'] = match_percentage
-    job_data['matching_skills'] = matching_skills
-    job_data['missing_skills'] = missing_skills
-    job_data['skill_gaps'] = skill_gaps
-    job_data['recommendations'] = recommendations
+    # Store the analysis
+    job_index = store_job(user_id, record, analysis)
     
-    return redirect(url_for('skill_gaps', job_index=len(user_data[user_id]['jobs']) - 1))
+    return redirect(url_for('skill_gaps', job_index=job_index))
 
 @app.route('/skill_gaps/<int:job_index>')
 def skill_gaps(job_index):
-    user_id = session.get('user_id')
-    if not user_id or user_id not in user_data or 'resume' not in user_data[user_id]:
+    return cached_view(f'skill_gaps/{job_index}', lambda record: _render_skill_gaps(record, job_index))
+
+def _render_skill_gaps(record, job_index):
+    if not record or 'resume' not in record:
         flash('Please upload your resume first', 'warning')
         return redirect(url_for('index'))
     
-    if 'jobs' not in user_data[user_id] or job_index >= len(user_data[user_id]['jobs']):
+    if 'jobs' not in record or job_index >= len(record['jobs']):
         flash('Job not found', 'danger')
         return redirect(url_for('resume_analysis'))
     
-    resume = user_data[user_id]['resume']
-    job = user_data[user_id]['jobs'][job_index]
+    resume = record['resume']
+    job = record['jobs'][job_index]
     
     return render_template(
         'skill_gaps.html', 
@@ -155,14 +388,235 @@ def skill_gaps(job_index):
         job_index=job_index
     )
 
+@app.route('/api/skill_gaps/<int:job_index>')
+def api_skill_gaps(job_index):
+    return cached_view(f'api/skill_gaps/{job_index}', lambda record: _skill_gaps_json(record, job_index),
+                       'application/json')
+
+def _skill_gaps_json(record, job_index):
+    if not record or 'resume' not in record:
+        return jsonify({'error': 'No resume uploaded'}), 404
+    
+    if 'jobs' not in record or job_index >= len(record['jobs']):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return app.json.dumps({'job_index': job_index, 'analysis': record['jobs'][job_index].to_dict(keep_raw_text=False)})
+
+def _is_skill_list(value):
+    return isinstance(value, list) and all(isinstance(skill, str) for skill in value)
+
+def _is_rankable_job(job):
+    """Whether a job sent to api_rank_resumes has analyzed skills or a description to analyze."""
+    if not isinstance(job, dict):
+        return False
+    if 'required_skills' in job:
+        return _is_skill_list(job['required_skills'])
+    return isinstance(job.get('description', ''), str) and isinstance(job.get('title', ''), str)
+
+@app.route('/api/rank_resumes', methods=['POST'])
+def api_rank_resumes():
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    resumes = payload.get('resumes') or []
+    jobs = payload.get('jobs') or []
+    top_k = payload.get('top_k', DEFAULT_TOP_K)
+    
+    if (not isinstance(resumes, list) or not isinstance(jobs, list) or isinstance(top_k, bool)
+            or not isinstance(top_k, int) or top_k < 1):
+        return jsonify({'error': 'Expected "resumes" and "jobs" lists and a positive "top_k"'}), 400
+    if not all(isinstance(resume, dict) and _is_skill_list(resume.get('skills', [])) for resume in resumes):
+        return jsonify({'error': 'Expected every resume to be an object with a "skills" list of strings'}), 400
+    if not all(_is_rankable_job(job) for job in jobs):
+        return jsonify({'error': 'Expected every job to be an object with a "required_skills" list of strings '
+                                 'or a "description" string'}), 400
+    
+    # Jobs may be sent pre-analyzed or as raw description text
+    job_skill_lists = []
+    for job in jobs:
+        if 'required_skills' in job:
+            job_skill_lists.append(job['required_skills'])
+        else:
+            job_skill_lists.append(job_cache.analyze(job.get('description', ''), job.get('title', '')).required_skills)
+    
+    rankings = rank_resumes([resume.get('skills', []) for resume in resumes], job_skill_lists, top_k)
+    
+    return jsonify({'rankings': [
+        {
+            'job': job.get('id', job_index),
+            'candidates': [
+                {'resume': resumes[row].get('id', row), 'match_percentage': score}
+                for row, score in ranking
+            ]
+        }
+        for job_index, (job, ranking) in enumerate(zip(jobs, rankings))
+    ]})
+
+@app.route('/api/compare_jobs', methods=['POST'])
+def api_compare_jobs():
+    """Match the user's resume against many job descriptions at once.
+
+    Streams one JSON line per job as it finishes, then a last line with the
+    ranked comparison table. Jobs not finished within the deadline are
+    reported as timed out.
+    """
+    user_id = session.get('user_id')
+    record = user_store.get(user_id) if user_id else None
+    if not record or 'resume' not in record:
+        return jsonify({'error': 'No resume uploaded'}), 404
+    
+    payload = request.get_json(silent=True) or {}
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    jobs = payload.get('jobs')
+    deadline = payload.get('deadline', COMPARE_DEADLINE)
+    
+    if (not isinstance(jobs, list) or not 0 < len(jobs) <= COMPARE_MAX_JOBS
+            or not all(isinstance(job, dict) and isinstance(job.get('description'), str) for job in jobs)):
+        return jsonify({'error': f'Expected a "jobs" list of 1 to {COMPARE_MAX_JOBS} objects with a "description"'}), 400
+    # bool is an int, and NaN compares false with everything
+    if not isinstance(deadline, (int, float)) or isinstance(deadline, bool) or not deadline > 0:
+        return jsonify({'error': 'Expected a positive "deadline" in seconds'}), 400
+    
+    jobs = [(job.get('title') or f'Job {index + 1}', job['description']) for index, job in enumerate(jobs)]
+    try:
+        results = get_job_comparer().compare(record['resume'], jobs, min(deadline, COMPARE_DEADLINE))
+    except QueueFull as e:
+        return queue_full_response(e)
+    
+    def stream():
+        start = time.perf_counter()
+        finished = []
+        try:
+            for index, status, value in results:
+                finished.append((index, status, value))
+                line = {'type': 'result', 'index': index, 'title': jobs[index][0], 'status': status}
+                if status == 'done':
+                    line['analysis'] = value.to_dict(keep_raw_text=False)
+                else:
+                    line['error'] = value
+                yield app.json.dumps(line) + '\n'
+        finally:
+            results.close()
+        yield app.json.dumps({
+            'type': 'ranking',
+            'jobs': rank_comparisons(jobs, finished),
+            'seconds': round(time.perf_counter() - start, 3)
+        }) + '\n'
+    
+    return Response(stream_with_context(stream()), mimetype='application/x-ndjson')
+
+def _skill_list_arg(name):
+    return [skill for skill in request.args.get(name, '').split(',') if skill.strip()]
+
+def _search_caller():
+    """Return the bearer token of an authorized search caller, or None."""
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if SEARCH_API_TOKEN and scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), SEARCH_API_TOKEN.encode()):
+        return token
+    return None
+
+def resume_handle(caller, user_id):
+    """Opaque, stable name of a user's resume for one caller, which does not reveal the user ID."""
+    message = f"{caller}\0{user_id}".encode('utf-8')
+    return hmac.new(app.secret_key.encode('utf-8'), message, hashlib.sha256).hexdigest()[:32]
+
+@app.route('/api/search_resumes')
+def api_search_resumes():
+    """Find stored resumes by skill, for callers holding SEARCH_API_TOKEN.
+
+    Results name resumes by handles derived from the caller's token, never
+    by the session user IDs the index is keyed on.
+    """
+    caller = _search_caller()
+    if caller is None:
+        return jsonify({'error': 'Resume search needs a valid bearer token'}), 401
+    
+    all_of = _skill_list_arg('all')
+    any_of = _skill_list_arg('any')
+    none_of = _skill_list_arg('none')
+    rank_by = _skill_list_arg('rank_by')
+    limit = min(max(request.args.get('limit', SEARCH_MAX_RESULTS, type=int), 1), SEARCH_MAX_RESULTS)
+    
+    if not all_of and not any_of:
+        return jsonify({'error': 'Give at least one skill in "all" or "any"'}), 400
+    
+    if rank_by:
+        results = skill_index.rank(rank_by, all_of, any_of, none_of, limit=limit)
+    else:
+        results = [(key, None) for key in skill_index.query(all_of, any_of, none_of)[:limit]]
+    
+    return jsonify({'results': [
+        {'resume': resume_handle(caller, key), 'match_percentage': score} for key, score in results
+    ]})
+
+@app.route('/tasks/<task_id>')
+def task_status(task_id):
+    task_queue = get_task_queue()
+    task = task_queue.get(task_id)
+    if not task or task['owner'] != session.get('user_id'):
+        return jsonify({'error': 'Task not found'}), 404
+    
+    if task['status'] in ('queued', 'running'):
+        return jsonify({'task_id': task_id, 'status': task['status']})
+    
+    # Finished: hand the result over to the user record exactly once
+    task = task_queue.pop(task_id)
+    if task is None:
+        return jsonify({'error': 'Task not found'}), 404
+    if task['status'] != 'done':
+        return jsonify({'task_id': task_id, 'status': task['status'], 'error': task['error']})
+    
+    user_id = task['owner']
+    if task['kind'] == 'parse_resume_task':
+        parse_cache.put(task['meta']['content_hash'], task['result'])
+        store_resume(user_id, task['result'])
+        redirect_url = url_for('resume_analysis')
+    else:
+        record = user_store.get(user_id)
+        if not record or 'resume' not in record:
+            return jsonify({'task_id': task_id, 'status': 'failed', 'error': 'Session expired'})
+        job_index = store_job(user_id, record, task['result'])
+        redirect_url = url_for('skill_gaps', job_index=job_index)
+    
+    return jsonify({'task_id': task_id, 'status': 'done', 'redirect': redirect_url})
+
+@app.route('/task_queue_stats')
+def task_queue_stats():
+    return jsonify(get_task_queue().stats())
+
+@app.route('/compare_jobs_stats')
+def compare_jobs_stats():
+    return jsonify(get_job_comparer().stats())
+
+@app.route('/parse_cache_stats')
+def parse_cache_stats():
+    return jsonify(parse_cache.stats())
+
+@app.route('/job_cache_stats')
+def job_cache_stats():
+    return jsonify(job_cache.stats())
+
+@app.route('/metrics')
+def metrics():
+    return Response(METRICS.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/response_cache_stats')
+def response_cache_stats():
+    return jsonify(response_cache.stats())
+
+@app.route('/session_store_stats')
+def session_store_stats():
+    return jsonify(user_store.stats())
+
 # Removed job listing and job matches routes to focus only on the analysis section
 
 @app.route('/clear_data', methods=['POST'])
 def clear_data():
     if 'user_id' in session:
         user_id = session['user_id']
-        if user_id in user_data:
-            del user_data[user_id]
+        # The store's delete hook drops the user's cached views and index entry
+        user_store.delete(user_id)
         session.pop('user_id', None)
     
     flash('Your data has been cleared', 'success')
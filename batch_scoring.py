@@ -0,0 +1,149 @@
+import logging
+import re
+
+import numpy as np
+
+from skill_matcher import SIMILARITY_INDEX, _is_close_substring
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 10
+
+
+def _skills_of(item, key):
+    """Accept either a plain list of skills or a parsed dict holding one."""
+    if isinstance(item, dict):
+        return item.get(key) or []
+    return item or []
+
+
+def _resume_columns(resume_skills):
+    """Give every distinct resume skill a column, lower-casing each spelling once.
+
+    Returns the lower-cased names by column and the (row, column) pairs of
+    the skills each resume holds, rows ascending.
+    """
+    columns = {}
+    spellings = {}
+    rows = []
+    held = []
+    for row, skills in enumerate(resume_skills):
+        for skill in skills:
+            column = spellings.get(skill)
+            if column is None:
+                column = spellings[skill] = columns.setdefault(skill.lower(), len(columns))
+            rows.append(row)
+            held.append(column)
+    return list(columns), np.array(rows, dtype=np.intp), np.array(held, dtype=np.intp)
+
+
+class _SimilarColumns:
+    """The resume skill columns that is_similar_skill pairs with a job skill.
+
+    Each rule is looked up rather than tested pair by pair: taxonomy IDs and
+    their related IDs against the column IDs, WordNet lemmas through an
+    inverted map, and close substrings by searching the joined names for the
+    job skill and the job skill's substrings among the names.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.columns = {name: column for column, name in enumerate(names)}
+        self.ids = np.array([-1 if skill_id is None else skill_id for skill_id in map(SIMILARITY_INDEX.skill_id, names)],
+                            dtype=np.intp)
+        self.by_lemma = {}
+        for column, name in enumerate(names):
+            for lemma in SIMILARITY_INDEX.lemmas(name):
+                self.by_lemma.setdefault(lemma, []).append(column)
+        # Names joined by a separator no skill holds, and the offset each starts at
+        self.joined = '\0'.join(names)
+        self.starts = np.cumsum([0] + [len(name) + 1 for name in names[:-1]])
+
+    def __call__(self, skill):
+        if not self.names:
+            return []
+        lower = skill.lower()
+        similar = set()
+        if lower in self.columns:
+            similar.add(self.columns[lower])
+
+        skill_id = SIMILARITY_INDEX.skill_id(skill)
+        if skill_id is not None:
+            related = np.append(SIMILARITY_INDEX.taxonomy.similar_ids(skill_id), skill_id)
+            similar.update(np.flatnonzero(np.isin(self.ids, related)).tolist())
+
+        for lemma in SIMILARITY_INDEX.lemmas(skill):
+            similar.update(self.by_lemma.get(lemma, ()))
+
+        # Names containing the skill, and names the skill contains
+        offsets = [match.start() for match in re.finditer(re.escape(lower), self.joined)]
+        candidates = set((np.searchsorted(self.starts, offsets, side='right') - 1).tolist())
+        substrings = {lower[i:j] for i in range(len(lower)) for j in range(i + 1, len(lower) + 1)}
+        candidates.update(self.columns[name] for name in substrings | {''} if name in self.columns)
+        similar.update(column for column in candidates - similar if _is_close_substring(skill, self.names[column]))
+        return list(similar)
+
+
+def score_matrix(resumes, jobs):
+    """Return the match_skills percentage of every resume against every job.
+
+    resumes are skill lists or parsed resume dicts, jobs are skill lists or
+    analyzed job dicts. The result is a float array of shape
+    (len(resumes), len(jobs)) equal to calling match_skills on each pair.
+    """
+    resume_skills = [_skills_of(resume, 'skills') for resume in resumes]
+    job_skills = [_skills_of(job, 'required_skills') for job in jobs]
+    names, rows, held = _resume_columns(resume_skills)
+
+    # Distinct job skills across the batch, and how often each job lists them
+    job_columns = {}
+    for skills in job_skills:
+        for skill in skills:
+            job_columns.setdefault(skill, len(job_columns))
+    membership = np.zeros((len(job_columns), len(jobs)), dtype=np.float32)
+    for column, skills in enumerate(job_skills):
+        for skill in skills:
+            membership[job_columns[skill], column] += 1
+
+    # similar[v] has bit u set when resume skill v satisfies job skill u,
+    # packed eight job skills to a byte
+    similar = np.zeros((len(names), len(job_columns)), dtype=bool)
+    similar_columns = _SimilarColumns(names)
+    for job_skill, u in job_columns.items():
+        similar[similar_columns(job_skill), u] = True
+    similar = np.packbits(similar, axis=1)
+
+    # A job skill is matched when any resume skill is similar to it: OR the
+    # bits of each resume's skills, a run of consecutive pairs per resume
+    matched = np.zeros((len(resumes), similar.shape[1]), dtype=np.uint8)
+    if len(rows):
+        runs = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        matched[rows[runs]] = np.bitwise_or.reduceat(similar[held], runs, axis=0)
+    matched = np.unpackbits(matched, axis=1, count=len(job_columns))
+    matched_counts = matched.astype(np.float32) @ membership
+
+    sizes = np.array([len(skills) for skills in job_skills], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(sizes > 0, matched_counts.astype(np.float64) / sizes * 100, 0.0)
+    return scores
+
+
+def rank_resumes(resumes, jobs, top_k=DEFAULT_TOP_K):
+    """Return the top_k best matching resumes for each job.
+
+    The result has one list per job of (resume_index, match_percentage)
+    tuples, best first. Ties keep the input order of the resumes.
+    """
+    if not resumes or not jobs:
+        return [[] for _ in jobs]
+
+    scores = score_matrix(resumes, jobs)
+    top_k = min(top_k, len(resumes))
+    order = np.argsort(-scores, axis=0, kind='stable')[:top_k]
+
+    return [
+        [(int(row), float(scores[row, column])) for row in order[:, column]]
+        for column in range(len(jobs))
+    ]
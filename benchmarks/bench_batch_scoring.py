@@ -0,0 +1,51 @@
+"""Batch ranking of 10k resumes against 100 jobs with score_matrix/rank_resumes.
+
+The per-pair match_skills loop is timed on a sample and extrapolated, since
+running all 1M pairs serially takes minutes. Run from the repository root:
+
+    python benchmarks/bench_batch_scoring.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_scoring import rank_resumes, score_matrix  # noqa: E402
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from skill_matcher import match_skills  # noqa: E402
+
+RESUMES = 10000
+JOBS = 100
+SAMPLE_PAIRS = 2000
+
+
+def main():
+    rng = random.Random(0)
+    resumes = [make_skills(rng, rng.randint(5, 40)) for _ in range(RESUMES)]
+    jobs = [make_skills(rng, rng.randint(5, 20)) for _ in range(JOBS)]
+
+    start = time.perf_counter()
+    scores = score_matrix(resumes, jobs)
+    matrix_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rank_resumes(resumes, jobs, top_k=10)
+    rank_time = time.perf_counter() - start
+
+    pairs = [(rng.randrange(RESUMES), rng.randrange(JOBS)) for _ in range(SAMPLE_PAIRS)]
+    start = time.perf_counter()
+    for row, column in pairs:
+        percentage, _, _ = match_skills(resumes[row], jobs[column])
+        assert percentage == scores[row, column]
+    loop_time = (time.perf_counter() - start) / SAMPLE_PAIRS * RESUMES * JOBS
+
+    print(f"{RESUMES} resumes x {JOBS} jobs")
+    print(f"score_matrix:              {matrix_time:8.2f} s")
+    print(f"rank_resumes (top 10):     {rank_time:8.2f} s")
+    print(f"match_skills loop (est.):  {loop_time:8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
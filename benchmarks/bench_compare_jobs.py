@@ -0,0 +1,56 @@
+"""One resume against many job descriptions: the process pool against one job after another.
+
+Times 20 fresh postings, as separate /analyze_job submissions would run
+them, then on the JobComparer pool, reporting when the first result is in
+and when all are. Both are warmed on other postings before timing. Run from
+the repository root:
+
+    python benchmarks/bench_compare_jobs.py [workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_job_description  # noqa: E402
+from job_comparison import COMPARE_WORKERS, JobComparer  # noqa: E402
+from models import Resume  # noqa: E402
+from task_queue import analyze_job_task  # noqa: E402
+
+JOBS = 20
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else COMPARE_WORKERS
+    resume = Resume.from_dict({'skills': ['Python', 'Docker', 'SQL', 'AWS', 'React'], 'total_experience_years': 4})
+    jobs = [(f'Job {i}', make_job_description(seed=i, paragraphs=4)) for i in range(JOBS)]
+
+    warm_up = [(f'Warm-up {i}', make_job_description(seed=JOBS + i, paragraphs=4)) for i in range(workers)]
+    analyze_job_task(resume, warm_up[0][1], warm_up[0][0])
+    start = time.perf_counter()
+    serial = [analyze_job_task(resume, description, title) for title, description in jobs]
+    serial_seconds = time.perf_counter() - start
+
+    comparer = JobComparer(workers=workers)
+    list(comparer.compare(resume, warm_up))
+
+    start = time.perf_counter()
+    first = None
+    pooled = {}
+    for index, status, analysis in comparer.compare(resume, jobs):
+        first = first or time.perf_counter() - start
+        assert status == 'done', analysis
+        pooled[index] = analysis
+    pooled_seconds = time.perf_counter() - start
+
+    for index, analysis in enumerate(serial):
+        assert pooled[index].to_dict() == analysis.to_dict()
+
+    print(f"{JOBS} postings, {workers} pool processes on {os.cpu_count()} CPUs")
+    print(f"one after another:  first {serial_seconds / JOBS * 1000:7.0f} ms, all {serial_seconds * 1000:7.0f} ms")
+    print(f"process pool:       first {first * 1000:7.0f} ms, all {pooled_seconds * 1000:7.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""DOCX text extraction: the python-docx object model against the streaming lxml extractor.
+
+Resumes are generated with a header, body paragraphs, a skills table and a
+footer. The python-docx path only reads body paragraphs, so its output is
+checked against the streaming extractor on plain documents, and the
+streaming extractor is checked to find the table and header text too.
+Run from the repository root:
+
+    python benchmarks/bench_docx_extraction.py
+"""
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx  # noqa: E402
+
+from benchmarks.corpus import make_resume  # noqa: E402
+from resume_parser import COMMON_SKILLS, OLE2_MAGIC, extract_text_from_docx  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DOCUMENTS = 20
+LARGE_PAGES = 400
+
+# Peak RSS growth while extracting, measured in a fresh interpreter since lxml allocates
+# outside tracemalloc. Resetting the peak through /proc needs Linux.
+PROBE = r'''
+import json, sys
+from benchmarks.bench_docx_extraction import legacy_extract
+from resume_parser import extract_text_from_docx
+
+def rss(field):
+    with open('/proc/self/status') as status:
+        return next(int(line.split()[1]) * 1024 for line in status if line.startswith(field))
+
+data = open(sys.argv[1], 'rb').read()
+func = legacy_extract if sys.argv[2] == 'legacy' else lambda data: extract_text_from_docx(data, max_chars=None)
+with open('/proc/self/clear_refs', 'w') as clear_refs:
+    clear_refs.write('5')
+before = rss('VmRSS:')
+func(data)
+print(json.dumps(rss('VmHWM:') - before))
+'''
+
+
+def legacy_extract(data):
+    """The python-docx loop the streaming extractor replaces."""
+    text = ""
+    doc = docx.Document(io.BytesIO(data))
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def make_docx(lines, rng=None):
+    """DOCX bytes with one paragraph per line, plus a skills table, header and footer if rng is given."""
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    if rng is not None:
+        section = document.sections[0]
+        section.header.paragraphs[0].text = f"Candidate {rng.randint(1000, 9999)} | candidate@example.com"
+        section.footer.paragraphs[0].text = "References available on request"
+        skills = rng.sample(COMMON_SKILLS, 12)
+        table = document.add_table(rows=4, cols=3)
+        for index, skill in enumerate(skills):
+            table.cell(index // 3, index % 3).text = skill
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def best_of(func, documents, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in documents:
+            func(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(documents)
+
+
+def peak_memory(path, extractor):
+    output = subprocess.run([sys.executable, '-c', PROBE, path, extractor], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    rng = random.Random(0)
+    plain = [make_docx(make_resume(seed, 2, 0.2, COMMON_SKILLS)) for seed in range(DOCUMENTS)]
+    rich = [make_docx(make_resume(seed, 2, 0.2, COMMON_SKILLS), rng) for seed in range(DOCUMENTS)]
+
+    for data in plain:
+        assert legacy_extract(data) == extract_text_from_docx(data, max_chars=None)
+    for data in rich:
+        text = extract_text_from_docx(data, max_chars=None)
+        assert 'candidate@example.com' in text and 'References available' in text
+        assert set(legacy_extract(data).splitlines()) <= set(text.splitlines())
+
+    print(f"{DOCUMENTS} two-page resumes with a header, footer and 4x3 skills table")
+    legacy = best_of(legacy_extract, rich)
+    streaming = best_of(lambda data: extract_text_from_docx(data, max_chars=None), rich)
+    print(f"python-docx:        {legacy * 1000:8.2f} ms per resume (body paragraphs only)")
+    print(f"streaming lxml:     {streaming * 1000:8.2f} ms per resume (with tables, header, footer)")
+    print(f"speedup:            {legacy / streaming:8.1f}x")
+
+    large = make_docx(make_resume(0, LARGE_PAGES, 0.2, COMMON_SKILLS))
+    print(f"\n{LARGE_PAGES}-page document, {len(large) / 1024:.0f} KiB zipped")
+    legacy = best_of(legacy_extract, [large], repeat=1)
+    streaming = best_of(lambda data: extract_text_from_docx(data, max_chars=None), [large], repeat=1)
+    with tempfile.NamedTemporaryFile(suffix='.docx') as file:
+        file.write(large)
+        file.flush()
+        legacy_peak = peak_memory(file.name, 'legacy')
+        streaming_peak = peak_memory(file.name, 'streaming')
+    print(f"python-docx:        {legacy * 1000:8.1f} ms, peak RSS +{legacy_peak / 1e6:6.1f} MB")
+    print(f"streaming lxml:     {streaming * 1000:8.1f} ms, peak RSS +{streaming_peak / 1e6:6.1f} MB")
+
+    legacy_doc = OLE2_MAGIC + bytes(512 * 1024)
+    start = time.perf_counter()
+    try:
+        extract_text_from_docx(legacy_doc)
+    except ValueError:
+        pass
+    print(f"\nreject legacy .doc: {(time.perf_counter() - start) * 1e6:8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
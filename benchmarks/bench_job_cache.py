@@ -0,0 +1,115 @@
+"""Job analysis cache: repeated and edited postings against analyzing every paste.
+
+Replays a stream of pastes in which a posting comes back as is, with its
+case or spacing changed, or with boilerplate edited, and checks every
+cached analysis against a fresh one. Run from the repository root:
+
+    python benchmarks/bench_job_cache.py [pastes]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_job_description  # noqa: E402
+from job_analyzer import analyze_job_description  # noqa: E402
+from job_cache import JobCache  # noqa: E402
+
+PASTES = 2000
+POSTINGS = 300
+
+# Postings are pasted again while they are recent
+RECENT = 50
+
+BOILERPLATE = [
+    'Apply now at careers.example.com',
+    'We are an equal opportunity employer.',
+    'Salary: competitive, plus equity',
+    'Hybrid, two days a week in the office',
+]
+
+
+def respaced(text, rng):
+    """The same posting pasted again, with trailing spaces, CRLF line breaks or a different case."""
+    choice = rng.randrange(3)
+    if choice == 0:
+        return text.replace('\n', ' \n')
+    if choice == 1:
+        return text.replace('\n', '\r\n')
+    return text.upper() if rng.random() < 0.2 else text.lower()
+
+
+def edited(text, rng):
+    """The posting with a boilerplate line added and one of its short lines changed."""
+    lines = text.split('\n')
+    lines.insert(rng.randrange(len(lines)), rng.choice(BOILERPLATE))
+    short = [i for i, line in enumerate(lines) if 0 < len(line) < 80]
+    i = rng.choice(short)
+    lines[i] = lines[i] + ' ' + rng.choice(['(remote)', '- urgent', '!'])
+    return '\n'.join(lines)
+
+
+def comparable(job):
+    return json.dumps(job.to_dict(keep_raw_text=False), sort_keys=True)
+
+
+def make_pastes(count, seed=0):
+    """(kind, text) pairs: new postings, exact repeats, respaced repeats and edited near duplicates."""
+    rng = random.Random(seed)
+    postings = []
+    pastes = []
+    for _ in range(count):
+        roll = rng.random()
+        if not postings or roll < 0.4:
+            text = make_job_description(len(postings), paragraphs=rng.randint(1, 4))
+            postings.append(text)
+            pastes.append(('new', text))
+        elif roll < 0.6:
+            text = rng.choice(postings[-RECENT:])
+            pastes.append(('repeat', text))
+        elif roll < 0.75:
+            pastes.append(('respaced', respaced(rng.choice(postings[-RECENT:]), rng)))
+        else:
+            text = edited(rng.choice(postings[-RECENT:]), rng)
+            postings.append(text)
+            pastes.append(('edited', text))
+    return pastes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else PASTES
+    pastes = make_pastes(count)
+    cache = JobCache(max_entries=POSTINGS)
+
+    uncached = {}
+    cached = {}
+    for kind, text in pastes:
+        start = time.perf_counter()
+        expected = analyze_job_description(text, 'Job')
+        middle = time.perf_counter()
+        job = cache.analyze(text, 'Job')
+        end = time.perf_counter()
+        uncached.setdefault(kind, []).append(middle - start)
+        cached.setdefault(kind, []).append(end - middle)
+        assert comparable(job) == comparable(expected), kind
+    print(f"{count} pastes checked against a fresh analysis, cache of {POSTINGS} postings\n")
+
+    print(f"{'':<10}{'pastes':>8}{'uncached':>12}{'cached':>12}")
+    for kind in ('new', 'repeat', 'respaced', 'edited'):
+        if kind in cached:
+            print(f"{kind:<10}{len(cached[kind]):8d}{sum(uncached[kind]) / len(uncached[kind]) * 1e6:9.0f} us"
+                  f"{sum(cached[kind]) / len(cached[kind]) * 1e6:9.0f} us")
+    total_uncached = sum(sum(timings) for timings in uncached.values())
+    total_cached = sum(sum(timings) for timings in cached.values())
+    print(f"{'total':<10}{count:8d}{total_uncached:10.3f} s {total_cached:10.3f} s")
+
+    stats = cache.stats()
+    print(f"\nhit rate {stats['hit_rate']:.1%}, near-duplicate rate {stats['near_hit_rate']:.1%}, "
+          f"{stats['seconds_saved']:.3f} s saved by the cache's own estimate")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Learning recommendations: the per-skill rebuild against the learning-path planner.
+
+Checks the planner's weeks against a Dijkstra run per candidate from their
+resume skills, then times recommendations for 30-skill gaps. Run from the
+repository root:
+
+    python benchmarks/bench_learning_paths.py
+"""
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from skill_matcher import (DEFAULT_LEARNING_WEEKS, LEARNING_PLANNER, RELATED_DISCOUNT,  # noqa: E402
+                           estimate_learning_time, get_recommendations)
+from taxonomy import TAXONOMY  # noqa: E402
+
+CANDIDATES = 500
+GAP_SIZE = 30
+RESUME_SIZE = 20
+
+
+def legacy_recommendations(missing_skills):
+    """The loop the planner replaces: resources and estimates rebuilt for every skill."""
+    recommendations = []
+    for skill in missing_skills:
+        resources = TAXONOMY.learning_resources(skill)
+        if not resources:
+            resources = [
+                {'name': f'Search "{skill} tutorial" on YouTube', 'url': f'https://www.youtube.com/results?search_query={skill}+tutorial'},
+                {'name': f'Take an online course on Coursera, Udemy, or edX', 'url': f'https://www.coursera.org/search?query={skill}'},
+                {'name': f'Find projects on GitHub to practice', 'url': f'https://github.com/search?q={skill}+project'}
+            ]
+        related = TAXONOMY.related_skills(skill)
+        recommendations.append({
+            'skill': skill,
+            'resources': resources,
+            'related_skills': related[:3] if related else [],
+            'estimated_time': estimate_learning_time(skill)
+        })
+    return recommendations
+
+
+def candidate_weeks(resume_skills):
+    """Weeks to every skill from one candidate's skills, by Dijkstra from a virtual start."""
+    weeks = [TAXONOMY.learning_weeks(name) or DEFAULT_LEARNING_WEEKS for name in TAXONOMY.skills()]
+    distances = list(map(float, weeks))
+    for skill in resume_skills:
+        skill_id = TAXONOMY.skill_id(skill)
+        if skill_id is not None:
+            distances[skill_id] = 0.0
+    heap = [(distance, skill_id) for skill_id, distance in enumerate(distances)]
+    heapq.heapify(heap)
+    while heap:
+        distance, skill_id = heapq.heappop(heap)
+        if distance > distances[skill_id]:
+            continue
+        for neighbour in TAXONOMY.similar_ids(skill_id).tolist():
+            candidate = distance + weeks[neighbour] * RELATED_DISCOUNT
+            if candidate < distances[neighbour]:
+                distances[neighbour] = candidate
+                heapq.heappush(heap, (candidate, neighbour))
+    return distances
+
+
+def best_of(func, cases, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for case in cases:
+            func(*case)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(cases)
+
+
+def main():
+    rng = random.Random(0)
+    taxonomy_skills = TAXONOMY.skills()
+    cases = [(rng.sample(taxonomy_skills, GAP_SIZE), make_skills(rng, RESUME_SIZE)) for _ in range(CANDIDATES)]
+
+    start = time.perf_counter()
+    LEARNING_PLANNER.preload()
+    print(f"planner preload for {len(taxonomy_skills)} skills: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for missing_skills, resume_skills in cases[:100]:
+        expected = candidate_weeks(resume_skills)
+        recommendations = get_recommendations(missing_skills, resume_skills)
+        assert [r['total_weeks'] for r in recommendations] == sorted(r['total_weeks'] for r in recommendations)
+        for recommendation in recommendations:
+            skill_id = TAXONOMY.skill_id(recommendation['skill'])
+            assert recommendation['total_weeks'] == round(expected[skill_id], 1), recommendation
+            assert recommendation['learning_path'][-1] == recommendation['skill']
+    print("planner weeks match a per-candidate Dijkstra on 100 candidates")
+
+    legacy = best_of(lambda missing, resume: legacy_recommendations(missing), cases)
+    planned = best_of(get_recommendations, cases)
+    print(f"\n{GAP_SIZE}-skill gaps, {RESUME_SIZE}-skill resumes")
+    print(f"per-skill rebuild:  {legacy * 1e6:8.1f} us per gap (no learning paths)")
+    print(f"planner:            {planned * 1e6:8.1f} us per gap (with learning paths, sorted)")
+    print(f"speedup:            {legacy / planned:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
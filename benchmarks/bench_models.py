@@ -0,0 +1,101 @@
+"""Memory held by stored resumes: the plain dicts against the slotted models.
+
+Resumes are decoded from JSON, as the session store and parse cache used to
+hand them out, so no strings are shared between records. Run from the
+repository root:
+
+    python benchmarks/bench_models.py [resumes]
+"""
+import gc
+import json
+import os
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_engine import make_document  # noqa: E402
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from models import Resume  # noqa: E402
+
+RESUMES = 100000
+TEMPLATES = 200
+
+
+def make_template(rng, i):
+    return {
+        'name': f'Candidate {i}', 'email': f'c{i}@example.com', 'phone': '555-123-4567',
+        'skills': sorted(make_skills(rng, 30)),
+        'experience': [{'company': 'Acme', 'position': 'Engineer', 'duration': 'Jan 2019 - Present',
+                        'description': ['Built things'] * 4}],
+        'total_experience_years': 5.5,
+        'education': [{'institution': 'State University', 'degree': 'BSc Computer Science'}],
+        'raw_text': make_document(1, seed=i)
+    }
+
+
+def copied(blob):
+    """A new buffer per resume, as when each one is read back from storage."""
+    return bytes(bytearray(blob))
+
+
+def measure(label, count, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34}{current / 1024 / 1024:10.1f} MiB{current / count:10.0f} B{elapsed:9.2f} s")
+    return objects
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else RESUMES
+    rng = random.Random(0)
+    templates = [make_template(rng, i) for i in range(TEMPLATES)]
+    encoded = [json.dumps(template) for template in templates]
+    without_text = [json.dumps({k: v for k, v in template.items() if k != 'raw_text'}) for template in templates]
+    serialized = [Resume.from_dict(template).to_bytes() for template in templates]
+    print(f"{count} resumes, 30 skills and a one-page text each ({len(templates[0]['raw_text'])} chars)")
+    print(f"{'':<34}{'total':>14}{'per resume':>12}{'build':>9}")
+
+    measure('dict with raw_text', count, lambda: [json.loads(encoded[i % TEMPLATES]) for i in range(count)])
+    measure('Resume with raw_text', count,
+            lambda: [Resume.from_dict(json.loads(encoded[i % TEMPLATES])) for i in range(count)])
+    measure('Resume.from_bytes, lazy raw_text', count,
+            lambda: [Resume.from_bytes(copied(serialized[i % TEMPLATES])) for i in range(count)])
+    measure('bytes from Resume.to_bytes', count, lambda: [copied(serialized[i % TEMPLATES]) for i in range(count)])
+    print()
+    measure('dict without raw_text', count, lambda: [json.loads(without_text[i % TEMPLATES]) for i in range(count)])
+    resumes = measure('Resume without raw_text', count,
+                      lambda: [Resume.from_dict(json.loads(without_text[i % TEMPLATES])) for i in range(count)])
+    measure('bytes without raw_text', count, lambda: [resume.to_bytes() for resume in resumes])
+
+    # Serialization speed, against the JSON the records used to be stored as
+    sample = resumes[:10000]
+    dicts = [resume.to_dict() for resume in sample]
+    for label, encode, decode in [
+        ('json', lambda: [json.dumps(d, separators=(',', ':')).encode() for d in dicts], json.loads),
+        ('pickle of dict', lambda: [pickle.dumps(d, pickle.HIGHEST_PROTOCOL) for d in dicts], pickle.loads),
+        ('Resume.to_bytes', lambda: [resume.to_bytes() for resume in sample], Resume.from_bytes),
+    ]:
+        start = time.perf_counter()
+        blobs = encode()
+        encoded_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for blob in blobs:
+            decode(blob)
+        decoded_seconds = time.perf_counter() - start
+        size = sum(map(len, blobs)) / len(blobs)
+        print(f"{label:<18}{size:8.0f} B  encode {encoded_seconds / len(blobs) * 1e6:6.1f} us"
+              f"  decode {decoded_seconds / len(blobs) * 1e6:6.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""PDF text extraction throughput on a generated corpus of multi-page PDFs.
+
+Compares the old concatenating loop with the streaming extractor, serially
+and with a process pool, and shows the effect of the page/character caps.
+Run from the repository root:
+
+    python benchmarks/bench_pdf_extraction.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2  # noqa: E402
+
+from benchmarks.corpus import write_text_pdf  # noqa: E402
+from resume_parser import COMMON_SKILLS, extract_text_from_pdf  # noqa: E402
+
+LINES_PER_PAGE = 60
+FILLER = ('designed built delivered maintained improved team project customer '
+          'platform service data reporting pipeline release quality').split()
+
+
+def legacy_extract(pdf_path):
+    """The concatenating loop the streaming extractor replaces."""
+    text = ""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page_num in range(len(pdf_reader.pages)):
+            text += pdf_reader.pages[page_num].extract_text()
+    return text
+
+
+def make_corpus(directory, page_counts, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for i, page_count in enumerate(page_counts):
+        pages = [[' '.join(rng.choices(FILLER, k=8) + rng.choices(COMMON_SKILLS, k=2))
+                  for _ in range(LINES_PER_PAGE)] for _ in range(page_count)]
+        path = os.path.join(directory, f'resume_{i}_{page_count}p.pdf')
+        write_text_pdf(path, pages)
+        paths.append((path, page_count))
+    return paths
+
+
+def run(label, func, corpus):
+    pages = 0
+    chars = 0
+    start = time.perf_counter()
+    for path, page_count in corpus:
+        text = func(path)
+        chars += len(text)
+    elapsed = time.perf_counter() - start
+    pages = sum(page_count for _, page_count in corpus)
+    print(f"{label:<32} {elapsed:7.2f} s  {pages / elapsed:8.1f} pages/s  "
+          f"{len(corpus) / elapsed:6.2f} docs/s  {chars:>10} chars")
+
+
+def main():
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = make_corpus(directory, [2, 5, 10, 25, 50, 100, 200])
+        print(f"corpus: {len(corpus)} PDFs, {sum(p for _, p in corpus)} pages, {workers} CPUs")
+        run('legacy += loop', legacy_extract, corpus)
+        run('streaming, no caps', lambda p: extract_text_from_pdf(p, max_pages=0, max_chars=0, workers=0), corpus)
+        run(f'streaming, {workers} workers, no caps',
+            lambda p: extract_text_from_pdf(p, max_pages=0, max_chars=0, workers=workers), corpus)
+        run('streaming, default caps', extract_text_from_pdf, corpus)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Section segmentation: the old backtracking section regexes against the line segmenter.
+
+Times both on pathological inputs of growing size, where the old patterns
+go quadratic, then fuzzes the segmenter with random heading-heavy text and
+checks its spans and its linear scaling. Run from the repository root:
+
+    python benchmarks/bench_sections.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_analyzer import JOB_SECTION_LINES  # noqa: E402
+from resume_parser import RESUME_SECTION_LINES  # noqa: E402
+from sections import HEADING_TRIM, JOB_HEADINGS, RESUME_HEADINGS, segment_sections  # noqa: E402
+
+# The section patterns the segmenter replaces
+LEGACY_PATTERNS = [
+    re.compile(r'(?i)(?:skills|technical skills|proficiencies|competencies)(?:[^\n]*\n){1,20}'),
+    re.compile(r'(?i)(?:experience|work experience|employment|work history)(?:[^\n]*\n){1,30}?(?=\n\s*(?:education|skills|projects|certifications|references|\Z))'),
+    re.compile(r'(?i)(?:education|academic background|qualifications)(?:[^\n]*\n){1,20}?(?=\n\s*(?:experience|skills|projects|certifications|references|\Z))'),
+    re.compile(r'(?i)(?:requirements|qualifications|skills required|required skills|key skills|technical skills)(?:[^\n]*\n){1,30}?(?=\n\s*(?:benefits|about us|company|application|how to apply|\Z))'),
+    re.compile(r'(?i)(?:preferred|plus|nice to have|bonus|additionally|desirable)(?:[^\n]*\n){1,15}?(?=\n\s*(?:benefits|about us|company|application|how to apply|\Z))'),
+]
+
+# Inputs that make the lazy line repetition and lookahead retry at every keyword
+PATHOLOGICAL = {
+    'keywords on one line': lambda size: 'experience ' * (size // 11),
+    'keyword per line': lambda size: 'requirements plus\n' * (size // 18),
+    'spaces before the end': lambda size: 'education\n' + ' \n' * (size // 2),
+}
+
+SIZES = (5000, 10000, 20000, 40000)
+FUZZ_DOCUMENTS = 2000
+FUZZ_WORDS = [heading for heading in list(RESUME_HEADINGS) + list(JOB_HEADINGS)] + [
+    'python', 'led', 'team', '2020', '-', '•', '**', '#', '&', ':', '|', 'x' * 80]
+
+
+def legacy_segment(text):
+    for pattern in LEGACY_PATTERNS:
+        pattern.findall(text)
+
+
+def segment(text):
+    segment_sections(text, RESUME_HEADINGS, RESUME_SECTION_LINES)
+    segment_sections(text, JOB_HEADINGS, JOB_SECTION_LINES)
+
+
+def timed(func, text):
+    start = time.perf_counter()
+    func(text)
+    return time.perf_counter() - start
+
+
+def fuzz_text(rng):
+    parts = []
+    for _ in range(rng.randint(0, 300)):
+        word = rng.choice(FUZZ_WORDS)
+        parts.append(word.upper() if rng.random() < 0.2 else word)
+        parts.append(rng.choice(['\n', '\n', ' ', ': ', '\n\n', '\r\n', '']))
+    return ''.join(parts)
+
+
+def check_spans(text, sections, max_lines):
+    """Spans are in bounds, ordered, disjoint, and no longer than their line cap."""
+    spans = sorted((start, end, name) for name, found in sections.items() for start, end in found)
+    previous_end = 0
+    for start, end, name in spans:
+        assert previous_end <= start <= end <= len(text), (start, end, previous_end)
+        assert start in (0, len(text)) or text[start - 1] in '\n:' + HEADING_TRIM, (name, start)
+        if name in max_lines:
+            assert text[start:end].count('\n') <= max_lines[name], (name, text[start:end])
+        previous_end = end
+
+
+def main():
+    print(f"{'input':<24}{'chars':>8}{'regexes ms':>13}{'segmenter ms':>15}")
+    for label, make in PATHOLOGICAL.items():
+        for size in SIZES:
+            text = make(size)
+            legacy = timed(legacy_segment, text)
+            current = timed(segment, text)
+            print(f"{label:<24}{len(text):>8}{legacy * 1000:>13.1f}{current * 1000:>15.2f}")
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(FUZZ_DOCUMENTS):
+        text = fuzz_text(rng)
+        check_spans(text, segment_sections(text, RESUME_HEADINGS, RESUME_SECTION_LINES), RESUME_SECTION_LINES)
+        check_spans(text, segment_sections(text, JOB_HEADINGS, JOB_SECTION_LINES), JOB_SECTION_LINES)
+    print(f"\nfuzzed {FUZZ_DOCUMENTS} documents in {time.perf_counter() - start:.2f} s, spans consistent")
+
+    # Time per character must stay flat as the input grows
+    base = fuzz_text(random.Random(1)) * 20
+    small = min(timed(segment, base) for _ in range(5)) / len(base)
+    large = min(timed(segment, base * 32) for _ in range(3)) / (len(base) * 32)
+    print(f"segmenter: {small * 1e9:.0f} ns/char at {len(base)} chars, "
+          f"{large * 1e9:.0f} ns/char at {len(base) * 32} chars")
+    assert large < small * 3, "segmenter scaling is not linear"
+
+
+if __name__ == '__main__':
+    main()
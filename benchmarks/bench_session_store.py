@@ -0,0 +1,94 @@
+"""Memory held by stored sessions: the old user_data dict against the stores.
+
+Run from the repository root:
+
+    python benchmarks/bench_session_store.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_engine import make_document  # noqa: E402
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from models import Resume, SkillGapAnalysis  # noqa: E402
+from session_store import MemorySessionStore, SQLSessionStore  # noqa: E402
+
+SESSIONS = 5000
+JOBS_PER_SESSION = 3
+
+
+def make_record(rng, i):
+    resume = {
+        'name': f'Candidate {i}', 'email': f'c{i}@example.com', 'phone': '555-123-4567',
+        'skills': make_skills(rng, 30),
+        'experience': [{'company': 'Acme', 'position': 'Engineer', 'duration': 'Jan 2019 - Present',
+                        'description': ['Built things'] * 4}],
+        'education': [{'institution': 'State University', 'degree': 'BSc Computer Science'}],
+        'raw_text': make_document(2, seed=i)
+    }
+    jobs = []
+    for _ in range(JOBS_PER_SESSION):
+        required = make_skills(rng, 12)
+        jobs.append({
+            'title': 'Engineer', 'company': 'Acme', 'required_skills': required,
+            'preferred_skills': make_skills(rng, 4),
+            'experience_req': {'overall': 3, 'specific': {}},
+            'education_req': {'degree': 'bachelor', 'field': None},
+            'raw_text': make_document(1, seed=i + 1),
+            'match_percentage': 50.0, 'matching_skills': required[:6], 'missing_skills': required[6:],
+        })
+    return {'resume': resume, 'jobs': jobs}
+
+
+def as_models(record):
+    return {'resume': Resume.from_dict(record['resume']), 'jobs': [SkillGapAnalysis.from_dict(job) for job in record['jobs']]}
+
+
+def measure(label, fill):
+    tracemalloc.start()
+    start = time.perf_counter()
+    store = fill()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {current / 1024 / 1024:8.1f} MiB  {elapsed:6.2f} s")
+    return store
+
+
+def main():
+    rng = random.Random(0)
+    records = [make_record(rng, i) for i in range(SESSIONS)]
+    model_records = [as_models(record) for record in records]
+    print(f"{SESSIONS} sessions with {JOBS_PER_SESSION} analyzed jobs each")
+
+    def fill_dict():
+        import copy
+        return {i: copy.deepcopy(record) for i, record in enumerate(records)}
+
+    def fill_memory():
+        store = MemorySessionStore(max_bytes=1 << 40)
+        for i, record in enumerate(model_records):
+            store.put(str(i), record)
+        return store
+
+    measure('old user_data dict', fill_dict)
+    store = measure('MemorySessionStore', fill_memory)
+    print(f"  stats: {store.stats()}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        sql_store = SQLSessionStore(f"sqlite:///{os.path.join(directory, 'sessions.db')}")
+        start = time.perf_counter()
+        for i, record in enumerate(model_records):
+            sql_store.put(str(i), record)
+        print(f"{'SQLSessionStore (sqlite)':<28} {'-':>8}      {time.perf_counter() - start:6.2f} s")
+        print(f"  stats: {sql_store.stats()}")
+        sql_store.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Per-document latency of the compiled SkillScanner against the old loops.
+
+Run from the repository root:
+
+    python benchmarks/bench_skill_engine.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_analyzer import COMMON_SKILLS, SKILL_SCANNER  # noqa: E402
+
+CHARS_PER_PAGE = 3000
+FILLER = ('designed built delivered maintained improved team project customer '
+          'platform service data reporting pipeline release quality').split()
+
+
+def make_document(pages, seed=0):
+    """Build a resume-like text of roughly the given number of pages."""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    while size < pages * CHARS_PER_PAGE:
+        words = rng.choices(FILLER, k=10) + rng.choices(COMMON_SKILLS, k=2)
+        rng.shuffle(words)
+        line = ' '.join(words)
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
+
+
+def legacy_skills(text):
+    """The per-skill regex loop the scanner replaces."""
+    skills = []
+    text_lower = text.lower()
+    for skill in COMMON_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            skills.append(skill)
+    return skills
+
+
+def legacy_experience(text):
+    """The per-skill "N years of X" loop the scanner replaces."""
+    specific = {}
+    for skill in COMMON_SKILLS:
+        pattern = r'(?i)(\d+)[\+]?\s*(?:years|yr|yrs)(?:\s+of)?\s+(?:experience|exp)(?:\s+with|\s+in)?\s+' + re.escape(skill)
+        match = re.search(pattern, text)
+        if match:
+            specific[skill] = int(match.group(1))
+    return specific
+
+
+def scanner_skills(text):
+    return SKILL_SCANNER.skills_in(text)
+
+
+def scanner_experience(text):
+    from job_analyzer import extract_experience_requirements
+    return extract_experience_requirements(text)['specific']
+
+
+def best_of(func, text, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(f"{'pages':>5} {'chars':>8} {'legacy skills':>14} {'scanner':>10} "
+          f"{'legacy years':>13} {'scanner':>10}")
+    for pages in (1, 2, 5, 10, 20, 50):
+        text = make_document(pages, seed=pages)
+        row = [
+            best_of(legacy_skills, text),
+            best_of(scanner_skills, text),
+            best_of(legacy_experience, text),
+            best_of(scanner_experience, text),
+        ]
+        print(f"{pages:>5} {len(text):>8} " + ' '.join(
+            f"{value * 1000:>{width}.2f}" for value, width in zip(row, (12, 8, 11, 8))
+        ) + '  ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Skill gap analysis in one pass over an indexed resume against the separate steps.
+
+The separate steps match the skills, then match them again to find the
+gaps and compare each skill related to a missing one with every resume
+skill. Checks both give the same analysis, with preferred skills ignored.
+Uses 30-skill resumes against jobs with 15 required and 5 preferred skills.
+Run from the repository root:
+
+    python benchmarks/bench_skill_gaps.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from models import JobDescription, Resume, SkillGapAnalysis  # noqa: E402
+from skill_matcher import (LEARNING_PLANNER, analyze_skill_gaps, get_recommendations, is_similar_skill,  # noqa: E402
+                           match_skills)
+from taxonomy import TAXONOMY  # noqa: E402
+from tenure import score_experience  # noqa: E402
+
+CASES = 200
+
+
+def legacy_calculate_skill_gaps(resume_skills, job_skills):
+    """The gap step before the resume index: every related skill against every resume skill."""
+    _, _, missing_skills = match_skills(resume_skills, job_skills)
+    skill_gaps = []
+    for skill in missing_skills:
+        related_resume_skills = []
+        for related in TAXONOMY.related_skills(skill):
+            for resume_skill in resume_skills:
+                if is_similar_skill(related, resume_skill):
+                    related_resume_skills.append(resume_skill)
+        importance = "high" if len(related_resume_skills) == 0 else "medium"
+        skill_gaps.append({'skill': skill, 'importance': importance, 'related_skills': related_resume_skills})
+    return skill_gaps
+
+
+def legacy_analyze_skill_gaps(resume, job):
+    """The separate steps the analysis used to take."""
+    resume_skills = resume.skills
+    match_percentage, matching_skills, missing_skills = match_skills(resume.skill_set, job.required_skills)
+    return SkillGapAnalysis(
+        job=job,
+        match_percentage=match_percentage,
+        matching_skills=matching_skills,
+        missing_skills=missing_skills,
+        skill_gaps=legacy_calculate_skill_gaps(resume_skills, job.required_skills),
+        recommendations=get_recommendations(missing_skills, resume_skills),
+        experience_fit=score_experience(resume.total_experience_years, job.experience_req)
+    )
+
+
+def best_of(func, cases, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for resume, job in cases:
+            func(resume, job)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(cases)
+
+
+def main():
+    rng = random.Random(0)
+    cases = []
+    for _ in range(CASES):
+        job_skills = make_skills(rng, 20)
+        resume = Resume.from_dict({'skills': make_skills(rng, 30), 'total_experience_years': 3})
+        cases.append((resume, JobDescription('Job', required_skills=job_skills[:15], preferred_skills=job_skills[15:])))
+    LEARNING_PLANNER.preload()
+
+    for resume, job in cases:
+        fused = analyze_skill_gaps(resume, job, preferred_weight=0)
+        fused.skill_gaps = [gap for gap in fused.skill_gaps if gap['importance'] != 'low']
+        fused.matching_preferred = fused.missing_preferred = SkillGapAnalysis().matching
+        assert fused.to_dict() == legacy_analyze_skill_gaps(resume, job).to_dict()
+
+    legacy = best_of(legacy_analyze_skill_gaps, cases)
+    fused = best_of(analyze_skill_gaps, cases)
+    print(f"separate steps:        {legacy * 1e6:8.0f} us per analysis")
+    print(f"one pass, with prefs:  {fused * 1e6:8.0f} us per analysis")
+    print(f"speedup:               {legacy / fused:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
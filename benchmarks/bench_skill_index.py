@@ -0,0 +1,49 @@
+"""Boolean query latency of SkillIndex over 1M synthetic resumes.
+
+Run from the repository root:
+
+    python benchmarks/bench_skill_index.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from skill_index import SkillIndex  # noqa: E402
+
+RESUMES = 1000000
+SKILLS_PER_RESUME = 12
+
+QUERIES = [
+    ('kubernetes AND terraform NOT chef', dict(all_of=['kubernetes', 'terraform'], none_of=['chef'])),
+    ('sql AND aws AND docker NOT php', dict(all_of=['sql', 'aws', 'docker'], none_of=['php'])),
+    ('rust AND (go OR scala)', dict(all_of=['rust'], any_of=['go', 'scala'])),
+    ('python', dict(all_of=['python'])),
+    ('rust OR go, NOT java', dict(any_of=['rust', 'go'], none_of=['java'])),
+]
+
+
+def main():
+    rng = random.Random(0)
+    pool = make_skills(rng, 150)
+    index = SkillIndex(path='')
+
+    start = time.perf_counter()
+    for key in range(RESUMES):
+        index.add(key, rng.sample(pool, SKILLS_PER_RESUME))
+    print(f"indexed {RESUMES} resumes in {time.perf_counter() - start:.1f} s")
+
+    for label, query in QUERIES:
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            result = index.query(**query)
+            timings.append(time.perf_counter() - start)
+        print(f"{label:<36} {len(result):>8} hits  {min(timings) * 1000:8.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
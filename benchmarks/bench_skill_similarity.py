@@ -0,0 +1,100 @@
+"""match_skills with the SkillSimilarityIndex against the old quadratic scan.
+
+Uses 200-skill resumes against 60-skill job descriptions. Run from the
+repository root:
+
+    python benchmarks/bench_skill_similarity.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nltk.corpus import wordnet  # noqa: E402
+
+from resume_parser import COMMON_SKILLS  # noqa: E402
+from skill_matcher import match_skills  # noqa: E402
+from taxonomy import TAXONOMY  # noqa: E402
+
+# User-supplied skills that are not part of the taxonomy
+EXTRA_SKILLS = ['graphql', 'spark', 'hadoop', 'airflow', 'snowflake', 'dbt', 'looker',
+                'figma', 'sketch', 'unity', 'solidity', 'elixir', 'haskell', 'clojure',
+                'fortran', 'cobol', 'sap', 'salesforce', 'excel', 'powerpoint']
+
+
+def legacy_is_similar_skill(skill1, skill2):
+    """The pairwise check the index replaces."""
+    if skill1.lower() == skill2.lower():
+        return True
+    if skill1.lower() in skill2.lower() or skill2.lower() in skill1.lower():
+        len_diff = abs(len(skill1) - len(skill2))
+        if len_diff < 3 or len_diff / max(len(skill1), len(skill2)) < 0.3:
+            return True
+    if skill2.lower() in TAXONOMY.related_skills(skill1):
+        return True
+    if skill1.lower() in TAXONOMY.related_skills(skill2):
+        return True
+    try:
+        skill1_syns = wordnet.synsets(skill1)
+        skill2_syns = wordnet.synsets(skill2)
+        skill1_lemmas = set(lemma.name() for syn in skill1_syns for lemma in syn.lemmas())
+        skill2_lemmas = set(lemma.name() for syn in skill2_syns for lemma in syn.lemmas())
+        if skill1_lemmas.intersection(skill2_lemmas):
+            return True
+    except:
+        pass
+    return False
+
+
+def legacy_match_skills(resume_skills, job_skills):
+    """The O(resume x job) scan the index replaces."""
+    matching_skills = []
+    missing_skills = []
+    for job_skill in job_skills:
+        for resume_skill in resume_skills:
+            if legacy_is_similar_skill(job_skill, resume_skill):
+                matching_skills.append(job_skill)
+                break
+        else:
+            missing_skills.append(job_skill)
+    match_percentage = len(matching_skills) / len(job_skills) * 100 if job_skills else 0
+    return match_percentage, matching_skills, missing_skills
+
+
+def make_skills(rng, count):
+    """Draw distinct skills, padding with numbered variants of unknown skills."""
+    pool = COMMON_SKILLS + EXTRA_SKILLS
+    skills = rng.sample(pool, min(count, len(pool)))
+    while len(skills) < count:
+        skills.append(f"{rng.choice(EXTRA_SKILLS)} {len(skills)}")
+    return skills
+
+
+def best_of(func, pairs, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for resume_skills, job_skills in pairs:
+            func(resume_skills, job_skills)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(pairs)
+
+
+def main():
+    rng = random.Random(0)
+    pairs = [(make_skills(rng, 200), make_skills(rng, 60)) for _ in range(20)]
+
+    for resume_skills, job_skills in pairs:
+        assert legacy_match_skills(resume_skills, job_skills) == match_skills(resume_skills, job_skills)
+
+    legacy = best_of(legacy_match_skills, pairs)
+    indexed = best_of(match_skills, pairs)
+    print(f"legacy match_skills:  {legacy * 1000:8.2f} ms per 200x60 pair")
+    print(f"indexed match_skills: {indexed * 1000:8.2f} ms per 200x60 pair")
+    print(f"speedup:              {legacy / indexed:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
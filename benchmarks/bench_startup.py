@@ -0,0 +1,54 @@
+"""Cold-start cost: app import time and first-request latency, with and without warm-up.
+
+Each measurement runs in a fresh interpreter. Run from the repository root:
+
+    python benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import json, time
+start = time.perf_counter()
+import app
+import_time = time.perf_counter() - start
+
+warm_up_time = 0.0
+if WARM_UP:
+    start = time.perf_counter()
+    app.warm_up()
+    warm_up_time = time.perf_counter() - start
+
+client = app.app.test_client()
+resume = {'id': 'r', 'skills': ['python', 'flask', 'sql', 'docker']}
+job = {'id': 'j', 'description': 'Requirements:\n- 3+ years of experience with python\n- django\n- aws\n'}
+latencies = []
+for _ in range(2):
+    start = time.perf_counter()
+    client.post('/api/rank_resumes', json={'resumes': [resume], 'jobs': [job]})
+    latencies.append(time.perf_counter() - start)
+print(json.dumps([import_time, warm_up_time] + latencies))
+'''
+
+
+def probe(warm_up):
+    output = subprocess.run(
+        [sys.executable, '-c', f'WARM_UP = {warm_up}\n' + PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'mode':<10} {'import':>9} {'warm-up':>9} {'1st req':>9} {'2nd req':>9}")
+    for warm_up in (False, True):
+        values = probe(warm_up)
+        print(f"{'warm' if warm_up else 'lazy':<10} " + ' '.join(f"{v * 1000:7.1f}ms" for v in values))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Build and load cost of the compiled taxonomy artifact with a 50k-skill taxonomy.
+
+The load step runs in fresh interpreters, once just mapping the artifact
+and once also compiling the scanner regex. Run from the repository root:
+
+    python benchmarks/bench_taxonomy.py
+"""
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from taxonomy import build_taxonomy  # noqa: E402
+
+SKILLS = 50000
+ALIASES = 5000
+RELATED_PER_SKILL = 3
+
+PROBE = r'''
+import json, sys, time
+from taxonomy import load_taxonomy
+start = time.perf_counter()
+taxonomy = load_taxonomy(sys.argv[1], sys.argv[2], '')
+load_time = time.perf_counter() - start
+
+start = time.perf_counter()
+for skill in sys.argv[3:]:
+    taxonomy.related_skills(skill)
+lookup_time = (time.perf_counter() - start) / len(sys.argv[3:])
+
+start = time.perf_counter()
+scanner = taxonomy.scanner()
+scanner_time = time.perf_counter() - start
+
+compile_time = 0.0
+if COMPILE:
+    start = time.perf_counter()
+    scanner.compile()
+    compile_time = time.perf_counter() - start
+print(json.dumps([load_time, lookup_time, scanner_time, compile_time]))
+'''
+
+
+def make_source(rng):
+    """A synthetic taxonomy of multi-word skills with aliases and related skills."""
+    skills = set()
+    while len(skills) < SKILLS:
+        words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        skills.add(' '.join(words))
+    skills = sorted(skills)
+    rng.shuffle(skills)
+
+    categories = {f'Category {i}': skills[i::50] for i in range(50)}
+    aliases = {skill.replace(' ', '-'): skill for skill in rng.sample(skills, ALIASES) if ' ' in skill}
+    related = {skill: rng.sample(skills, RELATED_PER_SKILL) for skill in skills}
+    weeks = {skill: rng.randint(1, 12) for skill in rng.sample(skills, 1000)}
+    source = {'categories': categories, 'aliases': aliases, 'related': related,
+              'learning_resources': {}, 'learning_weeks': weeks}
+    return source, skills
+
+
+def probe(artifact, source_path, lookups, compile_scanner):
+    output = subprocess.run(
+        [sys.executable, '-c', f'COMPILE = {compile_scanner}\n' + PROBE, artifact, source_path] + lookups,
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    rng = random.Random(0)
+    source, skills = make_source(rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, 'taxonomy.json')
+        artifact = os.path.join(directory, 'taxonomy.bin')
+        with open(source_path, 'w', encoding='utf-8') as file:
+            json.dump(source, file)
+
+        start = time.perf_counter()
+        build_taxonomy(artifact, source_path, '')
+        build_time = time.perf_counter() - start
+        size = os.path.getsize(artifact)
+
+        lookups = rng.sample(skills, 200)
+        mapped = probe(artifact, source_path, lookups, False)
+        compiled = probe(artifact, source_path, lookups, True)
+
+    print(f"{SKILLS} skills, {len(source['aliases'])} aliases, artifact {size / 1024 / 1024:.1f} MB")
+    print(f"build:                    {build_time * 1000:8.1f} ms")
+    print(f"map artifact:             {mapped[0] * 1000:8.1f} ms")
+    print(f"related_skills lookup:    {mapped[1] * 1e6:8.1f} us")
+    print(f"scanner tables:           {mapped[2] * 1000:8.1f} ms")
+    print(f"scanner regex compile:    {compiled[3] * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
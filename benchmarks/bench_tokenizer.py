@@ -0,0 +1,88 @@
+"""Tokenization: the shared regex tokenizer against NLTK's word_tokenize.
+
+word_tokenize needs the punkt models; without them NLTKWordTokenizer is
+timed alone, which leaves out its sentence split and so is a lower bound.
+Also shows how each splits skill names with punctuation. Run from the
+repository root:
+
+    python benchmarks/bench_tokenizer.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_skill_engine import make_document  # noqa: E402
+from job_analyzer import extract_company_name, extract_education_requirements  # noqa: E402
+from tokens import Tokens  # noqa: E402
+
+DOCUMENTS = 200
+SAMPLE = "Senior engineer at Acme Corp. C++, C#, ASP.NET and .NET; CI/CD with node.js. B.S. in Computer Science."
+
+# Education requirements extracted from whole tokens, including slash-joined alternatives
+EDUCATION_CASES = [
+    ("B.S. in Computer Science.", {'degree': 'B.S', 'field': 'Computer Science'}),
+    ("Requires BS/MS in Computer Science.", {'degree': 'BS', 'field': 'Computer Science'}),
+    ("MS/PhD preferred; CI/CD experience.", {'degree': 'MS', 'field': None}),
+    ("Experience with CI/CD and databases.", {'degree': None, 'field': None}),
+]
+
+
+def nltk_tokenizer():
+    """Return (label, tokenize) for NLTK, or None if it is not installed."""
+    try:
+        from nltk.tokenize import NLTKWordTokenizer, word_tokenize
+    except ImportError:
+        return None
+    try:
+        word_tokenize('warm up')
+        return 'nltk word_tokenize', word_tokenize
+    except LookupError:
+        return 'NLTKWordTokenizer (no punkt)', NLTKWordTokenizer().tokenize
+
+
+def best_of(func, documents, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for document in documents:
+            func(document)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(documents)
+
+
+def main():
+    documents = [make_document(2, seed=seed) for seed in range(DOCUMENTS)]
+    candidates = [('Tokens', Tokens)]
+    nltk = nltk_tokenizer()
+    if nltk:
+        candidates.append(nltk)
+
+    for text, expected in EDUCATION_CASES:
+        assert extract_education_requirements(text) == expected, (text, extract_education_requirements(text))
+
+    print(SAMPLE)
+    for label, tokenize in candidates:
+        tokens = tokenize(SAMPLE)
+        print(f"  {label}: {getattr(tokens, 'tokens', tokens)}")
+
+    print(f"\n{DOCUMENTS} two-page documents")
+    for label, tokenize in candidates:
+        print(f"{label:<32}{best_of(tokenize, documents) * 1000:8.3f} ms per document")
+
+    def separate(text):
+        extract_company_name(text)
+        extract_education_requirements(text)
+
+    def shared(text):
+        tokens = Tokens(text)
+        extract_company_name(text, tokens)
+        extract_education_requirements(text, tokens)
+
+    print(f"{'job extractors, own tokens':<32}{best_of(separate, documents) * 1000:8.3f} ms per document")
+    print(f"{'job extractors, shared tokens':<32}{best_of(shared, documents) * 1000:8.3f} ms per document")
+
+
+if __name__ == '__main__':
+    main()
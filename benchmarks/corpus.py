@@ -0,0 +1,199 @@
+"""Deterministic synthetic resumes and job descriptions for the benchmarks.
+
+The same seed always gives the same text. Skills are drawn from the shared
+taxonomy; skill_density is the fraction of words in the prose that are
+skills. To write a corpus to disk, run from the repository root:
+
+    python benchmarks/corpus.py OUT_DIR --resumes 50 --jobs 20 --pages 2 --format docx
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import docx  # noqa: E402
+
+from taxonomy import TAXONOMY  # noqa: E402
+
+LINES_PER_PAGE = 60
+
+FIRST_NAMES = ['Ada', 'Grace', 'Alan', 'Linus', 'Barbara', 'Ken', 'Margaret', 'Dennis', 'Frances', 'Edsger']
+LAST_NAMES = ['Lovelace', 'Hopper', 'Turing', 'Torvalds', 'Liskov', 'Thompson', 'Hamilton', 'Ritchie',
+              'Allen', 'Dijkstra']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Enterprises',
+             'Cyberdyne Systems', 'Soylent', 'Vandelay Industries']
+TITLES = ['Software Engineer', 'Senior Software Engineer', 'Data Scientist', 'DevOps Engineer',
+          'Backend Developer', 'Frontend Developer', 'Data Analyst', 'Engineering Manager']
+SCHOOLS = ['State University', 'Institute of Technology', 'City College', 'Polytechnic University']
+DEGREES = ['BSc Computer Science', 'MSc Data Science', 'BEng Software Engineering', 'BA Mathematics']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+FILLER = ('designed built delivered maintained improved led migrated automated reduced the a for with '
+          'team project customer platform service data reporting pipeline release quality latency '
+          'cost features users tooling across several production systems').split()
+
+
+def _prose(rng, words, skill_density, skills):
+    """Return filler text of about the given length with skills mixed in."""
+    out = []
+    for _ in range(words):
+        out.append(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER))
+    return ' '.join(out)
+
+
+def make_resume(seed=0, pages=1, skill_density=0.1, skills=None):
+    """Return the lines of a resume of about the given number of pages."""
+    rng = random.Random(seed)
+    skills = skills or TAXONOMY.detectable_skills()
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{seed}@example.com | 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+        '',
+        'Summary',
+        _prose(rng, 40, skill_density, skills),
+        '',
+        'Skills',
+        ', '.join(rng.sample(skills, min(len(skills), 12))),
+        '',
+        'Experience',
+    ]
+
+    year = 2024
+    target = max(1, pages) * LINES_PER_PAGE - 8
+    while len(lines) < target:
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}")
+        lines.append(f"{rng.choice(MONTHS)} {start} - " + ('Present' if year == 2024 else f"{rng.choice(MONTHS)} {year}"))
+        for _ in range(rng.randint(3, 6)):
+            lines.append('- ' + _prose(rng, rng.randint(10, 18), skill_density, skills))
+        lines.append('')
+        year = start
+
+    lines += [
+        'Education',
+        rng.choice(SCHOOLS),
+        rng.choice(DEGREES),
+        f"Sep {year - 4} - Jun {year}",
+    ]
+    return lines
+
+
+def make_job_description(seed=0, required=8, preferred=4, paragraphs=2, skill_density=0.05, skills=None):
+    """Return the text of a job description with required and preferred skill sections."""
+    rng = random.Random(seed)
+    skills = skills or TAXONOMY.detectable_skills()
+    picked = rng.sample(skills, min(len(skills), required + preferred))
+
+    lines = [rng.choice(TITLES), f"Company: {rng.choice(COMPANIES)}", '']
+    for _ in range(paragraphs):
+        lines.append(_prose(rng, 60, skill_density, skills))
+        lines.append('')
+    lines.append('Requirements:')
+    for skill in picked[:required]:
+        lines.append(f"- {rng.randint(1, 8)}+ years of experience with {skill}")
+    lines += ['', 'Nice to have:']
+    for skill in picked[required:]:
+        lines.append(f"- {skill}")
+    lines += ['', 'Benefits', '- Remote friendly', '- Learning budget', '']
+    return '\n'.join(lines)
+
+
+def paginate(lines, lines_per_page=LINES_PER_PAGE):
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+
+def write_text_docx(path, lines):
+    """Write a DOCX file with one paragraph per line."""
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_resume(path, lines):
+    """Write resume lines as a PDF or DOCX file, chosen by the extension of path."""
+    if path.endswith('.pdf'):
+        write_text_pdf(path, paginate(lines))
+    elif path.endswith('.docx'):
+        write_text_docx(path, lines)
+    else:
+        raise ValueError(f"Unsupported resume format: {path}")
+    return path
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_text_pdf(path, pages, font_size=10, leading=12):
+    """Write a plain-text PDF with one list of lines per page.
+
+    Only the standard Helvetica font is used, so no font embedding or third
+    party writer is needed and PyPDF2 can extract the text back.
+    """
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        None,  # Pages tree, filled in once the page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    page_ids = []
+    for lines in pages:
+        commands = [f'BT /F1 {font_size} Tf {leading} TL 50 800 Td']
+        for line in lines:
+            commands.append(f'({_pdf_escape(line)}) Tj T*')
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1', 'replace')
+
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids).encode()
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as file:
+        file.write(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic resume and job description corpus.')
+    parser.add_argument('out_dir')
+    parser.add_argument('--resumes', type=int, default=20)
+    parser.add_argument('--jobs', type=int, default=10)
+    parser.add_argument('--pages', type=int, default=1)
+    parser.add_argument('--density', type=float, default=0.1, help='fraction of prose words that are skills')
+    parser.add_argument('--format', choices=['pdf', 'docx'], default='pdf')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    for i in range(args.resumes):
+        lines = make_resume(args.seed + i, pages=args.pages, skill_density=args.density)
+        write_resume(os.path.join(args.out_dir, f'resume_{i:05d}.{args.format}'), lines)
+    for i in range(args.jobs):
+        with open(os.path.join(args.out_dir, f'job_{i:05d}.txt'), 'w', encoding='utf-8') as file:
+            file.write(make_job_description(args.seed + i, skill_density=args.density / 2))
+    print(f"Wrote {args.resumes} resumes and {args.jobs} job descriptions to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,528 @@
+"""Benchmark suite: extractor and matcher microbenchmarks plus end-to-end route runs.
+
+Every benchmark runs over a corpus generated from a fixed seed, so runs on
+the same machine are comparable. Results are written as JSON, and compare
+flags benchmarks whose median time grew by more than a threshold. Run from
+the repository root:
+
+    python benchmarks/suite.py run --save main           # benchmarks/baselines/main.json
+    python benchmarks/suite.py run --filter e2e --output /tmp/current.json
+    python benchmarks/suite.py compare main /tmp/current.json --threshold 10
+    python benchmarks/suite.py compare main              # runs the suite now
+
+compare exits with status 1 when a benchmark regressed, so it can gate CI.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_skill_similarity import make_skills  # noqa: E402
+from benchmarks.corpus import make_job_description, make_resume, write_resume  # noqa: E402
+
+BASELINE_DIR = os.path.join(ROOT, 'benchmarks', 'baselines')
+DEFAULT_THRESHOLD = 10.0
+
+# Time budget per benchmark; fast ones are repeated until it is used up
+TARGET_SECONDS = 0.5
+MIN_ROUNDS = 5
+MAX_ROUNDS = 1000
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a benchmark: a setup function taking the corpus and returning the callable to time."""
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+class Corpus:
+    """Generated documents shared by all benchmarks of one run."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.resume_lines = make_resume(seed=1, pages=2, skill_density=0.1)
+        self.resume_text = '\n'.join(self.resume_lines)
+        self.job_text = make_job_description(seed=2, required=10, preferred=5)
+        self.files = {}
+        for name, pages, extension in [('small', 1, 'pdf'), ('large', 10, 'pdf'), ('small', 1, 'docx'),
+                                       ('large', 10, 'docx')]:
+            path = os.path.join(directory, f'resume_{name}.{extension}')
+            self.files[f'{name}.{extension}'] = write_resume(path, make_resume(seed=3, pages=pages))
+
+    def read(self, key):
+        with open(self.files[key], 'rb') as file:
+            return file.read()
+
+
+# Extraction
+
+@benchmark('extract_text_from_pdf.1_page')
+def _pdf_small(corpus):
+    from resume_parser import extract_text_from_pdf
+    return lambda: extract_text_from_pdf(corpus.files['small.pdf'])
+
+
+@benchmark('extract_text_from_pdf.10_pages')
+def _pdf_large(corpus):
+    from resume_parser import extract_text_from_pdf
+    return lambda: extract_text_from_pdf(corpus.files['large.pdf'])
+
+
+@benchmark('extract_text_from_docx.1_page')
+def _docx_small(corpus):
+    from resume_parser import extract_text_from_docx
+    return lambda: extract_text_from_docx(corpus.files['small.docx'])
+
+
+@benchmark('extract_text_from_docx.10_pages')
+def _docx_large(corpus):
+    from resume_parser import extract_text_from_docx
+    return lambda: extract_text_from_docx(corpus.files['large.docx'])
+
+
+@benchmark('extract_contact_info')
+def _contact_info(corpus):
+    from resume_parser import extract_contact_info
+    return lambda: extract_contact_info(corpus.resume_text)
+
+
+@benchmark('extract_skills')
+def _skills(corpus):
+    from resume_parser import extract_skills
+    return lambda: extract_skills(corpus.resume_text)
+
+
+@benchmark('extract_experience')
+def _experience(corpus):
+    from resume_parser import extract_experience
+    return lambda: extract_experience(corpus.resume_text)
+
+
+@benchmark('extract_education')
+def _education(corpus):
+    from resume_parser import extract_education
+    return lambda: extract_education(corpus.resume_text)
+
+
+@benchmark('extract_total_experience')
+def _total_experience(corpus):
+    from resume_parser import extract_total_experience
+    return lambda: extract_total_experience(corpus.resume_text)
+
+
+@benchmark('date_index')
+def _date_index(corpus):
+    from tenure import DateIndex
+    return lambda: DateIndex(corpus.resume_text)
+
+
+@benchmark('parse_resume.pdf')
+def _parse_pdf(corpus):
+    from resume_parser import parse_resume
+    return lambda: parse_resume(corpus.files['small.pdf'])
+
+
+@benchmark('parse_resume.docx')
+def _parse_docx(corpus):
+    from resume_parser import parse_resume
+    return lambda: parse_resume(corpus.files['small.docx'])
+
+
+# Job analysis
+
+@benchmark('extract_required_skills')
+def _required(corpus):
+    from job_analyzer import extract_required_skills
+    return lambda: extract_required_skills(corpus.job_text)
+
+
+@benchmark('extract_preferred_skills')
+def _preferred(corpus):
+    from job_analyzer import extract_preferred_skills
+    return lambda: extract_preferred_skills(corpus.job_text)
+
+
+@benchmark('extract_experience_requirements')
+def _experience_requirements(corpus):
+    from job_analyzer import extract_experience_requirements
+    return lambda: extract_experience_requirements(corpus.job_text)
+
+
+@benchmark('analyze_job_description')
+def _analyze_job(corpus):
+    from job_analyzer import analyze_job_description
+    return lambda: analyze_job_description(corpus.job_text, 'Engineer')
+
+
+# Matching
+
+def _skill_lists():
+    rng = random.Random(4)
+    return make_skills(rng, 30), make_skills(rng, 15)
+
+
+@benchmark('match_skills')
+def _match(corpus):
+    from skill_matcher import match_skills
+    resume_skills, job_skills = _skill_lists()
+    return lambda: match_skills(resume_skills, job_skills)
+
+
+@benchmark('calculate_skill_gaps')
+def _gaps(corpus):
+    from skill_matcher import calculate_skill_gaps
+    resume_skills, job_skills = _skill_lists()
+    return lambda: calculate_skill_gaps(resume_skills, job_skills)
+
+
+@benchmark('analyze_skill_gaps')
+def _analyze_gaps(corpus):
+    from models import JobDescription, Resume
+    from skill_matcher import analyze_skill_gaps, LEARNING_PLANNER
+    LEARNING_PLANNER.preload()
+    resume_skills, job_skills = _skill_lists()
+    resume = Resume.from_dict({'skills': resume_skills, 'total_experience_years': 3})
+    job = JobDescription('Engineer', required_skills=job_skills[:10], preferred_skills=job_skills[10:])
+    return lambda: analyze_skill_gaps(resume, job)
+
+
+@benchmark('get_recommendations')
+def _recommendations(corpus):
+    from skill_matcher import get_recommendations, LEARNING_PLANNER
+    LEARNING_PLANNER.preload()
+    resume_skills, job_skills = _skill_lists()
+    return lambda: get_recommendations(job_skills, resume_skills)
+
+
+@benchmark('score_matrix.1000x20')
+def _score_matrix(corpus):
+    from batch_scoring import score_matrix
+    rng = random.Random(5)
+    resumes = [make_skills(rng, 20) for _ in range(1000)]
+    jobs = [make_skills(rng, 10) for _ in range(20)]
+    return lambda: score_matrix(resumes, jobs)
+
+
+# End to end, through the Flask test client
+
+_isolated = False
+
+
+def _client():
+    """The app and a test client, with in-memory stores in place of any configured persistent ones."""
+    global _isolated
+    import app as app_module
+
+    if not _isolated:
+        # Benchmark users and resumes must not reach a shared database, index journal or cache directory
+        from parse_cache import ParseCache
+        from resume_parser import PARSER_VERSION
+        from session_store import MemorySessionStore
+        from skill_index import SkillIndex
+        app_module.user_store = MemorySessionStore()
+        app_module.skill_index = SkillIndex(path='')
+        app_module.parse_cache = ParseCache(PARSER_VERSION, directory='')
+        app_module.SEARCH_API_TOKEN = 'bench'
+        _isolated = True
+    return app_module, app_module.app.test_client()
+
+
+def _upload(client, data, filename):
+    return client.post('/upload_resume', data={'resume': (io.BytesIO(data), filename)},
+                       content_type='multipart/form-data')
+
+
+@benchmark('e2e.upload_resume.pdf')
+def _e2e_upload(corpus):
+    app_module, client = _client()
+    data = corpus.read('small.pdf')
+
+    def run():
+        app_module.parse_cache.clear()
+        response = _upload(client, data, 'resume.pdf')
+        assert 'resume_analysis' in (response.location or ''), f"{response.status_code} -> {response.location}"
+    return run
+
+
+@benchmark('e2e.upload_resume.cached')
+def _e2e_upload_cached(corpus):
+    app_module, client = _client()
+    data = corpus.read('small.docx')
+    _upload(client, data, 'resume.docx')
+
+    def run():
+        response = _upload(client, data, 'resume.docx')
+        assert 'resume_analysis' in (response.location or ''), f"{response.status_code} -> {response.location}"
+    return run
+
+
+@benchmark('e2e.analyze_job')
+def _e2e_analyze_job(corpus):
+    app_module, client = _client()
+    response = _upload(client, corpus.read('small.pdf'), 'resume.pdf')
+    assert 'resume_analysis' in (response.location or ''), 'resume upload failed'
+
+    def run():
+        app_module.job_cache.clear()
+        response = client.post('/analyze_job', data={'job_description': corpus.job_text, 'job_title': 'Engineer'})
+        assert response.status_code == 302 and 'skill_gaps' in (response.location or ''), response.status_code
+    return run
+
+
+@benchmark('e2e.analyze_job.cached')
+def _e2e_analyze_job_cached(corpus):
+    app_module, client = _client()
+    response = _upload(client, corpus.read('small.pdf'), 'resume.pdf')
+    assert 'resume_analysis' in (response.location or ''), 'resume upload failed'
+    client.post('/analyze_job', data={'job_description': corpus.job_text, 'job_title': 'Engineer'})
+
+    def run():
+        response = client.post('/analyze_job', data={'job_description': corpus.job_text, 'job_title': 'Engineer'})
+        assert response.status_code == 302 and 'skill_gaps' in (response.location or ''), response.status_code
+    return run
+
+
+def _analyzed_client(corpus):
+    app_module, client = _client()
+    response = _upload(client, corpus.read('small.pdf'), 'resume.pdf')
+    assert 'resume_analysis' in (response.location or ''), 'resume upload failed'
+    response = client.post('/analyze_job', data={'job_description': corpus.job_text, 'job_title': 'Engineer'})
+    return app_module, client, response.location.replace('/skill_gaps/', '/api/skill_gaps/')
+
+
+@benchmark('e2e.api_skill_gaps')
+def _e2e_skill_gaps(corpus):
+    app_module, client, url = _analyzed_client(corpus)
+
+    def run():
+        app_module.response_cache.clear()
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+    return run
+
+
+@benchmark('e2e.api_skill_gaps.cached')
+def _e2e_skill_gaps_cached(corpus):
+    _, client, url = _analyzed_client(corpus)
+
+    def run():
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+    return run
+
+
+@benchmark('e2e.api_skill_gaps.revalidate')
+def _e2e_skill_gaps_revalidate(corpus):
+    _, client, url = _analyzed_client(corpus)
+    etag = client.get(url).headers['ETag']
+
+    def run():
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304, response.status_code
+    return run
+
+
+@benchmark('e2e.api_rank_resumes')
+def _e2e_rank(corpus):
+    _, client = _client()
+    rng = random.Random(6)
+    payload = {
+        'resumes': [{'id': f'r{i}', 'skills': make_skills(rng, 20)} for i in range(200)],
+        'jobs': [{'id': f'j{i}', 'description': make_job_description(seed=i)} for i in range(5)]
+    }
+
+    def run():
+        response = client.post('/api/rank_resumes', json=payload)
+        assert response.status_code == 200, response.status_code
+    return run
+
+
+@benchmark('e2e.api_search_resumes')
+def _e2e_search(corpus):
+    app_module, client = _client()
+    rng = random.Random(7)
+    for i in range(2000):
+        app_module.skill_index.add(f'bench-{i}', make_skills(rng, 20))
+
+    def run():
+        response = client.get('/api/search_resumes?all=python&any=docker,aws&rank_by=python,docker,sql',
+                              headers={'Authorization': 'Bearer bench'})
+        assert response.status_code == 200, response.status_code
+    return run
+
+
+def time_callable(func):
+    """Return per-call timings in seconds, after one warm-up call."""
+    func()
+    timings = []
+    deadline = time.perf_counter() + TARGET_SECONDS
+    while len(timings) < MIN_ROUNDS or (len(timings) < MAX_ROUNDS and time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_suite(name_filter=None):
+    """Run the selected benchmarks and return the result document."""
+    results = {}
+    # The app modules log at DEBUG level; failures are reported in the results
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = Corpus(directory)
+        for name, setup in BENCHMARKS:
+            if name_filter and name_filter not in name:
+                continue
+            try:
+                timings = time_callable(setup(corpus))
+            except Exception as e:
+                # Missing NLTK data or a broken route fails one benchmark, not the run
+                results[name] = {'error': f"{type(e).__name__}: {e}"}
+                print(f"{name:36} ERROR {results[name]['error'].splitlines()[0][:80]}", file=sys.stderr)
+                if os.environ.get('BENCH_TRACEBACK'):
+                    traceback.print_exc(file=sys.stderr)
+                continue
+
+            results[name] = {
+                'median_ms': statistics.median(timings) * 1000,
+                'min_ms': min(timings) * 1000,
+                'mean_ms': statistics.fmean(timings) * 1000,
+                'rounds': len(timings)
+            }
+            print(f"{name:36} {results[name]['median_ms']:10.3f} ms  ({len(timings)} rounds)", file=sys.stderr)
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'results': results
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _baseline_path(name_or_path):
+    """Accept a baseline name (stored under benchmarks/baselines) or a file path."""
+    if os.path.exists(name_or_path) or name_or_path.endswith('.json'):
+        return name_or_path
+    return os.path.join(BASELINE_DIR, name_or_path + '.json')
+
+
+def load_results(name_or_path):
+    with open(_baseline_path(name_or_path), 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_results(document, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return (rows, regressions) comparing the median times of two result documents.
+
+    Benchmarks that failed or are missing from the current results count as
+    regressions, so a crash cannot pass the gate.
+    """
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline['results']) | set(current['results'])):
+        before = baseline['results'].get(name, {})
+        after = current['results'].get(name, {})
+        if 'median_ms' not in before or 'median_ms' not in after:
+            # Without a baseline timing, a benchmark that runs now is new
+            status = 'error' if 'error' in after else ('missing' if 'median_ms' not in after else 'new')
+            if status != 'new':
+                regressions.append(name)
+            rows.append((name, before.get('median_ms'), after.get('median_ms'), None, status))
+            continue
+
+        change = (after['median_ms'] - before['median_ms']) / before['median_ms'] * 100
+        if change > threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            status = 'faster'
+        else:
+            status = 'ok'
+        rows.append((name, before['median_ms'], after['median_ms'], change, status))
+    return rows, regressions
+
+
+def _format_ms(value):
+    return f"{value:10.3f}" if value is not None else f"{'-':>10}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the suite and write the results as JSON')
+    run_parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    run_parser.add_argument('--save', metavar='NAME', help='store as benchmarks/baselines/NAME.json')
+    run_parser.add_argument('--output', help='write the results to this path')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions against a baseline')
+    compare_parser.add_argument('baseline', help='baseline name or JSON path')
+    compare_parser.add_argument('current', nargs='?', help='results name or JSON path (default: run now)')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='percent slowdown of the median that counts as a regression')
+    compare_parser.add_argument('--filter', help='only run benchmarks whose name contains this text')
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        document = run_suite(args.filter)
+        paths = [path for path in [args.output, args.save and _baseline_path(args.save)] if path]
+        for path in paths:
+            save_results(document, path)
+            print(f"Wrote {path}", file=sys.stderr)
+        if not paths:
+            print(json.dumps(document, indent=2, sort_keys=True))
+        return 0
+
+    baseline = load_results(args.baseline)
+    if args.filter:
+        baseline['results'] = {name: result for name, result in baseline['results'].items() if args.filter in name}
+    current = load_results(args.current) if args.current else run_suite(args.filter)
+    rows, regressions = compare(baseline, current, args.threshold)
+
+    print(f"{'benchmark':36} {'base ms':>10} {'now ms':>10} {'change':>8}  status")
+    for name, before, after, change, status in rows:
+        change_text = f"{change:+7.1f}%" if change is not None else f"{'':8}"
+        print(f"{name:36} {_format_ms(before)} {_format_ms(after)} {change_text}  {status}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:g}% or failed benchmark(s): "
+              f"{', '.join(regressions)}")
+        return 1
+    print(f"No regressions above {args.threshold:g}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,339 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import signal
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, CancelledError, TimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from tqdm import tqdm
+
+import nlp_resources
+from process_pool import WorkerPool
+from resume_parser import parse_resume, PARSER_VERSION
+from taxonomy import TAXONOMY
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Parsing processes, files per work unit, and seconds one file may take
+INGEST_WORKERS = int(os.environ.get('INGEST_WORKERS', os.cpu_count() or 1))
+INGEST_CHUNK_SIZE = int(os.environ.get('INGEST_CHUNK_SIZE', 16))
+INGEST_FILE_TIMEOUT = float(os.environ.get('INGEST_FILE_TIMEOUT', 60))
+
+# Files picked up from directories and archives
+DOCUMENT_EXTENSIONS = ('.pdf', '.docx', '.doc')
+
+# Work units in flight per worker; bounds the archive bytes held in memory
+CHUNKS_PER_WORKER = 2
+
+# The output is flushed and synced to disk after this many records
+FLUSH_EVERY = 64
+
+# Grace period on top of the per-file timeouts before a stuck pool is killed
+STALL_GRACE_SECONDS = 30
+
+
+class FileTimeout(Exception):
+    """Raised in a worker when one file takes longer than its timeout."""
+
+
+def _raise_timeout(signum, frame):
+    raise FileTimeout('Parsing took longer than the per-file timeout')
+
+
+def _init_worker(log_level):
+    logging.getLogger().setLevel(log_level)
+    if hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+
+
+def parse_document(name, source, timeout=INGEST_FILE_TIMEOUT, keep_text=True):
+    """Parse one file given as a path or bytes into an output record; never raises.
+
+    The timeout is enforced with SIGALRM where the platform has it, so it
+    interrupts Python code but not a call stuck inside a C extension.
+    """
+    start = time.perf_counter()
+    record = {'source': name, 'parser_version': PARSER_VERSION}
+    try:
+        if isinstance(source, str):
+            with open(source, 'rb') as file:
+                source = file.read()
+        record['content_hash'] = hashlib.sha256(source).hexdigest()
+
+        if timeout and hasattr(signal, 'setitimer'):
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            resume = parse_resume(source)
+        finally:
+            if timeout and hasattr(signal, 'setitimer'):
+                signal.setitimer(signal.ITIMER_REAL, 0)
+
+        record['status'] = 'ok'
+        record['resume'] = resume.to_dict(keep_text)
+    except FileTimeout as e:
+        record['status'] = 'timeout'
+        record['error'] = str(e)
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['seconds'] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def parse_chunk(items, timeout, keep_text):
+    """Parse a work unit of (name, path or bytes) items in a worker process."""
+    return [parse_document(name, source, timeout, keep_text) for name, source in items]
+
+
+def _is_document(name):
+    return name.lower().endswith(DOCUMENT_EXTENSIONS)
+
+
+def iter_sources(path):
+    """Yield (name, path or bytes) for each document in a directory, zip or tar archive, or a single file.
+
+    Directory files are passed as paths and read by the workers. Archive
+    members are read one at a time, tar archives as a stream, so memory
+    does not grow with the archive.
+    """
+    if os.path.isdir(path):
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for file_name in sorted(files):
+                if _is_document(file_name):
+                    full_path = os.path.join(directory, file_name)
+                    yield os.path.relpath(full_path, path), full_path
+    elif _is_document(path):
+        yield os.path.basename(path), path
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_document(info.filename):
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and _is_document(member.name):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"{path} is not a directory, a document, or a zip or tar archive")
+
+
+def count_sources(path):
+    """Number of documents iter_sources will yield, or None if it needs a full pass (tar)."""
+    if os.path.isdir(path):
+        return sum(1 for directory, _, files in os.walk(path) for file_name in files if _is_document(file_name))
+    if _is_document(path):
+        return 1
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            return sum(1 for info in archive.infolist() if not info.is_dir() and _is_document(info.filename))
+    return None
+
+
+def load_checkpoint(output_path, retry_failed=False):
+    """Return the sources already recorded in an output file.
+
+    A partial last line left by a crash is cut off, so appending continues
+    from the last complete record. With retry_failed, only successfully
+    parsed sources count as done.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    valid_end = 0
+    with open(output_path, 'rb+') as file:
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+            valid_end += len(line)
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('status') == 'ok' or not retry_failed:
+                done.add(record['source'])
+            else:
+                done.discard(record['source'])
+        if file.tell() != valid_end:
+            logger.warning(f"Dropping a partial record at the end of {output_path}")
+            file.truncate(valid_end)
+    return done
+
+
+def _chunks(sources, done, chunk_size):
+    chunk = []
+    for name, source in sources:
+        if name in done:
+            continue
+        chunk.append((name, source))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _new_pool(workers, log_level):
+    return WorkerPool(workers, initializer=_init_worker, initargs=(log_level,))
+
+
+def ingest(source, output_path, workers=INGEST_WORKERS, chunk_size=INGEST_CHUNK_SIZE, timeout=INGEST_FILE_TIMEOUT,
+           resume=False, retry_failed=False, keep_text=True, progress=True, log_level=logging.WARNING):
+    """Parse every document under source into JSON lines in output_path and return run statistics.
+
+    Work units of chunk_size files go to a process pool, with at most
+    CHUNKS_PER_WORKER units per worker in flight. Records are appended in
+    completion order. With resume, sources already in the output are
+    skipped. If a worker dies, or the pool stops making progress and is
+    killed, every unit that was in flight is retried one file at a time, on
+    its own, so only the file at fault is recorded as failed.
+    """
+    done = load_checkpoint(output_path, retry_failed) if resume else set()
+    total = count_sources(source)
+    stats = {'ok': 0, 'failed': 0, 'timeout': 0, 'skipped': len(done)}
+    window = max(1, workers) * CHUNKS_PER_WORKER
+    # One unit may wait behind a full window before it runs
+    stall_seconds = (window // max(1, workers) + 1) * chunk_size * (timeout or INGEST_FILE_TIMEOUT) + STALL_GRACE_SECONDS
+
+    pool = _new_pool(workers, log_level)
+    pending = {}
+    written = 0
+    start = time.perf_counter()
+
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, \
+            tqdm(total=total, initial=len(done) if total else 0, unit='doc', disable=not progress) as bar:
+
+        def write(record):
+            nonlocal written
+            out.write(json.dumps(record) + '\n')
+            stats[record['status']] += 1
+            written += 1
+            bar.update(1)
+            if stats['failed'] or stats['timeout']:
+                bar.set_postfix(failed=stats['failed'], timeout=stats['timeout'])
+            if written % FLUSH_EVERY == 0:
+                out.flush()
+                os.fsync(out.fileno())
+
+        def submit(chunk):
+            future = pool.submit(parse_chunk, chunk, timeout, keep_text)
+            pending[future] = (chunk, time.monotonic())
+
+        def collect(future, crashed):
+            """Write the records of a unit, or add its files to crashed if its pool died or was killed."""
+            chunk, _ = pending.pop(future)
+            try:
+                records = future.result(timeout=0)
+            except (BrokenProcessPool, CancelledError, TimeoutError):
+                crashed.extend(chunk)
+                return
+            for record in records:
+                write(record)
+
+        def run_alone(item):
+            """Parse one file with nothing else in flight, to tell whether it kills its worker."""
+            nonlocal pool
+            future = pool.submit(parse_chunk, [item], timeout, keep_text)
+            try:
+                write(future.result(timeout=(timeout or INGEST_FILE_TIMEOUT) + STALL_GRACE_SECONDS)[0])
+                return
+            except BrokenProcessPool:
+                error = 'The worker process parsing this file died'
+                pool.shutdown(wait=False)
+            except TimeoutError:
+                error = 'Parsing stalled past the per-file timeout and its worker was killed'
+                pool.kill()
+            logger.error(f"{item[0]}: {error}")
+            write({'source': item[0], 'parser_version': PARSER_VERSION, 'status': 'failed', 'error': error})
+            pool = _new_pool(workers, log_level)
+
+        def restart(crashed):
+            """Replace a dead or killed pool and retry every file that was in flight on its own."""
+            nonlocal pool
+            # Every unit in flight fails with the pool; one that does not in time is counted as crashed
+            _, unfinished = wait(pending, timeout=STALL_GRACE_SECONDS)
+            for future in list(pending):
+                collect(future, crashed)
+            if unfinished:
+                pool.kill()
+            else:
+                pool.shutdown(wait=False)
+            pool = _new_pool(workers, log_level)
+            for item in crashed:
+                run_alone(item)
+
+        def drain(block_until):
+            while len(pending) > block_until:
+                finished, _ = wait(pending, timeout=STALL_GRACE_SECONDS, return_when=FIRST_COMPLETED)
+                if not finished:
+                    oldest = min(submitted for _, submitted in pending.values())
+                    if time.monotonic() - oldest > stall_seconds:
+                        logger.error(f"No progress for {stall_seconds:.0f}s, restarting the worker pool")
+                        pool.kill()
+                        restart([])
+                    continue
+
+                crashed = []
+                for future in finished:
+                    collect(future, crashed)
+                if crashed:
+                    restart(crashed)
+
+        for chunk in _chunks(iter_sources(source), done, chunk_size):
+            drain(window - 1)
+            submit(chunk)
+        drain(0)
+        out.flush()
+        os.fsync(out.fileno())
+
+    pool.shutdown()
+    elapsed = time.perf_counter() - start
+    parsed = stats['ok'] + stats['failed'] + stats['timeout']
+    stats['seconds'] = round(elapsed, 2)
+    stats['docs_per_second'] = round(parsed / elapsed, 1) if elapsed else 0.0
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Parse a directory, zip or tar archive of resumes into a JSON lines file.',
+        epilog='Example: python bulk_ingest.py archive.tar.gz -o resumes.jsonl --resume'
+    )
+    parser.add_argument('source', help='directory, .zip or .tar(.gz) archive, or a single document')
+    parser.add_argument('-o', '--output', required=True, help='JSON lines file, one record per document')
+    parser.add_argument('--workers', type=int, default=INGEST_WORKERS)
+    parser.add_argument('--chunk-size', type=int, default=INGEST_CHUNK_SIZE, help='files per work unit')
+    parser.add_argument('--timeout', type=float, default=INGEST_FILE_TIMEOUT, help='seconds per file, 0 for none')
+    parser.add_argument('--resume', action='store_true', help='skip documents already in the output')
+    parser.add_argument('--retry-failed', action='store_true', help='with --resume, parse failed documents again')
+    parser.add_argument('--without-text', action='store_true', help='leave raw_text out of the records')
+    parser.add_argument('--no-progress', action='store_true')
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args(argv)
+
+    log_level = getattr(logging, args.log_level.upper())
+    logging.getLogger().setLevel(log_level)
+
+    # Load shared data once; forked workers inherit it
+    nlp_resources.preload()
+    TAXONOMY.scanner().compile()
+
+    stats = ingest(args.source, args.output, workers=args.workers, chunk_size=args.chunk_size,
+                   timeout=args.timeout, resume=args.resume, retry_failed=args.retry_failed,
+                   keep_text=not args.without_text, progress=not args.no_progress, log_level=log_level)
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if stats['failed'] or stats['timeout'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+import gc
+
+# Import the app in the master so workers share its memory copy-on-write
+preload_app = True
+
+
+def on_starting(server):
+    from app import warm_up
+
+    warm_up()
+    # Keep the collector from touching (and so copying) the preloaded objects
+    gc.freeze()
@@ -1,237 +1,367 @@
 import re
 import logging
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+from taxonomy import TAXONOMY
+from timing import StageTimer
+from metrics import SKILLS_FOUND
+from sections import segment_sections, JOB_HEADINGS
+from tenure import DateIndex
+from tokens import Tokens
+from models import JobDescription
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Download NLTK data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('tokenizers/punkt')
-
-
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('punkt_tab')
-
-# Common technical skills to look for (same as in resume_parser.py)
-COMMON_SKILLS = [
-    # Programming Languages
-    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-    'go', 'rust', 'perl', 'scala', 'r', 'matlab', 'bash', 'shell', 'powershell', 'sql',
-    # Web Development
-    'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 'flask', 'spring',
-    'asp.net', 'jquery', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack', 'babel', 'nextjs',
-    # Databases
-    'mysql', 'postgresql', 'mongodb', 'oracle', 'sql server', 'sqlite', 'nosql', 'redis', 
-    'dynamodb', 'cassandra', 'elasticsearch', 'firebase',
-    # DevOps & Cloud
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions', 
-    'terraform', 'ansible', 'puppet', 'chef', 'vagrant', 'prometheus', 'grafana',
-    # Data Science & AI
-    'machine learning', 'deep learning', 'artificial intelligence', 'nlp', 'neural networks',
-    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'pandas', 'numpy', 'scipy', 'matplotlib',
-    'tableau', 'power bi', 'data mining', 'computer vision', 'big data',
-    # Mobile Development
-    'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic',
-    # Tools & Methodologies
-    'git', 'svn', 'agile', 'scrum', 'kanban', 'jira', 'confluence', 'trello', 'slack',
-    'continuous integration', 'continuous deployment', 'ci/cd', 'tdd', 'bdd', 'devops',
-    # Soft Skills
-    'problem solving', 'teamwork', 'communication', 'leadership', 'project management',
-    'time management', 'critical thinking', 'decision making', 'adaptability', 'creativity'
+# Skills to look for, from the shared taxonomy (same scanner as resume_parser.py)
+COMMON_SKILLS = TAXONOMY.detectable_skills()
+SKILL_SCANNER = TAXONOMY.scanner()
+
+# Lines read from each section after its heading
+JOB_SECTION_LINES = {'required': 30, 'preferred': 15}
+
+# Look for bullet points or numbered lists inside a section
+BULLET_PATTERNS = [
+    re.compile(r'[•\-\*] (.*?)(?:\n|$)', re.MULTILINE),  # Bullets
+    re.compile(r'^\d+\.\s*(.*?)(?:\n|$)', re.MULTILINE),  # Numbered
+    re.compile(r'(?:^|\n)(?!•|\-|\*|\d+\.)(.*?)(?=\n|$)', re.MULTILINE)  # Regular lines
 ]
 
-def extract_company_name(text):
+# Words that introduce the company name, in order of preference: a label
+# followed by a colon ("Company: Acme"), then "at Acme", then "with Acme"
+COMPANY_LABELS = frozenset(['company', 'organization', 'employer'])
+COMPANY_PREPOSITIONS = ('at', 'with')
+
+# Degrees as normalized tokens ("Bachelor's" is "bachelor's", "B.S." is "b.s")
+DEGREE_WORDS = frozenset([
+    'bachelor', "bachelor's", 'bachelors', 'master', "master's", 'masters', 'phd', 'ph.d', 'doctorate',
+    'bs', 'b.s', 'bsc', 'ms', 'm.s', 'msc', 'ba', 'b.a', 'ma', 'm.a'
+])
+
+# The field of a degree runs from "in" to the end of the clause
+FIELD_PATTERN = re.compile(r'[^,\.;\n]+')
+
+def _degree_in(token):
+    """Return the degree named by a token, or by the first of its slash-joined alternatives ("BS/MS"), or None."""
+    if token.lower() in DEGREE_WORDS:
+        return token
+    if '/' in token:
+        for part in token.split('/'):
+            if part.lower() in DEGREE_WORDS:
+                return part
+    return None
+
+def extract_company_name(text, tokens=None):
     """Extract company name from job description."""
+    if tokens is None:
+        tokens = Tokens(text)
     lines = text.split("\n")
-    company = ""
-    
-    # Look for typical company indicators
-    company_indicators = ["company:", "organization:", "employer:", "at ", "with "]
-    for line in lines[:10]:  # Check first few lines only
-        line_lower = line.lower()
-        for indicator in company_indicators:
-            if indicator in line_lower:
-                parts = line.split(indicator, 1)
-                if len(parts) > 1:
-                    company = parts[1].strip()
-                    break
-        if company:
-            break
     
-    # If no company found, make an educated guess
-    if not company:
-        # First line might be job title, second might be company
-        if len(lines) > 1:
-            company = lines[1].strip()
+    # Look for typical company indicators, in the first few lines only
+    line_start = 0
+    for line in lines[:10]:
+        line_end = line_start + len(line)
+        first = tokens.index(line_start)
+        last = tokens.index(line_end)
+        line_start = line_end + 1
+        
+        label = tokens.find(COMPANY_LABELS, first, last)
+        while label >= 0 and not tokens.followed_by(label, ':'):
+            label = tokens.find(COMPANY_LABELS, label + 1, last)
+        candidates = [label] + [tokens.find((word,), first, last) for word in COMPANY_PREPOSITIONS]
+        for i in candidates:
+            if i >= 0:
+                company = text[tokens.ends[i]:line_end].lstrip(':').strip()
+                if company:
+                    return company
+                break
     
-    return company
+    # If no company found, make an educated guess
+    # First line might be job title, second might be company
+    if len(lines) > 1:
+        return lines[1].strip()
+    return ""
 
-def extract_required_skills(text):
-    """Extract required skills from job description."""
-    required_skills = []
+def segment_job_sections(text):
+    """Locate the requirement and preferred-skill sections of a job description."""
+    return segment_sections(text, JOB_HEADINGS, JOB_SECTION_LINES)
+
+def _skills_in_sections(text, spans, skill_matches):
+    """Collect the skills found in the bullet items of the given sections."""
+    skills = []
+    starts = [start for _, start, _ in skill_matches]
     
-    # Check for skills sections
-    skill_sections = []
+    for section_start, section_end in spans:
+        section = text[section_start:section_end]
+        for pattern in BULLET_PATTERNS:
+            for item in pattern.finditer(section):
+                item_start = section_start + item.start(1)
+                item_end = section_start + item.end(1)
+                
+                # Check if this bullet contains a known skill
+                i = bisect_left(starts, item_start)
+                while i < len(skill_matches) and starts[i] < item_end:
+                    skill, _, skill_end = skill_matches[i]
+                    if skill_end <= item_end and skill not in skills:
+                        skills.append(skill)
+                    i += 1
     
-    # Pattern for requirements/qualifications sections
-    req_pattern = r'(?i)(?:requirements|qualifications|skills required|required skills|key skills|technical skills)(?:[^\n]*\n){1,30}?(?=\n\s*(?:benefits|about us|company|application|how to apply|\Z))'
-    skill_sections.extend(re.findall(req_pattern, text))
+    return skills
+
+def extract_required_skills(text, sections=None, skill_matches=None):
+    """Extract required skills from job description."""
+    if sections is None:
+        sections = segment_job_sections(text)
+    if skill_matches is None:
+        skill_matches = SKILL_SCANNER.find_all(text)
     
     # If no specific sections found, use the entire text
-    if not skill_sections:
-        skill_sections = [text]
-    
-    # Process each section
-    for section in skill_sections:
-        # Look for bullet points or numbered lists
-        bullet_patterns = [
-            r'[•\-\*] (.*?)(?:\n|$)',  # Bullets
-            r'^\d+\.\s*(.*?)(?:\n|$)',  # Numbered
-            r'(?:^|\n)(?!•|\-|\*|\d+\.)(.*?)(?=\n|$)'  # Regular lines
-        ]
-        
-        for pattern in bullet_patterns:
-            items = re.findall(pattern, section, re.MULTILINE)
-            for item in items:
-                item = item.strip().lower()
-                
-                # Check if this bullet contains a known skill
-                for skill in COMMON_SKILLS:
-                    # Match whole words only
-                    pattern = r'\b' + re.escape(skill) + r'\b'
-                    if re.search(pattern, item):
-                        if skill not in required_skills:
-                            required_skills.append(skill)
-                
-                # Also add any items that include years of experience
-                if re.search(r'\b(\d+)[\+]?\s*(?:years|yr|yrs)(?:\s+of)?\s+(?:experience|exp)', item):
-                    # Extract the technology mentioned with years
-                    for skill in COMMON_SKILLS:
-                        if skill in item and skill not in required_skills:
-                            required_skills.append(skill)
+    skill_sections = sections['required'] or [(0, len(text))]
+    required_skills = _skills_in_sections(text, skill_sections, skill_matches)
     
     # If skills list is too short, fallback to checking the entire text for common skills
     if len(required_skills) < 3:
-        text_lower = text.lower()
-        for skill in COMMON_SKILLS:
-            # Match whole words only
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower) and skill not in required_skills:
+        for skill, _, _ in skill_matches:
+            if skill not in required_skills:
                 required_skills.append(skill)
     
     return sorted(required_skills)
 
-def extract_preferred_skills(text):
+def extract_preferred_skills(text, sections=None, skill_matches=None, required_skills=None):
     """Extract preferred/nice-to-have skills from job description."""
-    preferred_skills = []
-    
-    # Look for preferred skills sections
-    pref_pattern = r'(?i)(?:preferred|plus|nice to have|bonus|additionally|desirable)(?:[^\n]*\n){1,15}?(?=\n\s*(?:benefits|about us|company|application|how to apply|\Z))'
-    pref_sections = re.findall(pref_pattern, text)
-    
-    # Process each section
-    for section in pref_sections:
-        # Look for bullet points or numbered lists
-        bullet_patterns = [
-            r'[•\-\*] (.*?)(?:\n|$)',  # Bullets
-            r'^\d+\.\s*(.*?)(?:\n|$)',  # Numbered
-            r'(?:^|\n)(?!•|\-|\*|\d+\.)(.*?)(?=\n|$)'  # Regular lines
-        ]
-        
-        for pattern in bullet_patterns:
-            items = re.findall(pattern, section, re.MULTILINE)
-            for item in items:
-                item = item.strip().lower()
-                
-                # Check if this bullet contains a known skill
-                for skill in COMMON_SKILLS:
-                    # Match whole words only
-                    pattern = r'\b' + re.escape(skill) + r'\b'
-                    if re.search(pattern, item):
-                        if skill not in preferred_skills:
-                            preferred_skills.append(skill)
+    if sections is None:
+        sections = segment_job_sections(text)
+    if skill_matches is None:
+        skill_matches = SKILL_SCANNER.find_all(text)
+    
+    preferred_skills = _skills_in_sections(text, sections['preferred'], skill_matches)
     
     # Make sure preferred skills don't overlap with required skills
-    required = extract_required_skills(text)
-    preferred_skills = [skill for skill in preferred_skills if skill not in required]
+    if required_skills is None:
+        required_skills = extract_required_skills(text, sections, skill_matches)
+    preferred_skills = [skill for skill in preferred_skills if skill not in required_skills]
     
     return sorted(preferred_skills)
 
-def extract_experience_requirements(text):
+def extract_experience_requirements(text, skill_matches=None, dates=None):
     """Extract years of experience requirements."""
     experience_req = {
         'overall': None,
         'specific': {}
     }
+    if dates is None:
+        dates = DateIndex(text)
     
-    # Look for overall experience
-    overall_exp_pattern = r'(?i)(\d+)[\+]?\s*(?:years|yr|yrs)(?:\s+of)?\s+(?:experience|exp)(?!\s+in\s+)'
-    overall_match = re.search(overall_exp_pattern, text)
-    if overall_match:
-        experience_req['overall'] = int(overall_match.group(1))
+    # "N years of experience" mentions, in document order; the first one is the overall requirement
+    mentions = [(count, skill_offset) for _, _, count, skill_offset in dates.years if skill_offset != -1]
+    if mentions:
+        experience_req['overall'] = mentions[0][0]
     
-    # Look for specific experience in technologies
-    for skill in COMMON_SKILLS:
-        pattern = r'(?i)(\d+)[\+]?\s*(?:years|yr|yrs)(?:\s+of)?\s+(?:experience|exp)(?:\s+with|\s+in)?\s+' + re.escape(skill)
-        match = re.search(pattern, text)
-        if match:
-            experience_req['specific'][skill] = int(match.group(1))
+    # Look for specific experience in technologies: index skill matches by
+    # their start offset, then check what follows each "N years" phrase
+    if skill_matches is None:
+        skill_matches = SKILL_SCANNER.find_all(text)
+    skills_at = {}
+    for skill, start, _ in skill_matches:
+        skills_at.setdefault(start, []).append(skill)
+
+    for count, skill_offset in mentions:
+        for skill in skills_at.get(skill_offset, []):
+            if skill not in experience_req['specific']:
+                experience_req['specific'][skill] = count
     
     return experience_req
 
-def extract_education_requirements(text):
+def extract_education_requirements(text, tokens=None):
     """Extract education requirements."""
     education_req = {
         'degree': None,
         'field': None
     }
+    if tokens is None:
+        tokens = Tokens(text)
     
-    # Look for degree requirements
-    degree_pattern = r'(?i)(bachelor\'?s?|master\'?s?|phd|doctorate|bs|ms|ba|ma)(?:\s+degree)?(?:\s+in\s+([^,\.;]+))?'
-    degree_match = re.search(degree_pattern, text)
-    if degree_match:
-        education_req['degree'] = degree_match.group(1)
-        if degree_match.group(2):
-            education_req['field'] = degree_match.group(2).strip()
+    # Look for a degree word, then "[degree] in <field>". Tokens join on '/',
+    # so alternatives such as "BS/MS" are one token and are checked part by part.
+    normalized = tokens.normalized
+    degree = None
+    for i, word in enumerate(normalized):
+        if word in DEGREE_WORDS or '/' in word:
+            degree = _degree_in(tokens.tokens[i])
+            if degree:
+                break
+    if degree:
+        education_req['degree'] = degree
+        if tokens.spaced(i) and normalized[i + 1] == 'degree':
+            i += 1
+        if tokens.spaced(i) and normalized[i + 1] == 'in' and i + 2 < len(tokens):
+            field = FIELD_PATTERN.match(text, tokens.starts[i + 2])
+            if field:
+                education_req['field'] = field.group().strip()
     
     return education_req
 
-def analyze_job_description(job_text, job_title=""):
-    """Analyze job description and extract key information."""
+class JobScan:
+    """The tokens and skill matches of a job description, reusable for a similar one.
+
+    Neither a token nor a skill spans a line break, so the results for a
+    line do not depend on the rest of the text. Given the scan of a similar
+    text as known, runs of lines found there are copied with their offsets
+    shifted, and only the other lines are tokenized and scanned. Either way
+    tokens equals Tokens(text) and skill_matches SKILL_SCANNER.find_all(text).
+    """
+
+    def __init__(self, text, known=None):
+        self.text = text
+        self._lines = None
+        self._offsets = None
+        if known is None:
+            self.tokens = Tokens(text)
+            self.skill_matches = SKILL_SCANNER.find_all(text)
+            return
+
+        token_list = []
+        normalized = []
+        starts = []
+        ends = []
+        self.skill_matches = []
+        known_starts, known_ends = known.offsets()
+        known_normalized = known.tokens.normalized
+        for segment in self._segments(known):
+            if segment[0] is None:
+                _, start, end = segment
+                tokens = Tokens(text[start:end])
+                token_list.extend(tokens.tokens)
+                normalized.extend(tokens.normalized)
+                starts.append(np.frombuffer(tokens.starts, dtype=np.uint32) + start)
+                ends.append(np.frombuffer(tokens.ends, dtype=np.uint32) + start)
+                self.skill_matches.extend([(skill, skill_start + start, skill_end + start)
+                                           for skill, skill_start, skill_end in SKILL_SCANNER.finditer(text[start:end])])
+            else:
+                shift, first_token, last_token, first_match, last_match = segment
+                token_list.extend(known.tokens.tokens[first_token:last_token])
+                normalized.extend(known_normalized[first_token:last_token])
+                starts.append(known_starts[first_token:last_token] + shift)
+                ends.append(known_ends[first_token:last_token] + shift)
+                self.skill_matches.extend([(skill, skill_start + shift, skill_end + shift)
+                                           for skill, skill_start, skill_end in known.skill_matches[first_match:last_match]])
+        if not starts:
+            starts = ends = [np.zeros(0, dtype=np.int64)]
+        self._offsets = (np.concatenate(starts).astype(np.int64), np.concatenate(ends).astype(np.int64))
+        self.tokens = Tokens.from_spans(text, array('I', self._offsets[0].astype(np.uint32).tobytes()),
+                                        array('I', self._offsets[1].astype(np.uint32).tobytes()), token_list,
+                                        normalized)
+
+    def offsets(self):
+        """The token start and end offsets as int64 arrays."""
+        if self._offsets is None:
+            self._offsets = (np.frombuffer(self.tokens.starts, dtype=np.uint32).astype(np.int64),
+                             np.frombuffer(self.tokens.ends, dtype=np.uint32).astype(np.int64))
+        return self._offsets
+
+    def lines(self):
+        """Map each line to (offset, first token, end token, first match, end match), for the first time it occurs."""
+        if self._lines is None:
+            lines = self.text.split('\n')
+            offsets = [0]
+            for line in lines:
+                offsets.append(offsets[-1] + len(line) + 1)
+            token_bounds = np.searchsorted(self.offsets()[0], offsets).tolist()
+            match_starts = np.array([start for _, start, _ in self.skill_matches], dtype=np.int64)
+            match_bounds = np.searchsorted(match_starts, offsets).tolist()
+            self._lines = {}
+            for i, line in enumerate(lines):
+                self._lines.setdefault(line, (offsets[i], token_bounds[i], token_bounds[i + 1],
+                                              match_bounds[i], match_bounds[i + 1]))
+        return self._lines
+
+    def _segments(self, known):
+        """Split text into runs of lines to copy from known, as [shift, token range, match range],
+        and runs to scan, as [None, start, end]."""
+        known_lines = known.lines()
+        segments = []
+        offset = 0
+        for line in self.text.split('\n'):
+            end = offset + len(line)
+            found = known_lines.get(line)
+            last = segments[-1] if segments else None
+            if found is None:
+                if last is not None and last[0] is None:
+                    last[2] = end
+                else:
+                    segments.append([None, offset, end])
+            elif found[1] < found[2] or found[3] < found[4]:
+                # Lines without tokens, such as blank ones, add nothing and do not break a run
+                known_offset, first_token, last_token, first_match, last_match = found
+                shift = offset - known_offset
+                if last is not None and last[0] == shift and last[2] == first_token and last[4] == first_match:
+                    last[2] = last_token
+                    last[4] = last_match
+                else:
+                    segments.append([shift, first_token, last_token, first_match, last_match])
+            offset = end + 1
+        return segments
+
+def analyze_job_description(job_text, job_title="", timings=None, scan=None):
+    """Analyze job description and extract key information.
+
+    The text is tokenized, segmented and scanned for skills once, and every
+    extractor works from those shared results. A JobScan of the text may be
+    given as scan, in place of tokenizing and scanning it here. Each stage is
+    observed in the pipeline_stage_seconds metric; pass a dict as timings to
+    also get the seconds spent in each stage.
+    """
+    timer = StageTimer(timings, pipeline='job')
     try:
+        # Tokenize once for the word-level extractors
+        if scan is None:
+            with timer.stage('tokens'):
+                tokens = Tokens(job_text)
+        else:
+            tokens, skill_matches = scan.tokens, scan.skill_matches
+        
         # Extract company name
-        company = extract_company_name(job_text)
+        with timer.stage('company'):
+            company = extract_company_name(job_text, tokens)
+        
+        # Locate sections and skill mentions once for all extractors
+        with timer.stage('sections'):
+            sections = segment_job_sections(job_text)
+        if scan is None:
+            with timer.stage('skill_scan'):
+                skill_matches = SKILL_SCANNER.find_all(job_text)
         
         # Extract skills
-        required_skills = extract_required_skills(job_text)
-        preferred_skills = extract_preferred_skills(job_text)
+        with timer.stage('required_skills'):
+            required_skills = extract_required_skills(job_text, sections, skill_matches)
+        with timer.stage('preferred_skills'):
+            preferred_skills = extract_preferred_skills(job_text, sections, skill_matches, required_skills)
         
         # Extract experience requirements
-        experience_req = extract_experience_requirements(job_text)
+        with timer.stage('experience'):
+            experience_req = extract_experience_requirements(job_text, skill_matches)
         
         # Extract education requirements
-        education_req = extract_education_requirements(job_text)
+        with timer.stage('education'):
+            education_req = extract_education_requirements(job_text, tokens)
         
-        # Combine all extracted information
-        job_data = {
-            'title': job_title,
-            'company': company,
-            'required_skills': required_skills,
-            'preferred_skills': preferred_skills,
-            'experience_req': experience_req,
-            'education_req': education_req,
-            'raw_text': job_text
-        }
+        SKILLS_FOUND.observe(len(required_skills), document='job_required')
+        SKILLS_FOUND.observe(len(preferred_skills), document='job_preferred')
         
-        return job_data
+        # Combine all extracted information
+        return JobDescription(
+            title=job_title,
+            company=company,
+            description=job_text,
+            required_skills=required_skills,
+            preferred_skills=preferred_skills,
+            experience_req=experience_req,
+            education_req=education_req
+        )
     
     except Exception as e:
         logger.error(f"Error analyzing job description: {str(e)}")
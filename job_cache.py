@@ -0,0 +1,223 @@
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from job_analyzer import JobScan, analyze_job_description, extract_company_name, extract_education_requirements
+from models import JobDescription
+from tokens import Tokens
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Job analyses kept in process memory, and their memory budget, counted on
+# estimated sizes; a posting may be as large as the upload limit
+JOB_CACHE_SIZE = int(os.environ.get('JOB_CACHE_SIZE', 256))
+JOB_CACHE_MAX_BYTES = int(os.environ.get('JOB_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Estimated bytes per token, per skill match and per line of a kept JobScan,
+# beyond the strings of its tokens: offsets, list slots and tuples
+TOKEN_OVERHEAD = 40
+MATCH_OVERHEAD = 120
+LINE_OVERHEAD = 150
+
+# Estimated Jaccard similarity of their line sets from which two postings
+# count as near duplicates. Lines are the unit whose scan results are reused,
+# so this is about the share of the work that can be skipped.
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('NEAR_DUPLICATE_THRESHOLD', 0.6))
+
+# MinHash signature length and its split into LSH bands. With 16 bands of 4
+# rows, postings with a similarity of 0.6 share a band 89% of the time, those
+# with 0.8 99.98% of the time and those with 0.3 only 12% of the time.
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+# Candidates from the LSH buckets whose signatures are compared in full
+MAX_CANDIDATES = 8
+
+# Multiply-shift hashing ((a * x + b) mod 2**64) >> 32 of 64-bit line hashes,
+# with odd multipliers. Line hashes come from hash(), which differs between
+# processes, so signatures are only compared within one.
+_random = np.random.RandomState(0)
+_A = _random.randint(0, 1 << 63, size=(MINHASH_PERMUTATIONS, 1), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_B = _random.randint(0, 1 << 63, size=(MINHASH_PERMUTATIONS, 1), dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+
+def normalize_text(text):
+    """Lower-case text and collapse the whitespace within each line; line breaks are kept."""
+    return '\n'.join(map(' '.join, map(str.split, text.lower().split('\n'))))
+
+
+def text_key(text):
+    """SHA-256 hex digest of the normalized text, the same for pastes that differ only in case or spacing."""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def minhash(normalized):
+    """MinHash signature of the set of non-blank lines of a normalized text, or None if it has none."""
+    lines = set(normalized.split('\n'))
+    lines.discard('')
+    if not lines:
+        return None
+    hashes = np.fromiter(map(hash, lines), dtype=np.int64, count=len(lines)).view(np.uint64)
+    return ((_A * hashes + _B) >> _SHIFT).min(axis=1)
+
+
+def scan_size(scan):
+    """Estimated bytes held by a JobScan, counting the line map it builds when it serves as known."""
+    tokens = scan.tokens
+    token_bytes = sum(map(sys.getsizeof, tokens.tokens)) + len(tokens) * TOKEN_OVERHEAD
+    # Normalized tokens and the lines are further copies of the text
+    return (2 * sys.getsizeof(scan.text) + 2 * token_bytes + len(scan.skill_matches) * MATCH_OVERHEAD
+            + (scan.text.count('\n') + 1) * LINE_OVERHEAD)
+
+
+def lsh_bands(signature):
+    """The LSH bucket keys of a signature, one per band."""
+    data = signature.tobytes()
+    size = len(data) // LSH_BANDS
+    return [data[i:i + size] + bytes([band]) for band, i in enumerate(range(0, len(data), size))]
+
+
+class JobCache:
+    """In-process LRU cache of job analyses with near-duplicate detection.
+
+    Postings are keyed by text_key, so a repeated paste is served without
+    analysis; when it differs in case or spacing, only the company name and
+    degree, which are copied from the text, are extracted again. Every entry
+    is also indexed by its MinHash signature, split into LSH bands. A posting
+    that misses the exact key but shares a band with an entry whose
+    estimated similarity reaches the threshold is analyzed again, but only
+    its changed lines are tokenized and scanned for skills; the others reuse
+    the results kept with the entry. The analysis is the same as from
+    analyze_job_description either way.
+
+    Entries are evicted in LRU order past max_entries or past max_bytes of
+    estimated size; a posting larger than max_bytes alone is not kept.
+    """
+
+    def __init__(self, max_entries=JOB_CACHE_SIZE, threshold=NEAR_DUPLICATE_THRESHOLD, max_bytes=JOB_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.threshold = threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        # key -> (JobDescription bytes, signature, LSH bucket keys, JobScan, seconds of a full analysis, size)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, job_text, job_title=""):
+        """Return the JobDescription of a posting, from the cache where possible."""
+        start = time.perf_counter()
+        normalized = normalize_text(job_text)
+        key = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None:
+            job = JobDescription.from_bytes(entry[0])
+            if entry[3].text != job_text:
+                # The company name and degree are copied from the text, so they keep the case of this paste
+                tokens = Tokens(job_text)
+                job.company = extract_company_name(job_text, tokens)
+                job.education_req = extract_education_requirements(job_text, tokens)
+            job.title = job_title
+            job.description = job_text
+            job.text_key = key
+            with self._lock:
+                self.hits += 1
+                self.seconds_saved += max(0.0, entry[4] - (time.perf_counter() - start))
+            return job
+
+        signature = minhash(normalized)
+        bands = lsh_bands(signature) if signature is not None else []
+        neighbour = self._nearest(signature, bands)
+        scan = JobScan(job_text, neighbour[3] if neighbour else None)
+        job = analyze_job_description(job_text, job_title, scan=scan)
+        job.text_key = key
+        elapsed = time.perf_counter() - start
+        data = job.to_bytes(keep_raw_text=False)
+        size = len(data) + scan_size(scan) + sum(map(len, bands)) + (signature.nbytes if signature is not None else 0)
+
+        with self._lock:
+            if neighbour is None:
+                self.misses += 1
+                full_seconds = elapsed
+            else:
+                self.near_hits += 1
+                full_seconds = neighbour[4]
+                self.seconds_saved += max(0.0, full_seconds - elapsed)
+            self._remember(key, (data, signature, bands, scan, full_seconds, size))
+        return job
+
+    def _nearest(self, signature, bands):
+        """The entry most similar to a signature at or above the threshold, or None."""
+        with self._lock:
+            # Entries sharing the most bands are the most similar ones
+            shared = {}
+            for band in bands:
+                for key in self._buckets.get(band, ()):
+                    shared[key] = shared.get(key, 0) + 1
+            candidates = sorted(shared, key=shared.__getitem__, reverse=True)[:MAX_CANDIDATES]
+            best, best_similarity = None, self.threshold
+            for key in candidates:
+                entry = self._entries[key]
+                similarity = np.count_nonzero(entry[1] == signature) / MINHASH_PERMUTATIONS
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+            return best
+
+    def _remember(self, key, entry):
+        if key in self._entries:
+            self._forget(key)
+        if entry[5] > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry[5]
+        for band in entry[2]:
+            self._buckets.setdefault(band, set()).add(key)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._forget(next(iter(self._entries)))
+
+    def _forget(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[5]
+        for band in entry[2]:
+            bucket = self._buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return hit counters, the seconds of analysis they saved and the number and estimated size of entries."""
+        with self._lock:
+            lookups = self.hits + self.near_hits + self.misses
+            return {
+                'hits': self.hits,
+                'near_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'near_hit_rate': self.near_hits / lookups if lookups else 0.0,
+                'seconds_saved': round(self.seconds_saved, 6),
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
@@ -0,0 +1,220 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from job_cache import JobCache
+from process_pool import WorkerPool
+from skill_matcher import analyze_skill_gaps
+from task_queue import QueueFull, process_context
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Processes analyzing the jobs of comparison requests, shared by all requests of a web worker
+COMPARE_WORKERS = int(os.environ.get('COMPARE_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Jobs in one request, and jobs queued or running across requests before new ones are refused
+COMPARE_MAX_JOBS = int(os.environ.get('COMPARE_MAX_JOBS', 50))
+COMPARE_MAX_PENDING = int(os.environ.get('COMPARE_MAX_PENDING', 200))
+
+# Seconds a comparison may take; jobs not finished by then are reported as timed out
+COMPARE_DEADLINE = float(os.environ.get('COMPARE_DEADLINE', 30))
+
+# Seconds a job may run, from when a pool process picks it up, before it is taken as hung and its
+# pool is killed; well above the deadline, so a job that only started late is left to finish
+COMPARE_KILL_AFTER = float(os.environ.get('COMPARE_KILL_AFTER', 4 * COMPARE_DEADLINE))
+
+# Seconds between checks for hung jobs
+REAP_INTERVAL = 1.0
+
+# Job analyses of a pool process, so postings compared again are not analyzed again
+_job_cache = None
+
+
+def compare_job(resume, job_description, job_title):
+    """Analyze a job description in a pool process and match a Resume against it."""
+    global _job_cache
+    if _job_cache is None:
+        _job_cache = JobCache()
+    return analyze_skill_gaps(resume, _job_cache.analyze(job_description, job_title))
+
+
+class JobComparer:
+    """Matches one resume against many job descriptions on a shared process pool.
+
+    The pool runs `workers` processes from the same preloaded fork server as
+    the task queue and is started on first use. At most `max_pending` jobs
+    are queued or running across all requests; a request that would go over
+    is refused whole with QueueFull. At the deadline, jobs still queued are
+    cancelled and those running are left to finish, but their results are
+    dropped.
+
+    A reaper thread checks the running jobs every REAP_INTERVAL seconds. One
+    that has run kill_after seconds since a pool process picked it up is
+    taken as hung, and its process is killed. That breaks the pool, which is
+    replaced; jobs of other requests that were in flight on it are submitted
+    again, once, if their deadline has not passed.
+    """
+
+    def __init__(self, workers=COMPARE_WORKERS, max_pending=COMPARE_MAX_PENDING, kill_after=COMPARE_KILL_AFTER):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.kill_after = kill_after
+        self._pending = 0
+        self._pool = None
+        self._reaper = None
+        self._lock = threading.Lock()
+
+    def compare(self, resume, jobs, timeout=COMPARE_DEADLINE):
+        """Start matching a Resume against (title, description) jobs, or raise QueueFull.
+
+        Returns an iterator of (index, status, value) in the order the jobs
+        finish: status is 'done' with the SkillGapAnalysis, or 'failed' or
+        'timeout' with an error message. Jobs not finished within timeout
+        seconds come last, in input order. Closing the iterator early
+        cancels the jobs that have not started.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            if self._pending + len(jobs) > self.max_pending:
+                raise QueueFull(f"{self._pending} comparison jobs are already waiting")
+            self._pending += len(jobs)
+
+        futures = {}
+        for index, (title, description) in enumerate(jobs):
+            try:
+                future, pool = self._submit(resume, title, description)
+            except BrokenProcessPool:
+                # The jobs already submitted fail with the pool
+                with self._lock:
+                    self._pending -= len(jobs) - index
+                raise
+            futures[future] = (index, pool)
+        return self._collect(resume, jobs, futures, deadline)
+
+    def _submit(self, resume, title, description):
+        """Submit one job, counted in _pending by the caller, and return its future and pool."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = WorkerPool(self.workers, mp_context=process_context())
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name='compare-reaper', daemon=True)
+                self._reaper.start()
+            pool = self._pool
+        try:
+            future = pool.submit(compare_job, resume, description, title)
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise
+        future.add_done_callback(self._release)
+        return future, pool
+
+    def _collect(self, resume, jobs, futures, deadline):
+        pending = set(futures)
+        retried = set()
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda future: futures[future][0]):
+                    index, pool = futures.pop(future)
+                    try:
+                        result = (index, 'done', future.result())
+                    except BrokenProcessPool as e:
+                        self._discard(pool)
+                        retry = self._retry(resume, jobs[index], index, retried, deadline)
+                        if retry:
+                            futures[retry[0]] = (index, retry[1])
+                            pending.add(retry[0])
+                            continue
+                        result = (index, 'failed', f"Comparison process died: {e}")
+                    except Exception as e:
+                        result = (index, 'failed', f"{type(e).__name__}: {e}")
+                    yield result
+            for future in sorted(pending, key=lambda future: futures[future][0]):
+                yield futures[future][0], 'timeout', "Not finished before the deadline"
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _retry(self, resume, job, index, retried, deadline):
+        """Submit again, once, a job that failed with its pool; return its future and pool, or None."""
+        if index in retried or time.monotonic() >= deadline:
+            return None
+        retried.add(index)
+        with self._lock:
+            self._pending += 1
+        title, description = job
+        try:
+            return self._submit(resume, title, description)
+        except BrokenProcessPool:
+            with self._lock:
+                self._pending -= 1
+            return None
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _reap(self):
+        """Kill the processes of jobs that have run past kill_after, until the process exits."""
+        while True:
+            time.sleep(REAP_INTERVAL)
+            with self._lock:
+                pool = self._pool
+            if pool is None:
+                continue
+            now = time.time()
+            hung = {pid for pid, started in pool.running().values() if now - started > self.kill_after}
+            if hung:
+                logger.warning(f"Comparison jobs ran past {self.kill_after:g}s, killing their pool")
+                self._discard(pool, hung)
+
+    def _discard(self, pool, kill=()):
+        """Forget a broken pool, killing the given processes first, so the next job starts a new one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        if kill:
+            pool.kill(kill)
+        else:
+            pool.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {'workers': self.workers, 'pending': self._pending, 'capacity': self.max_pending}
+
+
+def rank_comparisons(jobs, results):
+    """Build the comparison table of (title, description) jobs from their (index, status, value) results.
+
+    Matched jobs come first, best match first, and jobs that failed or
+    timed out last; ties keep the input order.
+    """
+    rows = []
+    for index, status, value in results:
+        row = {'index': index, 'title': jobs[index][0], 'status': status}
+        if status == 'done':
+            fit = value.experience_fit
+            row.update({
+                'company': value.company,
+                'match_percentage': round(value.match_percentage, 1),
+                'matching_skills': len(value.matching_skills),
+                'missing_skills': len(value.missing_skills),
+                'missing_preferred_skills': len(value.missing_preferred_skills),
+                'meets_experience': fit['meets'] if fit else None
+            })
+        else:
+            row['error'] = value
+        rows.append(row)
+
+    rows.sort(key=lambda row: (row['status'] != 'done', -row.get('match_percentage', 0), row['index']))
+    for rank, row in enumerate(rows, 1):
+        row['rank'] = rank
+    return rows
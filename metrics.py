@@ -0,0 +1,200 @@
+import logging
+import math
+import threading
+from bisect import bisect_left
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Seconds: from fast extractor stages up to whole slow uploads
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# Counts per document (pages, skills) and sizes (characters)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000, 500000)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic count, optionally split by labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}' for key, value in values]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram of observed values, optionally split by labels.
+
+    observe() costs one bisect and a few additions under a lock, so it can
+    sit on every pipeline stage.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self):
+        with self._lock:
+            snapshot = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._series.items())
+
+        lines = []
+        for key, (counts, total, count) in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {count}')
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Metric whose samples are read from existing state when scraped.
+
+    func returns a number, or a dict from label value tuples to numbers.
+    """
+
+    def __init__(self, name, documentation, func, kind='gauge', labels=()):
+        super().__init__(name, documentation, labels)
+        self.kind = kind
+        self.func = func
+
+    def _samples(self):
+        try:
+            values = self.func()
+        except Exception as e:
+            logger.warning(f"Could not collect metric {self.name}: {e}")
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}'
+                for key, value in sorted(values.items())]
+
+
+class Registry:
+    """Process-wide set of metrics, rendered in the Prometheus text format.
+
+    Asking for a metric that already exists returns it, so modules can
+    declare their metrics at import time without coordinating. Values are
+    per process; with several gunicorn workers each one reports its own.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, labels, buckets)
+
+    def callback(self, name, documentation, func, kind='gauge', labels=()):
+        """Register (or replace) a metric computed by func at scrape time."""
+        with self._lock:
+            self._metrics[name] = CallbackMetric(name, documentation, func, kind, labels)
+            return self._metrics[name]
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+METRICS = Registry()
+
+# Seconds spent in each stage of the parsing and analysis pipelines
+STAGE_SECONDS = METRICS.histogram(
+    'pipeline_stage_seconds', 'Time spent in each pipeline stage.', labels=('pipeline', 'stage')
+)
+
+# Skills found per parsed resume and per analyzed job description
+SKILLS_FOUND = METRICS.histogram(
+    'skills_found', 'Skills found per document.', labels=('document',), buckets=COUNT_BUCKETS
+)
@@ -1,27 +1,397 @@
-# This file is not currently used for database models since we're using in-memory storage
-# It's included as a placeholder for future database integration
+import hashlib
+import json
+import logging
+import struct
+import sys
+from array import array
+
+from taxonomy import TAXONOMY
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Layout version written at the start of every serialized model
+MODEL_FORMAT = 2
+
+# Taxonomy skills by canonical name; skill IDs are stored as array('H')
+SKILL_NAMES = TAXONOMY.skills()
+SKILL_IDS = {name: skill_id for skill_id, name in enumerate(SKILL_NAMES)}
+assert len(SKILL_NAMES) <= 0xFFFF and array('I').itemsize == 4
+
+# Fingerprint of the skill ID assignment, written after the format byte. IDs
+# follow the order of the taxonomy source, so after an edit to it the IDs of
+# a stored model would decode to other skills without any error.
+TAXONOMY_DIGEST = hashlib.sha256('\n'.join(SKILL_NAMES).encode('utf-8')).digest()[:8]
+
+_HEADER = struct.Struct('<B8sH')
+_ENCODER = json.JSONEncoder(separators=(',', ':'))
+_DECODER = json.JSONDecoder()
+
+
+class StaleTaxonomy(ValueError):
+    """Raised when decoding a model whose skill IDs were written under another taxonomy."""
+
+
+def pack_parts(parts):
+    """Frame byte strings into one: a format byte, the taxonomy digest, the part count, the part lengths, then the parts."""
+    lengths = array('I', map(len, parts))
+    return b''.join([_HEADER.pack(MODEL_FORMAT, TAXONOMY_DIGEST, len(parts)), lengths.tobytes(), *parts])
+
+
+def unpack_parts(data):
+    """Split bytes made by pack_parts into memoryviews of its parts, without copying.
+
+    Raises StaleTaxonomy for bytes written under another taxonomy, or by the
+    first format, which did not record one, so their skill IDs cannot be trusted.
+    """
+    view = memoryview(data)
+    if len(view) and view[0] == 1:
+        raise StaleTaxonomy("Model written before skill IDs carried a taxonomy digest")
+    version, digest, count = _HEADER.unpack_from(view)
+    if version != MODEL_FORMAT:
+        raise ValueError(f"Unsupported model format {version}")
+    if digest != TAXONOMY_DIGEST:
+        raise StaleTaxonomy("Model written under a different skill taxonomy")
+    lengths = array('I')
+    offset = _HEADER.size + 4 * count
+    lengths.frombytes(view[_HEADER.size:offset])
+    parts = []
+    for length in lengths:
+        parts.append(view[offset:offset + length])
+        offset += length
+    return parts
+
+
+def _dump(value):
+    return _ENCODER.encode(value).encode('utf-8')
+
+
+def _load(data):
+    return _DECODER.decode(str(data, 'utf-8'))
+
+
+def _text(value):
+    """Decode raw text kept encoded, as after from_bytes; None stays None."""
+    if value is None or isinstance(value, str):
+        return value
+    return str(value, 'utf-8')
+
+
+def _encoded(value):
+    if isinstance(value, str):
+        return value.encode('utf-8')
+    return value
+
+
+class SkillSet:
+    """A sorted, duplicate-free set of skill names.
+
+    Taxonomy skills are held as their IDs in an array('H'), two bytes each,
+    and the remaining names (free-form items of a skills section) as
+    interned strings, so a name shared by many resumes is stored once.
+    Iterating yields the names in sorted order, as the extractors return
+    them.
+    """
+
+    __slots__ = ('ids', 'other')
+
+    def __init__(self, ids=None, other=()):
+        self.ids = ids if ids is not None else array('H')
+        self.other = other
+
+    @classmethod
+    def from_names(cls, names):
+        if isinstance(names, SkillSet):
+            return names
+        ids = set()
+        other = set()
+        for name in names:
+            skill_id = SKILL_IDS.get(name)
+            if skill_id is None:
+                other.add(sys.intern(name))
+            else:
+                ids.add(skill_id)
+        return cls(array('H', sorted(ids)), tuple(sorted(other)))
+
+    def names(self):
+        return sorted([SKILL_NAMES[skill_id] for skill_id in self.ids] + list(self.other))
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.ids) + len(self.other)
+
+    def __contains__(self, name):
+        skill_id = SKILL_IDS.get(name)
+        if skill_id is None:
+            return name in self.other
+        return skill_id in self.ids
+
+    def __eq__(self, other):
+        return isinstance(other, SkillSet) and self.ids == other.ids and self.other == other.other
+
+    def __repr__(self):
+        return f"SkillSet({self.names()!r})"
+
+    @classmethod
+    def _load(cls, ids, other):
+        """Rebuild a SkillSet from the bytes of its IDs and the list of its other names."""
+        skill_ids = array('H')
+        skill_ids.frombytes(ids)
+        return cls(skill_ids, tuple(map(sys.intern, other)))
+
 
 class Resume:
-    def __init__(self, name="", email="", phone="", skills=None, experience=None, education=None):
+    """A parsed resume.
+
+    The extracted text is optional. After from_bytes it stays UTF-8 encoded
+    and is only decoded when raw_text is read.
+    """
+
+    __slots__ = ('name', 'email', 'phone', 'skill_set', 'experience', 'total_experience_years', 'education',
+                 '_raw_text')
+
+    def __init__(self, name="", email="", phone="", skills=None, experience=None, education=None,
+                 total_experience_years=None, raw_text=None):
         self.name = name
         self.email = email
         self.phone = phone
-        self.skills = skills or []
+        self.skill_set = SkillSet.from_names(skills or ())
         self.experience = experience or []
         self.education = education or []
+        self.total_experience_years = total_experience_years
+        self._raw_text = raw_text
+
+    @property
+    def skills(self):
+        return self.skill_set.names()
+
+    @property
+    def raw_text(self):
+        return _text(self._raw_text)
+
+    @raw_text.setter
+    def raw_text(self, text):
+        self._raw_text = text
+
+    def __repr__(self):
+        return f"Resume({self.name!r}, {len(self.skill_set)} skills)"
+
+    def __reduce__(self):
+        return Resume.from_bytes, (self.to_bytes(),)
+
+    def to_dict(self, keep_raw_text=True):
+        """The resume as the plain dict parse_resume used to return."""
+        data = {
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'skills': self.skills,
+            'experience': self.experience,
+            'total_experience_years': self.total_experience_years,
+            'education': self.education
+        }
+        if keep_raw_text and self._raw_text is not None:
+            data['raw_text'] = self.raw_text
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('name', ''), data.get('email', ''), data.get('phone', ''), data.get('skills'),
+                   data.get('experience'), data.get('education'), data.get('total_experience_years'),
+                   data.get('raw_text'))
+
+    def to_bytes(self, keep_raw_text=True):
+        has_text = keep_raw_text and self._raw_text is not None
+        fields = [self.name, self.email, self.phone, self.experience, self.total_experience_years,
+                  self.education, self.skill_set.other, has_text]
+        return pack_parts([_dump(fields), self.skill_set.ids.tobytes(), _encoded(self._raw_text) if has_text else b''])
+
+    @classmethod
+    def from_bytes(cls, data):
+        fields, ids, raw_text = unpack_parts(data)
+        name, email, phone, experience, total_experience_years, education, other, has_text = _load(fields)
+        resume = cls(name, email, phone, SkillSet._load(ids, other), experience, education, total_experience_years)
+        if has_text:
+            # Copied out, so the rest of the buffer can be freed
+            resume._raw_text = bytes(raw_text)
+        return resume
+
 
 class JobDescription:
-    def __init__(self, title="", company="", description="", required_skills=None, preferred_skills=None):
+    """An analyzed job description. The description text is optional, as for Resume.
+
+    text_key identifies the posting by its normalized text (job_cache.text_key)
+    once it is known, so a stored analysis can be matched to a new paste
+    without keeping the text.
+    """
+
+    __slots__ = ('title', 'company', 'required', 'preferred', 'experience_req', 'education_req', '_description',
+                 'text_key')
+
+    def __init__(self, title="", company="", description=None, required_skills=None, preferred_skills=None,
+                 experience_req=None, education_req=None, text_key=None):
         self.title = title
         self.company = company
-        self.description = description
-        self.required_skills = required_skills or []
-        self.preferred_skills = preferred_skills or []
+        self.required = SkillSet.from_names(required_skills or ())
+        self.preferred = SkillSet.from_names(preferred_skills or ())
+        self.experience_req = experience_req or {'overall': None, 'specific': {}}
+        self.education_req = education_req or {}
+        self._description = description
+        self.text_key = text_key
+
+    @property
+    def required_skills(self):
+        return self.required.names()
+
+    @property
+    def preferred_skills(self):
+        return self.preferred.names()
+
+    @property
+    def description(self):
+        return _text(self._description)
+
+    @description.setter
+    def description(self, text):
+        self._description = text
+
+    raw_text = description
+
+    def __repr__(self):
+        return f"JobDescription({self.title!r}, {len(self.required)} required skills)"
+
+    def __reduce__(self):
+        return JobDescription.from_bytes, (self.to_bytes(),)
+
+    def to_dict(self, keep_raw_text=True):
+        """The job as the plain dict analyze_job_description used to return."""
+        data = {
+            'title': self.title,
+            'company': self.company,
+            'required_skills': self.required_skills,
+            'preferred_skills': self.preferred_skills,
+            'experience_req': self.experience_req,
+            'education_req': self.education_req
+        }
+        if keep_raw_text and self._description is not None:
+            data['raw_text'] = self.description
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get('title', ''), data.get('company', ''), data.get('raw_text'), data.get('required_skills'),
+                   data.get('preferred_skills'), data.get('experience_req'), data.get('education_req'))
+
+    def to_bytes(self, keep_raw_text=True):
+        has_text = keep_raw_text and self._description is not None
+        fields = [self.title, self.company, self.experience_req, self.education_req, self.required.other,
+                  self.preferred.other, has_text, self.text_key]
+        return pack_parts([_dump(fields), self.required.ids.tobytes(), self.preferred.ids.tobytes(),
+                           _encoded(self._description) if has_text else b''])
+
+    @classmethod
+    def from_bytes(cls, data):
+        fields, required_ids, preferred_ids, description = unpack_parts(data)
+        title, company, experience_req, education_req, required_other, preferred_other, has_text, text_key = \
+            _load(fields)
+        job = cls(title, company, None, SkillSet._load(required_ids, required_other),
+                  SkillSet._load(preferred_ids, preferred_other), experience_req, education_req, text_key)
+        if has_text:
+            job._description = bytes(description)
+        return job
+
 
 class SkillGapAnalysis:
-    def __init__(self, resume=None, job=None, matching_skills=None, missing_skills=None, match_percentage=0):
-        self.resume = resume
-        self.job = job
-        self.matching_skills = matching_skills or []
-        self.missing_skills = missing_skills or []
+    """A resume matched against a job: the match, the gaps and what to learn.
+
+    Fields of the job read through, so analysis.title is analysis.job.title,
+    as in the flat dicts the analysis used to be stored as.
+    """
+
+    __slots__ = ('job', 'match_percentage', 'matching', 'missing', 'skill_gaps', 'recommendations', 'experience_fit',
+                 'matching_preferred', 'missing_preferred')
+
+    def __init__(self, job=None, match_percentage=0, matching_skills=None, missing_skills=None, skill_gaps=None,
+                 recommendations=None, experience_fit=None, matching_preferred_skills=None,
+                 missing_preferred_skills=None):
+        self.job = job if job is not None else JobDescription()
         self.match_percentage = match_percentage
+        self.matching = SkillSet.from_names(matching_skills or ())
+        self.missing = SkillSet.from_names(missing_skills or ())
+        self.skill_gaps = skill_gaps or []
+        self.recommendations = recommendations or []
+        self.experience_fit = experience_fit
+        self.matching_preferred = SkillSet.from_names(matching_preferred_skills or ())
+        self.missing_preferred = SkillSet.from_names(missing_preferred_skills or ())
+
+    @property
+    def matching_skills(self):
+        return self.matching.names()
+
+    @property
+    def missing_skills(self):
+        return self.missing.names()
+
+    @property
+    def matching_preferred_skills(self):
+        return self.matching_preferred.names()
+
+    @property
+    def missing_preferred_skills(self):
+        return self.missing_preferred.names()
+
+    def __getattr__(self, name):
+        # Only reached for names that are not slots or properties of the analysis
+        if name == 'job' or name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.job, name)
+
+    def __repr__(self):
+        return f"SkillGapAnalysis({self.job.title!r}, {self.match_percentage:.0f}%)"
+
+    def __reduce__(self):
+        return SkillGapAnalysis.from_bytes, (self.to_bytes(),)
+
+    def to_dict(self, keep_raw_text=True):
+        """The analysis as the flat job dict it used to be stored as."""
+        data = self.job.to_dict(keep_raw_text)
+        data.update({
+            'match_percentage': self.match_percentage,
+            'matching_skills': self.matching_skills,
+            'missing_skills': self.missing_skills,
+            'skill_gaps': self.skill_gaps,
+            'recommendations': self.recommendations,
+            'experience_fit': self.experience_fit,
+            'matching_preferred_skills': self.matching_preferred_skills,
+            'missing_preferred_skills': self.missing_preferred_skills
+        })
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(JobDescription.from_dict(data), data.get('match_percentage', 0), data.get('matching_skills'),
+                   data.get('missing_skills'), data.get('skill_gaps'), data.get('recommendations'),
+                   data.get('experience_fit'), data.get('matching_preferred_skills'),
+                   data.get('missing_preferred_skills'))
+
+    def to_bytes(self, keep_raw_text=True):
+        fields = [self.match_percentage, self.skill_gaps, self.recommendations, self.experience_fit,
+                  self.matching.other, self.missing.other, self.matching_preferred.other,
+                  self.missing_preferred.other]
+        return pack_parts([self.job.to_bytes(keep_raw_text), _dump(fields), self.matching.ids.tobytes(),
+                           self.missing.ids.tobytes(), self.matching_preferred.ids.tobytes(),
+                           self.missing_preferred.ids.tobytes()])
+
+    @classmethod
+    def from_bytes(cls, data):
+        job, fields, matching_ids, missing_ids, matching_preferred_ids, missing_preferred_ids = unpack_parts(data)
+        (match_percentage, skill_gaps, recommendations, experience_fit, matching_other, missing_other,
+         matching_preferred_other, missing_preferred_other) = _load(fields)
+        analysis = cls(JobDescription.from_bytes(job), match_percentage, SkillSet._load(matching_ids, matching_other),
+                       SkillSet._load(missing_ids, missing_other), skill_gaps, recommendations, experience_fit)
+        analysis.matching_preferred = SkillSet._load(matching_preferred_ids, matching_preferred_other)
+        analysis.missing_preferred = SkillSet._load(missing_preferred_ids, missing_preferred_other)
+        return analysis
@@ -0,0 +1,98 @@
+# Shared, lazily loaded NLTK data. Nothing here downloads at request time;
+# install the data at deploy time with: python nlp_resources.py download
+import logging
+import sys
+import threading
+import time
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# NLTK data the app needs, as (nltk.data resource path, download package).
+# Tokenizing is done by tokens.py, so the Punkt models are not needed.
+REQUIRED_DATA = [
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+]
+
+_lock = threading.Lock()
+_stopword_set = None
+
+
+def missing_data():
+    """Return the download packages of required NLTK data that is not installed."""
+    import nltk
+
+    missing = []
+    for path, package in REQUIRED_DATA:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(package)
+    return missing
+
+
+def _require(corpus_loader, package):
+    """Return a loaded corpus, or raise a LookupError with the fix."""
+    try:
+        corpus_loader.ensure_loaded()
+    except LookupError:
+        raise LookupError(f"NLTK data '{package}' is not installed; run: python nlp_resources.py download")
+    return corpus_loader
+
+
+def stopword_set():
+    """Return the English stopwords as a frozenset, built once per process."""
+    global _stopword_set
+    if _stopword_set is None:
+        from nltk.corpus import stopwords
+
+        with _lock:
+            if _stopword_set is None:
+                _stopword_set = frozenset(_require(stopwords, 'stopwords').words('english'))
+    return _stopword_set
+
+
+def wordnet():
+    """Return the loaded WordNet corpus reader."""
+    from nltk.corpus import wordnet as wordnet_corpus
+
+    return _require(wordnet_corpus, 'wordnet')
+
+
+def preload():
+    """Load every corpus now and return the seconds it took.
+
+    Missing data is logged instead of raised, so a worker can still start
+    and fail only the requests that need it.
+    """
+    start = time.perf_counter()
+    missing = missing_data()
+    if missing:
+        logger.warning(f"NLTK data missing: {', '.join(missing)}; run: python nlp_resources.py download")
+
+    for loader in (stopword_set, wordnet):
+        try:
+            loader()
+        except LookupError as e:
+            logger.warning(str(e))
+
+    return time.perf_counter() - start
+
+
+def download(packages=None):
+    """Download NLTK data; meant for deploy time, never for request handling."""
+    import nltk
+
+    for package in packages or [package for _, package in REQUIRED_DATA]:
+        nltk.download(package, quiet=True)
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if command == 'download':
+        download(missing_data())
+    missing = missing_data()
+    print('missing: ' + ', '.join(missing) if missing else 'all NLTK data installed')
+    sys.exit(1 if missing else 0)
@@ -0,0 +1,218 @@
+import hashlib
+import logging
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from models import Resume, TAXONOMY_DIGEST
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Number of parsed resumes kept in process memory
+PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE', 256))
+
+# Optional on-disk tier shared by every worker of the host (unset disables it)
+PARSE_CACHE_DIR = os.environ.get('PARSE_CACHE_DIR', '')
+PARSE_CACHE_MAX_BYTES = int(os.environ.get('PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Seconds between rescans of the disk tier, whose running totals miss the
+# writes of other workers, and the fraction of max_bytes eviction frees it to
+DISK_RESCAN_SECONDS = 300
+DISK_LOW_WATER = 0.9
+
+# Disk entries are serialized Resume objects
+ENTRY_SUFFIX = '.bin'
+
+
+def hash_stream(stream, sink=None, chunk_size=HASH_CHUNK_SIZE):
+    """Return the SHA-256 hex digest of a stream, copying it to sink if given."""
+    digest = hashlib.sha256()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        digest.update(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    return digest.hexdigest()
+
+
+class ParseCache:
+    """Two-tier cache of parsed resumes keyed by content hash and parser version.
+
+    Both tiers hold Resume.to_bytes() output, so every get decodes a fresh
+    Resume and the raw text stays encoded until it is read. The first tier
+    is an in-process LRU. The optional second tier stores one file per key
+    in a directory and evicts the least recently used files once their total
+    size exceeds max_bytes. Its size is kept as running totals, seeded by a
+    scan at startup; the directory is only scanned again to evict, which
+    frees it to DISK_LOW_WATER of max_bytes, or every DISK_RESCAN_SECONDS.
+    """
+
+    def __init__(self, version, max_entries=PARSE_CACHE_SIZE, directory=PARSE_CACHE_DIR,
+                 max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.version = str(version)
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_entries = 0
+        self._disk_bytes = 0
+        self._scanned_at = 0.0
+        self._evict_lock = threading.Lock()
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._evict_disk()
+
+    def key(self, content_hash):
+        # Parses store skill IDs, which are only valid under the taxonomy they were made with
+        return f"{content_hash}-{self.version}-{TAXONOMY_DIGEST.hex()}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, content_hash):
+        """Return the cached Resume for a content hash, or None."""
+        key = self.key(content_hash)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return Resume.from_bytes(self._entries[key])
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, data)
+        return Resume.from_bytes(data)
+
+    def put(self, content_hash, resume):
+        """Store a parsed Resume under a content hash."""
+        key = self.key(content_hash)
+        data = resume.to_bytes()
+        with self._lock:
+            self._remember(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current size of each tier."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._entries),
+                'disk_entries': self._disk_entries,
+                'disk_bytes': self._disk_bytes
+            }
+
+    def _remember(self, key, data):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            # Check the entry decodes before it is served
+            Resume.from_bytes(data)
+            # Touch the file so eviction sees it as recently used
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable parse cache entry {path}: {str(e)}")
+            return None
+
+    def _write_disk(self, key, data):
+        if not self.directory:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = None
+            with open(tmp_path, 'wb') as file:
+                file.write(data)
+            # Atomic rename so other workers never read a partial entry
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write parse cache entry {path}: {str(e)}")
+            return
+        with self._lock:
+            self._disk_bytes += len(data) - (replaced or 0)
+            self._disk_entries += replaced is None
+            scan = self._disk_bytes > self.max_bytes or time.monotonic() - self._scanned_at > DISK_RESCAN_SECONDS
+        if scan:
+            self._evict_disk()
+
+    def _disk_usage(self):
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(ENTRY_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        return entries, total
+
+    def _evict_disk(self):
+        """Rescan the disk tier, evict from it if over budget, and reset the running totals."""
+        # One scan at a time; puts that find one running skip theirs
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            entries, total = self._disk_usage()
+            if total > self.max_bytes:
+                entries.sort()
+                evicted = 0
+                for _, size, path in entries:
+                    if total <= self.max_bytes * DISK_LOW_WATER:
+                        break
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    total -= size
+                    evicted += 1
+                del entries[:evicted]
+            with self._lock:
+                self._disk_entries = len(entries)
+                self._disk_bytes = total
+                self._scanned_at = time.monotonic()
+        except OSError as e:
+            logger.warning(f"Could not scan parse cache directory {self.directory}: {str(e)}")
+        finally:
+            self._evict_lock.release()
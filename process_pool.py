@@ -0,0 +1,108 @@
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# In a pool process, where it reports (job ID, PID, start time); the job ID is None for the process itself
+_reports = None
+
+
+def _init_process(reports, initializer, initargs):
+    global _reports
+    _reports = reports
+    reports.put((None, os.getpid(), time.time()))
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_job(job_id, func, args):
+    _reports.put((job_id, os.getpid(), time.time()))
+    return func(*args)
+
+
+class WorkerPool:
+    """A ProcessPoolExecutor that knows its processes and when each of its jobs started.
+
+    Processes report their PID as they start, and again with the time as
+    they pick up each job. Reports go over a SimpleQueue, which writes from
+    the calling thread, so a job stuck holding the GIL has still reported.
+    Killing any process breaks the pool: the executor terminates the others
+    and fails every job in flight with BrokenProcessPool.
+    """
+
+    def __init__(self, workers, mp_context=None, initializer=None, initargs=()):
+        context = mp_context or multiprocessing.get_context()
+        self._reports = context.SimpleQueue()
+        self._executor = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_process,
+                                             initargs=(self._reports, initializer, initargs))
+        self._job_ids = count()
+        # job ID -> future, None until submit returns it
+        self._futures = {}
+        # job ID -> (PID, start time) of jobs started and not finished
+        self._started = {}
+        self._pids = set()
+        self._killed = False
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        """Run func(*args) in a pool process and return its future."""
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._futures[job_id] = None
+        try:
+            future = self._executor.submit(_run_job, job_id, func, args)
+        except BaseException:
+            with self._lock:
+                del self._futures[job_id]
+            raise
+        with self._lock:
+            self._futures[job_id] = future
+            self._update()
+        return future
+
+    def running(self):
+        """Return {future: (PID, start time)} of the jobs started and not finished."""
+        with self._lock:
+            self._update()
+            return {self._futures[job_id]: started for job_id, started in self._started.items()
+                    if self._futures[job_id] is not None}
+
+    def kill(self, pids=None):
+        """Terminate the given processes of the pool, or all of them, and shut it down."""
+        with self._lock:
+            self._update()
+            if pids is None:
+                pids = self._pids
+            # PIDs of a killed pool may be reused by other processes
+            pids = () if self._killed else set(pids) & self._pids
+            self._killed = True
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        self._executor.shutdown(wait=False)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def _update(self):
+        """Read the reports sent so far and forget finished jobs; called with the lock held."""
+        while not self._reports.empty():
+            job_id, pid, started = self._reports.get()
+            if job_id is None:
+                self._pids.add(pid)
+            elif job_id in self._futures:
+                self._started[job_id] = (pid, started)
+        finished = [job_id for job_id, future in self._futures.items() if future is not None and future.done()]
+        for job_id in finished:
+            del self._futures[job_id]
+            self._started.pop(job_id, None)
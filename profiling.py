@@ -0,0 +1,91 @@
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Requests may ask to be profiled only when this is set to 1
+PROFILE_REQUESTS = os.environ.get('PROFILE_REQUESTS', '') == '1'
+
+# Request header that selects the profiler: "cpu" (cProfile) or "memory" (tracemalloc)
+PROFILE_HEADER = 'X-Profile'
+
+# Reports are written here, named after the profile ID
+PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'resume-profiles'))
+
+# Lines of the text summary: functions by cumulative time, or allocation sites
+PROFILE_TOP = 40
+
+# tracemalloc traces the whole process, so only one memory profile runs at a time
+_memory_lock = threading.Lock()
+
+
+class RequestProfile:
+    """A cProfile or tracemalloc session covering one request."""
+
+    def __init__(self, mode):
+        if mode not in ('cpu', 'memory'):
+            raise ValueError(f"Unknown profile mode '{mode}', expected 'cpu' or 'memory'")
+        self.mode = mode
+        self.id = uuid.uuid4().hex
+        self._profiler = None
+        self._start = time.perf_counter()
+
+        if mode == 'cpu':
+            # cProfile follows the calling thread, which serves this request
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            if not _memory_lock.acquire(blocking=False):
+                raise RuntimeError('Another memory profile is running')
+            tracemalloc.start(25)
+
+    def stop(self, label=''):
+        """Stop profiling, write the report and return its path."""
+        elapsed = time.perf_counter() - self._start
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        summary = io.StringIO()
+        summary.write(f"{label} {self.mode} profile, {elapsed * 1000:.1f} ms\n\n")
+
+        if self.mode == 'cpu':
+            self._profiler.disable()
+            self._profiler.dump_stats(os.path.join(PROFILE_DIR, f'{self.id}.prof'))
+            stats = pstats.Stats(self._profiler, stream=summary)
+            stats.sort_stats('cumulative').print_stats(PROFILE_TOP)
+        else:
+            try:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+                _memory_lock.release()
+            summary.write(f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP]:
+                summary.write(f"{stat}\n")
+
+        path = os.path.join(PROFILE_DIR, f'{self.id}.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(summary.getvalue())
+        logger.info(f"Wrote {self.mode} profile of {label} to {path}")
+        return path
+
+
+def start_request_profile(headers):
+    """Return a RequestProfile if profiling is enabled and the request asks for it."""
+    mode = headers.get(PROFILE_HEADER, '').strip().lower()
+    if not PROFILE_REQUESTS or not mode:
+        return None
+    try:
+        return RequestProfile(mode)
+    except (ValueError, RuntimeError) as e:
+        logger.warning(f"Not profiling request: {e}")
+        return None
@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Rendered views kept in process memory
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+
+
+class CachedResponse:
+    """A rendered view with its ETag and the time of the data it was rendered from."""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'last_modified')
+
+    def __init__(self, body, mimetype, last_modified=None):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = last_modified
+
+
+class ResponseCache:
+    """In-process LRU cache of rendered views, keyed by user, view and data version.
+
+    The version is the updated_at time of the user's record, which every
+    write to the session store moves forward, so a view rendered from older
+    data is never served, whichever worker made the change. invalidate drops
+    the views of a user as soon as this process changes their data.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # (user_id, view) -> (version, CachedResponse)
+        self._entries = OrderedDict()
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, view, version):
+        """Return the CachedResponse of a view rendered at this version, or None."""
+        key = (user_id, view)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id, view, version, body, mimetype, last_modified=None):
+        """Cache a rendered view and return it as a CachedResponse."""
+        response = CachedResponse(body, mimetype, last_modified)
+        key = (user_id, view)
+        with self._lock:
+            self._entries[key] = (version, response)
+            self._entries.move_to_end(key)
+            self._views.setdefault(user_id, set()).add(view)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+        return response
+
+    def invalidate(self, user_id):
+        """Drop every cached view of a user."""
+        with self._lock:
+            for view in self._views.pop(user_id, ()):
+                self._entries.pop((user_id, view), None)
+
+    def _drop(self, key):
+        del self._entries[key]
+        user_id, view = key
+        views = self._views[user_id]
+        views.discard(view)
+        if not views:
+            del self._views[user_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._views.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries)
+            }
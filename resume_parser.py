@@ -1,81 +1,290 @@
 import logging
 import PyPDF2
-import docx
+import io
 import re
 import os
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from lxml import etree
+
+from taxonomy import TAXONOMY
+from nlp_resources import stopword_set
+from metrics import METRICS, COUNT_BUCKETS, SIZE_BUCKETS, SKILLS_FOUND
+from timing import StageTimer
+from sections import segment_sections, RESUME_HEADINGS
+from tenure import DateIndex, total_years
+from models import Resume
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Download NLTK data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-    nltk.data.find('tokenizers/punkt')
-
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
-    nltk.download('punkt_tab')
-
-# Common technical skills to look for
-COMMON_SKILLS = [
-    # Programming Languages
-    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-    'go', 'rust', 'perl', 'scala', 'r', 'matlab', 'bash', 'shell', 'powershell', 'sql',
-    # Web Development
-    'html', 'css', 'react', 'angular', 'vue', 'node', 'express', 'django', 'flask', 'spring',
-    'asp.net', 'jquery', 'bootstrap', 'tailwind', 'sass', 'less', 'webpack', 'babel', 'nextjs',
-    # Databases
-    'mysql', 'postgresql', 'mongodb', 'oracle', 'sql server', 'sqlite', 'nosql', 'redis', 
-    'dynamodb', 'cassandra', 'elasticsearch', 'firebase',
-    # DevOps & Cloud
-    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions', 
-    'terraform', 'ansible', 'puppet', 'chef', 'vagrant', 'prometheus', 'grafana',
-    # Data Science & AI
-    'machine learning', 'deep learning', 'artificial intelligence', 'nlp', 'neural networks',
-    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'pandas', 'numpy', 'scipy', 'matplotlib',
-    'tableau', 'power bi', 'data mining', 'computer vision', 'big data',
-    # Mobile Development
-    'android', 'ios', 'react native', 'flutter', 'xamarin', 'cordova', 'ionic',
-    # Tools & Methodologies
-    'git', 'svn', 'agile', 'scrum', 'kanban', 'jira', 'confluence', 'trello', 'slack',
-    'continuous integration', 'continuous deployment', 'ci/cd', 'tdd', 'bdd', 'devops',
-    # Soft Skills
-    'problem solving', 'teamwork', 'communication', 'leadership', 'project management',
-    'time management', 'critical thinking', 'decision making', 'adaptability', 'creativity'
-]
-
-def extract_text_from_pdf(pdf_path):
-    """Extract text from a PDF file."""
-    text = ""
+# Bump whenever parsing output changes so cached parses are not reused
+PARSER_VERSION = '7'
+
+# Skills to look for, from the shared taxonomy (see data/taxonomy.json)
+COMMON_SKILLS = TAXONOMY.detectable_skills()
+
+# Compiled once so every document is scanned for all skills in a single pass
+SKILL_SCANNER = TAXONOMY.scanner()
+
+# Limits that keep one huge upload from tying up a worker (0 disables a limit)
+MAX_PDF_PAGES = int(os.environ.get('MAX_PDF_PAGES', 60))
+MAX_TEXT_CHARS = int(os.environ.get('MAX_TEXT_CHARS', 300000))
+
+# Lines read from each resume section after its heading
+RESUME_SECTION_LINES = {'skills': 20, 'experience': 30, 'education': 20}
+
+# Processes used to extract PDF pages in parallel (0 or 1 extracts serially),
+# and the number of pages each process handles per task
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', 0))
+PDF_PAGES_PER_TASK = 8
+
+# Document metrics, exported on /metrics
+PAGES_READ = METRICS.histogram('resume_pdf_pages', 'Pages read per PDF resume.', buckets=COUNT_BUCKETS)
+TEXT_CHARACTERS = METRICS.histogram('resume_text_characters', 'Characters of text extracted per resume.',
+                                    labels=('format',), buckets=SIZE_BUCKETS)
+
+# Bytes read from the start of a document to recognize its format
+SNIFF_BYTES = 2048
+
+PDF_MAGIC = b'%PDF-'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+LEGACY_DOC_MESSAGE = "Legacy Word .doc files are not supported; save the resume as .docx or PDF"
+
+# WordprocessingML elements read by the streaming DOCX extractor
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_P = W_NS + 'p'
+W_T = W_NS + 't'
+W_TAB = W_NS + 'tab'
+W_BR = W_NS + 'br'
+W_CR = W_NS + 'cr'
+W_TBL = W_NS + 'tbl'
+W_SDT = W_NS + 'sdt'
+# Text boxes are stored twice, as DrawingML and as a VML fallback; only the first is read
+MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+# Top-level containers whose finished children can be dropped while parsing
+DOCX_PART_ROOTS = {W_NS + 'body', W_NS + 'hdr', W_NS + 'ftr'}
+DOCX_BODY_PART = 'word/document.xml'
+
+def open_document(document):
+    """Return (seekable binary stream, owned) for a path, bytes-like object or file object.
+
+    owned tells whether the stream was opened here and should be closed by
+    the caller. Bytes and bytearrays are read in place; a memoryview is
+    copied once. Unseekable file objects are read into memory.
+    """
+    if isinstance(document, (str, os.PathLike)):
+        return open(document, 'rb'), True
+    if isinstance(document, (bytes, bytearray, memoryview)):
+        return io.BytesIO(document), True
+    if hasattr(document, 'seekable') and document.seekable():
+        return document, False
+    return io.BytesIO(document.read()), True
+
+def sniff_format(stream):
+    """Return 'pdf', 'docx', 'doc' or None from the leading bytes of a stream.
+
+    The stream position is left unchanged.
+    """
+    position = stream.tell()
+    try:
+        head = stream.read(SNIFF_BYTES)
+        if head.startswith(OLE2_MAGIC):
+            return 'doc'
+        # The PDF header may follow some leading junk within the first kilobyte
+        if PDF_MAGIC in head[:1024]:
+            return 'pdf'
+        if head.startswith(ZIP_MAGIC):
+            stream.seek(position)
+            try:
+                with zipfile.ZipFile(stream) as archive:
+                    archive.getinfo('word/document.xml')
+                return 'docx'
+            except (KeyError, zipfile.BadZipFile):
+                return None
+        return None
+    finally:
+        stream.seek(position)
+
+def _extract_pdf_page_range(source, start, stop):
+    """Extract the text of pages [start, stop) of a PDF given as a path or bytes."""
+    stream, _ = open_document(source)
+    with stream:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        return [pdf_reader.pages[page_num].extract_text() or "" for page_num in range(start, stop)]
+
+def iter_pdf_pages(pdf, max_pages=None, workers=None):
+    """Yield the text of each page of a PDF, in page order.
+
+    pdf is a path, a bytes-like object or a binary file object. With more
+    than one worker, ranges of pages are extracted in a process pool. Pages
+    still pending are cancelled if the caller stops iterating.
+    """
+    if workers is None:
+        workers = PDF_WORKERS
+    
+    stream, owned = open_document(pdf)
+    try:
+        pdf_reader = PyPDF2.PdfReader(stream)
+        page_count = len(pdf_reader.pages)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        
+        if workers <= 1 or page_count <= PDF_PAGES_PER_TASK:
+            for page_num in range(page_count):
+                yield pdf_reader.pages[page_num].extract_text() or ""
+            return
+        
+        # Pool processes reopen a path themselves; anything else is sent as bytes
+        if isinstance(pdf, (str, os.PathLike)):
+            source = pdf
+        else:
+            stream.seek(0)
+            source = stream.read()
+    finally:
+        if owned:
+            stream.close()
+    
+    ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
+        futures = [executor.submit(_extract_pdf_page_range, source, start, stop) for start, stop in ranges]
+        for future in futures:
+            yield from future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def extract_text_from_pdf(pdf, max_pages=MAX_PDF_PAGES, max_chars=MAX_TEXT_CHARS, workers=None):
+    """Extract text from a PDF path, bytes or file object, stopping early at the page or character cap."""
+    pages = []
+    length = 0
+    try:
+        page_iter = iter_pdf_pages(pdf, max_pages=max_pages, workers=workers)
+        for page_text in page_iter:
+            pages.append(page_text)
+            length += len(page_text)
+            if max_chars and length >= max_chars:
+                logger.debug(f"Stopped PDF extraction at {length} characters")
+                page_iter.close()
+                break
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {str(e)}")
         raise
     
+    PAGES_READ.observe(len(pages))
+    text = "".join(pages)
+    if max_chars:
+        text = text[:max_chars]
     return text
 
-def extract_text_from_docx(docx_path):
-    """Extract text from a DOCX file."""
-    text = ""
+def _docx_parts(archive):
+    """Return the XML parts holding text: the document body, then headers, then footers.
+
+    The body comes first, so its first line, not a "Curriculum Vitae"
+    header, is the one the name is taken from.
+    """
+    names = archive.namelist()
+    headers = sorted(name for name in names if re.fullmatch(r'word/header\d*\.xml', name))
+    footers = sorted(name for name in names if re.fullmatch(r'word/footer\d*\.xml', name))
+    return [DOCX_BODY_PART] + headers + footers
+
+def _iter_part_paragraphs(part):
+    """Yield the text of each paragraph of a WordprocessingML part, in document order.
+
+    Paragraphs in table cells, content controls and text boxes are included.
+    Finished top-level elements are dropped as parsing goes, so memory stays
+    bounded by the largest single table or paragraph.
+    """
+    # One buffer per open paragraph; text box paragraphs nest inside another paragraph
+    paragraphs = []
+    fallback_depth = 0
+    events = etree.iterparse(part, events=('start', 'end'),
+                             tag=(W_P, W_T, W_TAB, W_BR, W_CR, W_TBL, W_SDT, MC_FALLBACK))
+    for event, element in events:
+        tag = element.tag
+        if tag == MC_FALLBACK:
+            fallback_depth += 1 if event == 'start' else -1
+            continue
+        if event == 'start':
+            if tag == W_P and not fallback_depth:
+                paragraphs.append([])
+            continue
+        
+        if fallback_depth:
+            pass
+        elif tag == W_T:
+            if paragraphs and element.text:
+                paragraphs[-1].append(element.text)
+        elif tag == W_TAB:
+            if paragraphs:
+                paragraphs[-1].append('\t')
+        elif tag in (W_BR, W_CR):
+            if paragraphs:
+                paragraphs[-1].append('\n')
+        elif tag == W_P:
+            yield ''.join(paragraphs.pop())
+        
+        if tag in (W_P, W_TBL, W_SDT):
+            parent = element.getparent()
+            if parent is not None and parent.tag in DOCX_PART_ROOTS:
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+
+def iter_docx_paragraphs(document):
+    """Yield the text of each paragraph of a DOCX path, bytes or file object.
+
+    The zip parts are stream-parsed with lxml instead of building the
+    python-docx object model. Legacy .doc files raise ValueError.
+    """
+    stream, owned = open_document(document)
+    try:
+        position = stream.tell()
+        if stream.read(len(OLE2_MAGIC)) == OLE2_MAGIC:
+            raise ValueError(LEGACY_DOC_MESSAGE)
+        stream.seek(position)
+        
+        with zipfile.ZipFile(stream) as archive:
+            # Headers and footers come in default, first-page and even-page
+            # variants that mostly repeat each other, so each line is kept once
+            seen = set()
+            for name in _docx_parts(archive):
+                with archive.open(name) as part:
+                    if name == DOCX_BODY_PART:
+                        yield from _iter_part_paragraphs(part)
+                        continue
+                    for paragraph in _iter_part_paragraphs(part):
+                        if paragraph not in seen:
+                            seen.add(paragraph)
+                            yield paragraph
+    finally:
+        if owned:
+            stream.close()
+
+def extract_text_from_docx(document, max_chars=MAX_TEXT_CHARS):
+    """Extract text from a DOCX path, bytes or file object, one line per paragraph."""
+    lines = []
+    length = 0
     try:
-        doc = docx.Document(docx_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        paragraph_iter = iter_docx_paragraphs(document)
+        for paragraph in paragraph_iter:
+            lines.append(paragraph + "\n")
+            length += len(paragraph) + 1
+            if max_chars and length >= max_chars:
+                logger.debug(f"Stopped DOCX extraction at {length} characters")
+                paragraph_iter.close()
+                break
     except Exception as e:
         logger.error(f"Error extracting text from DOCX: {str(e)}")
         raise
     
+    text = "".join(lines)
+    if max_chars:
+        text = text[:max_chars]
     return text
 
 def extract_contact_info(text):
@@ -118,29 +327,25 @@ def extract_contact_info(text):
         'phone': phone
     }
 
-def extract_skills(text):
+def segment_resume(text):
+    """Locate the skills, experience and education sections of a resume."""
+    return segment_sections(text, RESUME_HEADINGS, RESUME_SECTION_LINES)
+
+def extract_skills(text, sections=None):
     """Extract skills from text."""
     skills = []
-    
-    # Tokenize and clean text
-    tokens = word_tokenize(text.lower())
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [token for token in tokens if token.isalpha() and token not in stop_words]
+    stop_words = stopword_set()
     
     # Check for common skills
-    text_lower = text.lower()
-    for skill in COMMON_SKILLS:
-        # Match whole words only
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            if skill not in skills:
-                skills.append(skill)
+    for skill in SKILL_SCANNER.skills_in(text):
+        if skill not in skills:
+            skills.append(skill)
     
     # Look for skill sections
-    skill_section_matches = re.findall(r'(?i)(?:skills|technical skills|proficiencies|competencies)(?:[^\n]*\n){1,20}', text)
-    for match in skill_section_matches:
-        lines = match.split('\n')
-        for line in lines[1:]:  # Skip the header line
+    if sections is None:
+        sections = segment_resume(text)
+    for start, end in sections['skills']:
+        for line in text[start:end].split('\n'):
             # Split by commas, bullets, or other separators
             skill_items = re.split(r'[,•|]', line)
             for item in skill_items:
@@ -150,23 +355,27 @@ def extract_skills(text):
     
     return sorted(skills)
 
-def extract_experience(text):
+def extract_experience(text, sections=None, dates=None):
     """Extract work experience from text."""
     experience = []
     
     # Look for experience sections
-    exp_pattern = r'(?i)(?:experience|work experience|employment|work history)(?:[^\n]*\n){1,30}?(?=\n\s*(?:education|skills|projects|certifications|references|\Z))'
-    exp_sections = re.findall(exp_pattern, text)
+    if sections is None:
+        sections = segment_resume(text)
+    if dates is None:
+        dates = DateIndex(text)
     
     # Process each experience section
-    for section in exp_sections:
-        lines = section.split('\n')
+    for start, end in sections['experience']:
+        lines = text[start:end].split('\n')
         current_exp = {}
+        line_start = start
         
-        for i, line in enumerate(lines):
-            if i == 0:  # Skip the header
-                continue
-                
+        # Line 0 was the header
+        for i, line in enumerate(lines, 1):
+            line_end = line_start + len(line)
+            date_range = dates.range_in(line_start, line_end)
+            line_start = line_end + 1
             line = line.strip()
             if not line:
                 continue
@@ -188,10 +397,8 @@ def extract_experience(text):
                         current_exp['company'] = line
             
             # Look for dates
-            date_pattern = r'(?:\d{1,2}/\d{4}|\d{1,2}-\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{4})\s*(?:-|to|–)\s*(?:\d{1,2}/\d{4}|\d{1,2}-\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{4}|Present|Current)'
-            date_match = re.search(date_pattern, line, re.IGNORECASE)
-            if date_match and not current_exp.get('duration'):
-                current_exp['duration'] = date_match.group(0)
+            if date_range and not current_exp.get('duration'):
+                current_exp['duration'] = text[date_range[0]:date_range[1]]
             
             # Collect responsibilities and descriptions
             if i > 2 and line and not line.startswith(('Company', 'Position', 'Duration')):
@@ -207,23 +414,27 @@ def extract_experience(text):
     
     return experience
 
-def extract_education(text):
+def extract_education(text, sections=None, dates=None):
     """Extract education information from text."""
     education = []
     
     # Look for education sections
-    edu_pattern = r'(?i)(?:education|academic background|qualifications)(?:[^\n]*\n){1,20}?(?=\n\s*(?:experience|skills|projects|certifications|references|\Z))'
-    edu_sections = re.findall(edu_pattern, text)
+    if sections is None:
+        sections = segment_resume(text)
+    if dates is None:
+        dates = DateIndex(text)
     
     # Process each education section
-    for section in edu_sections:
-        lines = section.split('\n')
+    for start, end in sections['education']:
+        lines = text[start:end].split('\n')
         current_edu = {}
+        line_start = start
         
-        for i, line in enumerate(lines):
-            if i == 0:  # Skip the header
-                continue
-                
+        # Line 0 was the header
+        for i, line in enumerate(lines, 1):
+            line_end = line_start + len(line)
+            date_range = dates.range_in(line_start, line_end)
+            line_start = line_end + 1
             line = line.strip()
             if not line:
                 continue
@@ -237,52 +448,90 @@ def extract_education(text):
                 current_edu['degree'] = line
             
             # Look for dates
-            date_pattern = r'(?:\d{1,2}/\d{4}|\d{1,2}-\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{4})\s*(?:-|to|–)\s*(?:\d{1,2}/\d{4}|\d{1,2}-\d{4}|(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}|(?:January|February|March|April|May|June|July|August|September|October|November|December) \d{4}|Present|Current)'
-            date_match = re.search(date_pattern, line, re.IGNORECASE)
-            if date_match and not current_edu.get('period'):
-                current_edu['period'] = date_match.group(0)
+            if date_range and not current_edu.get('period'):
+                current_edu['period'] = text[date_range[0]:date_range[1]]
             
             # If we have enough information, add this education
             if current_edu.get('institution') and current_edu.get('degree'):
-                if i > 3 or i == len(lines)-1:
+                if i > 3 or i == len(lines):
                     if current_edu not in education:
                         education.append(current_edu)
                     current_edu = {}
     
     return education
 
-def parse_resume(file_path):
-    """Parse resume file and extract information."""
+def extract_total_experience(text, sections=None, dates=None):
+    """Total years of work experience, counting overlapping jobs once, or None if no dates are found."""
+    if sections is None:
+        sections = segment_resume(text)
+    if dates is None:
+        dates = DateIndex(text)
+    
+    if sections['experience']:
+        ranges = dates.ranges_in(sections['experience'])
+    else:
+        # Without an experience heading, count every range outside education
+        education = set(dates.ranges_in(sections['education']))
+        ranges = [date_range for date_range in dates.ranges if date_range not in education]
+    
+    if not ranges:
+        return None
+    return total_years(ranges)
+
+def parse_resume(document, timings=None):
+    """Parse resume file and extract information.
+
+    document is a file path, a bytes-like object or a binary file object;
+    its format is recognized from its content, not its name. Each stage is
+    observed in the pipeline_stage_seconds metric; pass a dict as timings
+    to also get the seconds spent in each stage.
+    """
+    timer = StageTimer(timings, pipeline='resume')
+    stream, owned = open_document(document)
     try:
-        # Extract text based on file extension
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            text = extract_text_from_pdf(file_path)
-        elif file_extension in ['.docx', '.doc']:
-            text = extract_text_from_docx(file_path)
-        else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
+        # Extract text based on the sniffed file format
+        with timer.stage('extract_text'):
+            file_format = sniff_format(stream)
+            if file_format == 'pdf':
+                text = extract_text_from_pdf(stream)
+            elif file_format == 'docx':
+                text = extract_text_from_docx(stream)
+            elif file_format == 'doc':
+                raise ValueError(LEGACY_DOC_MESSAGE)
+            else:
+                raise ValueError("Unsupported file format: expected a PDF or DOCX document")
+        TEXT_CHARACTERS.observe(len(text), format=file_format)
         
         # Extract information
-        contact_info = extract_contact_info(text)
-        skills = extract_skills(text)
-        experience = extract_experience(text)
-        education = extract_education(text)
+        with timer.stage('contact_info'):
+            contact_info = extract_contact_info(text)
+        with timer.stage('sections'):
+            sections = segment_resume(text)
+            dates = DateIndex(text)
+        with timer.stage('skills'):
+            skills = extract_skills(text, sections)
+        with timer.stage('experience'):
+            experience = extract_experience(text, sections, dates)
+            total_experience_years = extract_total_experience(text, sections, dates)
+        with timer.stage('education'):
+            education = extract_education(text, sections, dates)
+        SKILLS_FOUND.observe(len(skills), document='resume')
         
         # Combine all extracted information
-        resume_data = {
-            'name': contact_info['name'],
-            'email': contact_info['email'],
-            'phone': contact_info['phone'],
-            'skills': skills,
-            'experience': experience,
-            'education': education,
-            'raw_text': text
-        }
-        
-        return resume_data
+        return Resume(
+            name=contact_info['name'],
+            email=contact_info['email'],
+            phone=contact_info['phone'],
+            skills=skills,
+            experience=experience,
+            education=education,
+            total_experience_years=total_experience_years,
+            raw_text=text
+        )
     
     except Exception as e:
         logger.error(f"Error parsing resume: {str(e)}")
         raise
+    finally:
+        if owned:
+            stream.close()
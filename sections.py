@@ -0,0 +1,162 @@
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Lines longer than this are never headings, unless a short heading ends in a colon within it
+MAX_HEADING_CHARS = 60
+
+# Markup trimmed from both ends of a heading: markdown, underlines, table borders
+HEADING_TRIM = ' \t\r#*=_~|'
+
+# Resume headings, normalized (lower case, single spaces, '&' spelled 'and')
+RESUME_HEADINGS = {
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'key skills': 'skills',
+    'core skills': 'skills',
+    'skills and abilities': 'skills',
+    'proficiencies': 'skills',
+    'competencies': 'skills',
+    'core competencies': 'skills',
+    'technologies': 'skills',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'relevant experience': 'experience',
+    'employment': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'career history': 'experience',
+    'education': 'education',
+    'education and training': 'education',
+    'academic background': 'education',
+    'qualifications': 'education',
+    'summary': 'other',
+    'profile': 'other',
+    'professional summary': 'other',
+    'objective': 'other',
+    'projects': 'other',
+    'certifications': 'other',
+    'certificates': 'other',
+    'awards': 'other',
+    'publications': 'other',
+    'languages': 'other',
+    'interests': 'other',
+    'volunteering': 'other',
+    'volunteer experience': 'other',
+    'references': 'other',
+    'contact': 'other',
+}
+
+# Job description headings
+JOB_HEADINGS = {
+    'requirements': 'required',
+    'qualifications': 'required',
+    'required qualifications': 'required',
+    'minimum qualifications': 'required',
+    'basic qualifications': 'required',
+    'skills required': 'required',
+    'required skills': 'required',
+    'key skills': 'required',
+    'technical skills': 'required',
+    'what you need': 'required',
+    "what you'll need": 'required',
+    'preferred': 'preferred',
+    'preferred qualifications': 'preferred',
+    'preferred skills': 'preferred',
+    'nice to have': 'preferred',
+    'nice to haves': 'preferred',
+    'bonus': 'preferred',
+    'bonus points': 'preferred',
+    'plus': 'preferred',
+    'additionally': 'preferred',
+    'desirable': 'preferred',
+    'responsibilities': 'other',
+    'what you will do': 'other',
+    "what you'll do": 'other',
+    'about the role': 'other',
+    'benefits': 'other',
+    'perks': 'other',
+    'about us': 'other',
+    'about the company': 'other',
+    'company': 'other',
+    'application': 'other',
+    'how to apply': 'other',
+}
+
+
+def classify_heading(line, headings):
+    """Return (section name, offset where the section body starts on this line) or None.
+
+    A heading is a whole short line ("Work Experience") or a short label
+    ending in a colon ("Skills: Python, SQL"), whose body starts on the same
+    line.
+    """
+    head = line[:MAX_HEADING_CHARS + 1]
+    colon = head.find(':')
+    if colon >= 0:
+        label = head[:colon]
+        # Skip closing markup such as the "**" of "**Skills:**"
+        rest = line[colon + 1:]
+        body_start = colon + 1 + len(rest) - len(rest.lstrip(HEADING_TRIM))
+    elif len(line.rstrip()) <= MAX_HEADING_CHARS:
+        label = head
+        body_start = len(line)
+    else:
+        return None
+
+    key = ' '.join(label.strip(HEADING_TRIM).lower().replace('&', ' and ').split())
+    name = headings.get(key)
+    if name is None:
+        return None
+    return name, body_start
+
+
+def segment_sections(text, headings, max_lines=None):
+    """Split text into sections at heading lines, in a single pass.
+
+    Returns a dict from every section name in headings to the list of
+    (start, end) offsets of its bodies, in document order. A body runs from
+    after its heading to the next heading line, or stops after
+    max_lines[name] lines. Each line is scanned a bounded number of times
+    and classified with at most one dict lookup, so the cost is
+    O(len(text)) for any input.
+    """
+    sections = {name: [] for name in headings.values()}
+    max_lines = max_lines or {}
+    # Most lines are rejected on their first letter, before being normalized
+    initials = {key[0] for key in headings}
+    current = None
+    start = lines_left = 0
+    position = 0
+    length = len(text)
+
+    for line in text.split('\n'):
+        next_position = position + len(line) + 1
+        first = line.lstrip(HEADING_TRIM)[:1].lower()
+        heading = classify_heading(line, headings) if first in initials and first else None
+
+        if heading is not None:
+            if current is not None:
+                sections[current].append((start, position))
+            current, body_start = heading
+            start = position + body_start
+            # Text after "Heading:" counts as the first line of the body
+            lines_left = max_lines.get(current, -1)
+            if line[body_start:].strip():
+                lines_left -= 1
+            else:
+                start = min(next_position, length)
+        elif current is not None:
+            lines_left -= 1
+
+        if current is not None and lines_left == 0:
+            sections[current].append((start, min(next_position, length)))
+            current = None
+        position = next_position
+
+    if current is not None:
+        sections[current].append((start, length))
+    return sections
@@ -0,0 +1,292 @@
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from sqlalchemy import Column, Float, LargeBinary, MetaData, String, Table, create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+
+from models import Resume, SkillGapAnalysis, pack_parts, unpack_parts
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# SQLAlchemy database URL shared by all workers (unset keeps sessions in memory)
+SESSION_STORE_URL = os.environ.get('SESSION_STORE_URL', '')
+
+# Sessions expire after this many seconds without being read or written
+SESSION_TTL = int(os.environ.get('SESSION_TTL', 24 * 3600))
+
+# Memory budget of the in-memory backend, counted on the stored bytes
+SESSION_MAX_BYTES = int(os.environ.get('SESSION_MAX_BYTES', 64 * 1024 * 1024))
+
+# Keep the extracted document text in stored records (needed only for debugging)
+SESSION_KEEP_RAW_TEXT = os.environ.get('SESSION_KEEP_RAW_TEXT', '') == '1'
+
+# Prefix of records stored as serialized models, followed by the time of their last change
+RECORD_MAGIC = b'RS\x02'
+_UPDATED_AT = struct.Struct('<d')
+
+
+def encode_record(record, keep_raw_text=SESSION_KEEP_RAW_TEXT):
+    """Serialize a user record, a Resume and a list of SkillGapAnalysis jobs, to compressed bytes.
+
+    The raw document text is dropped unless asked to keep it. The updated_at
+    time of the record is kept uncompressed in front, for record_version.
+    """
+    resume = record.get('resume')
+    parts = [resume.to_bytes(keep_raw_text) if resume is not None else b'']
+    parts.extend(job.to_bytes(keep_raw_text) for job in record.get('jobs', []))
+    return RECORD_MAGIC + _UPDATED_AT.pack(record.get('updated_at', 0.0)) + zlib.compress(pack_parts(parts), 1)
+
+
+def record_version(data):
+    """Return the updated_at time of an encoded record without decoding it, 0.0 for records of another format."""
+    if data[:len(RECORD_MAGIC)] != RECORD_MAGIC:
+        return 0.0
+    return _UPDATED_AT.unpack_from(data, len(RECORD_MAGIC))[0]
+
+
+def decode_record(data):
+    """Decode bytes made by encode_record; raises ValueError for records in any other format."""
+    if data[:len(RECORD_MAGIC)] != RECORD_MAGIC:
+        raise ValueError("Unknown session record format")
+    resume, *jobs = unpack_parts(zlib.decompress(memoryview(data)[len(RECORD_MAGIC) + _UPDATED_AT.size:]))
+    record = {'updated_at': record_version(data)}
+    if len(resume):
+        record['resume'] = Resume.from_bytes(resume)
+    if jobs:
+        record['jobs'] = [SkillGapAnalysis.from_bytes(job) for job in jobs]
+    return record
+
+
+def _decode_or_drop(store, user_id, data):
+    """Decode a stored record, deleting it instead if it is unreadable or was written under another taxonomy."""
+    try:
+        return decode_record(data)
+    except (ValueError, struct.error, zlib.error) as e:
+        logger.warning(f"Dropping the session of {user_id}: {e}")
+        store.delete(user_id)
+        return None
+
+
+def _notify_deleted(store, user_ids):
+    """Call the on_delete hook of a store for each user whose record it removed."""
+    if store.on_delete is not None:
+        for user_id in user_ids:
+            store.on_delete(user_id)
+
+
+class MemorySessionStore:
+    """Per-process session store with a TTL and an LRU memory budget.
+
+    Records are kept encoded, so their size is known exactly and the budget
+    counts real bytes rather than estimates of Python object overhead.
+    on_delete is called with the user ID of every record deleted, expired
+    or evicted, outside the store's lock.
+    """
+
+    # Records live in this process only, and are lost when it exits
+    shared = False
+
+    def __init__(self, ttl=SESSION_TTL, max_bytes=SESSION_MAX_BYTES, keep_raw_text=SESSION_KEEP_RAW_TEXT,
+                 on_delete=None):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.keep_raw_text = keep_raw_text
+        self.on_delete = on_delete
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Return the record of a user, or None if absent, expired, unreadable or stored under another taxonomy."""
+        data = self._read(user_id)
+        return _decode_or_drop(self, user_id, data) if data is not None else None
+
+    def version(self, user_id):
+        """Return the updated_at time of a user's record without decoding it, or None if absent or expired."""
+        data = self._read(user_id)
+        return record_version(data) if data is not None else None
+
+    def _read(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, data = entry
+            now = time.time()
+            if expires_at > now:
+                # Entries stay ordered by expiry, which is also LRU order
+                self._entries[user_id] = (now + self.ttl, data)
+                self._entries.move_to_end(user_id)
+                return data
+            self._drop(user_id)
+            self.expirations += 1
+        _notify_deleted(self, [user_id])
+        return None
+
+    def put(self, user_id, record):
+        data = encode_record(record, self.keep_raw_text)
+        with self._lock:
+            self._drop(user_id)
+            self._entries[user_id] = (time.time() + self.ttl, data)
+            self._bytes += len(data)
+            dropped = self._expire()
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                evicted = next(iter(self._entries))
+                self._drop(evicted)
+                dropped.append(evicted)
+                self.evictions += 1
+        _notify_deleted(self, dropped)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._drop(user_id)
+        _notify_deleted(self, [user_id])
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+    def _drop(self, user_id):
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def _expire(self):
+        """Drop the expired records and return their user IDs."""
+        now = time.time()
+        expired = []
+        while self._entries:
+            user_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._drop(user_id)
+            expired.append(user_id)
+            self.expirations += 1
+        return expired
+
+
+class SQLSessionStore:
+    """Session store in a SQL database, shared by every worker process.
+
+    Reads only push the expiry forward once half of the TTL has passed, so
+    most page views do not turn into writes. Expired records are deleted by
+    the next write; on_delete is called with the user ID of every record
+    deleted or expired, by the worker that deleted it.
+    """
+
+    shared = True
+
+    def __init__(self, url, ttl=SESSION_TTL, keep_raw_text=SESSION_KEEP_RAW_TEXT, on_delete=None):
+        self.ttl = ttl
+        self.keep_raw_text = keep_raw_text
+        self.on_delete = on_delete
+        self.engine = create_engine(url)
+        metadata = MetaData()
+        self.table = Table(
+            'user_sessions', metadata,
+            Column('user_id', String(64), primary_key=True),
+            Column('data', LargeBinary, nullable=False),
+            Column('expires_at', Float, nullable=False, index=True)
+        )
+        metadata.create_all(self.engine)
+
+    def get(self, user_id):
+        data = self._read(user_id)
+        return _decode_or_drop(self, user_id, data) if data is not None else None
+
+    def version(self, user_id):
+        """Return the updated_at time of a user's record without decoding it, or None if absent or expired."""
+        data = self._read(user_id)
+        return record_version(data) if data is not None else None
+
+    def _read(self, user_id):
+        table = self.table
+        now = time.time()
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(table.c.data, table.c.expires_at)
+                .where(table.c.user_id == user_id)
+                .where(table.c.expires_at > now)
+            ).first()
+        if row is None:
+            return None
+
+        if row.expires_at - now < self.ttl / 2:
+            with self.engine.begin() as conn:
+                conn.execute(table.update().where(table.c.user_id == user_id).values(expires_at=now + self.ttl))
+        return row.data
+
+    def put(self, user_id, record):
+        values = {'data': encode_record(record, self.keep_raw_text), 'expires_at': time.time() + self.ttl}
+        table = self.table
+        expired = []
+        try:
+            with self.engine.begin() as conn:
+                expired = self._expire(conn)
+                updated = conn.execute(table.update().where(table.c.user_id == user_id).values(**values))
+                if updated.rowcount == 0:
+                    conn.execute(table.insert().values(user_id=user_id, **values))
+        except IntegrityError:
+            # Another worker inserted the same user first
+            with self.engine.begin() as conn:
+                conn.execute(table.update().where(table.c.user_id == user_id).values(**values))
+        _notify_deleted(self, expired)
+
+    def delete(self, user_id):
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.user_id == user_id))
+        _notify_deleted(self, [user_id])
+
+    def _expire(self, conn):
+        """Delete the expired records and return their user IDs.
+
+        Only rows this call deleted are returned, so a record another worker
+        refreshed in the meantime is neither deleted nor reported.
+        """
+        table = self.table
+        now = time.time()
+        expired = table.delete().where(table.c.expires_at <= now)
+        if self.engine.dialect.delete_returning:
+            return conn.execute(expired.returning(table.c.user_id)).scalars().all()
+        deleted = []
+        for user_id in conn.execute(select(table.c.user_id).where(table.c.expires_at <= now)).scalars().all():
+            if conn.execute(expired.where(table.c.user_id == user_id)).rowcount:
+                deleted.append(user_id)
+        return deleted
+
+    def stats(self):
+        with self.engine.connect() as conn:
+            entries, size = conn.execute(
+                select(func.count(), func.coalesce(func.sum(func.length(self.table.c.data)), 0))
+                .where(self.table.c.expires_at > time.time())
+            ).one()
+        return {
+            'backend': self.engine.dialect.name,
+            'entries': entries,
+            'bytes': int(size)
+        }
+
+
+def create_session_store(url=SESSION_STORE_URL, on_delete=None):
+    """Return the SQL store if a database URL is configured, else the memory store."""
+    if url:
+        store = SQLSessionStore(url, on_delete=on_delete)
+        logger.debug(f"Using {store.engine.dialect.name} session store")
+        return store
+    return MemorySessionStore(on_delete=on_delete)
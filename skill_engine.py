@@ -0,0 +1,117 @@
+import re
+import logging
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _trie_to_regex(node):
+    """Turn a character trie into a regex alternation with shared prefixes."""
+    end_here = '' in node
+    branches = []
+    for char in sorted(k for k in node if k != ''):
+        branches.append(re.escape(char) + _trie_to_regex(node[char]))
+
+    if not branches:
+        return ''
+
+    if len(branches) == 1 and not end_here:
+        return branches[0]
+
+    body = '(?:' + '|'.join(branches) + ')'
+    # Longer skills are tried first, the shorter one is the fallback
+    if end_here:
+        body += '?'
+    return body
+
+
+def build_automaton(surfaces):
+    """Compile skill spellings into (regex source, prefix table) for SkillScanner.
+
+    The prefix table maps every spelling to the shorter spellings that are a
+    prefix of it ('react' in 'react native'), longest first. Both are plain
+    data, so they can be stored in the taxonomy artifact and reused.
+    """
+    trie = {}
+    for surface in surfaces:
+        node = trie
+        for char in surface:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    prefixes = {}
+    for surface in surfaces:
+        node = trie
+        found = []
+        for i, char in enumerate(surface[:-1]):
+            node = node[char]
+            if '' in node:
+                found.append(surface[:i + 1])
+        if found:
+            prefixes[surface] = found[::-1]
+
+    return _trie_to_regex(trie), prefixes
+
+
+class SkillScanner:
+    """Find every skill of a taxonomy in a text with a single regex pass.
+
+    The skills are compiled once into a trie-shaped alternation, so the regex
+    engine walks shared prefixes only once per text position instead of
+    running one search per skill. Matches are case-insensitive and use
+    word-character lookarounds, so skills such as 'c++' or 'asp.net' match
+    the same way as plain words. Aliases ('golang') are reported under their
+    canonical skill ('go'). The regex is compiled on first use.
+    """
+
+    def __init__(self, skills, aliases=None, automaton=None):
+        self.skills = list(dict.fromkeys(skill.lower() for skill in skills if skill))
+
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        self._canonical = {skill: skill for skill in self.skills}
+        for alias, skill in (aliases or {}).items():
+            if skill.lower() in self._order:
+                self._canonical.setdefault(alias.lower(), skill.lower())
+
+        if automaton is None:
+            automaton = build_automaton(list(self._canonical))
+        self._source, self._prefixes = automaton
+        self._pattern = None
+
+    def compile(self):
+        """Compile the skill regex now instead of on the first scan."""
+        if self._pattern is None:
+            # The capture sits inside a lookahead so that skills starting at
+            # every position are reported, even when they overlap a previous match
+            self._pattern = re.compile(r'(?=(?<!\w)(' + self._source + r')(?!\w))', re.IGNORECASE)
+        return self._pattern
+
+    def finditer(self, text):
+        """Yield (skill, start, end) for every skill occurrence in text."""
+        for match in self.compile().finditer(text):
+            start = match.start(1)
+            surface = match.group(1).lower()
+            skill = self._canonical.get(surface)
+            if skill is None:
+                continue
+            yield skill, start, match.end(1)
+
+            # Shorter spellings that are a prefix of the match share its start
+            # offset and have to be checked apart
+            for prefix in self._prefixes.get(surface, ()):
+                end = start + len(prefix)
+                if self._canonical[prefix] != skill and not _WORD_CHAR.match(text, end):
+                    yield self._canonical[prefix], start, end
+
+    def find_all(self, text):
+        """Return a list of (skill, start, end) matches sorted by offset."""
+        return list(self.finditer(text))
+
+    def skills_in(self, text):
+        """Return the distinct skills found in text, in taxonomy order."""
+        found = {skill for skill, _, _ in self.finditer(text)}
+        return sorted(found, key=self._order.__getitem__)
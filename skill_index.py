@@ -0,0 +1,382 @@
+import json
+import logging
+import os
+import threading
+from array import array
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Without flock (Windows), only one process may use a persisted index
+    fcntl = None
+
+import numpy as np
+
+from batch_scoring import score_matrix
+from models import TAXONOMY_DIGEST
+from taxonomy import TAXONOMY
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Persist the index here, shared by every worker of the host (set to empty to keep it in memory only)
+SKILL_INDEX_PATH = os.environ.get('SKILL_INDEX_PATH',
+                                  os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'skill_index.bin'))
+
+# Rewrite posting lists once this fraction of documents has been removed
+COMPACT_RATIO = 0.5
+
+assert array('I').itemsize == 4
+
+
+def canonical_skill(skill):
+    """Return the key a skill is indexed under: its canonical taxonomy name, so aliases share a posting list."""
+    canonical = TAXONOMY.canonical(skill)
+    return (canonical if canonical is not None else skill).strip().lower()
+
+
+def _search_sorted(postings, doc_ids):
+    """Return a mask of the doc_ids that occur in a sorted posting list."""
+    if not len(postings):
+        return np.zeros(len(doc_ids), dtype=bool)
+    positions = np.searchsorted(postings, doc_ids)
+    positions[positions == len(postings)] = 0
+    return postings[positions] == doc_ids
+
+
+class SkillIndex:
+    """Inverted index from canonical skill to the resumes that list it.
+
+    Every added resume gets the next integer document ID, so posting lists
+    stay sorted by simply appending to compact array('I') buffers. Removing
+    a resume only clears its live flag; the posting lists are rewritten
+    once enough documents are dead. Queries run over zero-copy NumPy views
+    of the posting lists, starting from the shortest one.
+
+    With a path, the index is loaded from a snapshot plus an append-only
+    journal of add/remove operations, and every change is journaled. Several
+    processes, such as gunicorn workers, may share one path: a lock file
+    lets one of them write at a time, and each applies the entries the
+    others journaled before every read and write. Compacting rewrites the
+    snapshot and starts a new journal file, and the other processes reload
+    from it when they see the new file.
+    """
+
+    def __init__(self, path=SKILL_INDEX_PATH):
+        self.path = path
+        self._scratch = np.zeros(0, dtype=bool)
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_id = None
+        self._journal_offset = 0
+        self._lock_file = None
+        self._reset()
+
+        if self.path:
+            self._lock_file = open(self.path + '.lock', 'ab')
+            with self._file_lock(shared=True):
+                self._load()
+
+    def _reset(self):
+        self._postings = {}
+        self._keys = []
+        self._doc_skills = []
+        self._doc_ids = {}
+        self._live = bytearray()
+        self._removed = 0
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def add(self, key, skills):
+        """Index a resume under key, replacing any resume indexed before."""
+        with self._lock, self._file_lock():
+            self._sync()
+            self._add(key, skills)
+            self._log({'op': 'add', 'key': key, 'skills': list(skills)})
+            self._maybe_compact()
+
+    def remove(self, key):
+        """Drop the resume indexed under key, if any."""
+        with self._lock, self._file_lock():
+            self._sync()
+            if self._remove(key):
+                self._log({'op': 'remove', 'key': key})
+                self._maybe_compact()
+
+    def skills_of(self, key):
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            doc_id = self._doc_ids.get(key)
+            return list(self._doc_skills[doc_id]) if doc_id is not None else None
+
+    def query(self, all_of=(), any_of=(), none_of=()):
+        """Return the keys of resumes with all of, any of and none of the skills."""
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            return self._query_keys(all_of, any_of, none_of)
+
+    def _query_keys(self, all_of, any_of, none_of):
+        doc_ids = self._query_ids(
+            [canonical_skill(skill) for skill in all_of],
+            [canonical_skill(skill) for skill in any_of],
+            [canonical_skill(skill) for skill in none_of]
+        )
+        return [self._keys[doc_id] for doc_id in doc_ids]
+
+    def rank(self, job_skills, all_of=(), any_of=(), none_of=(), limit=None):
+        """Return (key, match_percentage) for matching resumes, best first."""
+        with self._lock, self._file_lock(shared=True):
+            self._sync()
+            keys = self._query_keys(all_of, any_of, none_of)
+            resumes = [self._doc_skills[self._doc_ids[key]] for key in keys]
+
+        if not keys:
+            return []
+
+        scores = score_matrix(resumes, [list(job_skills)])[:, 0]
+        order = np.argsort(-scores, kind='stable')
+        if limit is not None:
+            order = order[:limit]
+        return [(keys[i], float(scores[i])) for i in order]
+
+    def clear(self):
+        """Drop every resume, also for the other processes sharing the path."""
+        with self._lock, self._file_lock():
+            self._reset()
+            if self.path:
+                self._write_snapshot()
+
+    def compact(self):
+        """Drop removed documents, renumbering the others, and rewrite the snapshot."""
+        with self._lock, self._file_lock():
+            self._sync()
+            self._compact()
+
+    def _compact(self):
+        live = np.frombuffer(self._live, dtype=bool)
+        new_ids = (np.cumsum(live) - 1).astype(np.uint32)
+        for skill in list(self._postings):
+            postings = np.frombuffer(self._postings[skill], dtype=np.uint32)
+            kept = postings[live[postings]]
+            del postings
+            if len(kept):
+                # new_ids is increasing over live documents, so the lists stay sorted
+                self._postings[skill] = array('I', new_ids[kept].tobytes())
+            else:
+                del self._postings[skill]
+        del live
+
+        kept_ids = [doc_id for doc_id in range(len(self._keys)) if self._live[doc_id]]
+        self._keys = [self._keys[doc_id] for doc_id in kept_ids]
+        self._doc_skills = [self._doc_skills[doc_id] for doc_id in kept_ids]
+        self._doc_ids = {key: doc_id for doc_id, key in enumerate(self._keys)}
+        self._live = bytearray(b'\x01') * len(self._keys)
+        self._removed = 0
+
+        if self.path:
+            self._write_snapshot()
+
+    def _add(self, key, skills):
+        self._remove(key)
+        doc_id = len(self._keys)
+        skills = tuple(dict.fromkeys(canonical_skill(skill) for skill in skills))
+
+        self._keys.append(key)
+        self._doc_skills.append(skills)
+        self._doc_ids[key] = doc_id
+        self._live.append(1)
+        for skill in skills:
+            self._postings.setdefault(skill, array('I')).append(doc_id)
+
+    def _remove(self, key):
+        doc_id = self._doc_ids.pop(key, None)
+        if doc_id is None:
+            return False
+
+        self._live[doc_id] = 0
+        self._doc_skills[doc_id] = ()
+        self._removed += 1
+        return True
+
+    def _maybe_compact(self):
+        if self._removed > COMPACT_RATIO * len(self._keys):
+            self._compact()
+
+    def _posting_array(self, skill):
+        postings = self._postings.get(skill)
+        if postings is None:
+            return np.empty(0, dtype=np.uint32)
+        return np.frombuffer(postings, dtype=np.uint32)
+
+    def _scratch_mask(self):
+        """Return an all-False bitmap over every document ID, reused across queries."""
+        if len(self._scratch) < len(self._keys):
+            self._scratch = np.zeros(max(1024, 2 * len(self._keys)), dtype=bool)
+        return self._scratch
+
+    def _contains(self, postings, doc_ids):
+        """Return a mask of the doc_ids that occur in a posting list."""
+        # Binary search wins when the candidates are few, otherwise scatter
+        # the posting list into the bitmap and gather the candidates
+        if len(doc_ids) * 16 < len(postings):
+            return _search_sorted(postings, doc_ids)
+        scratch = self._scratch_mask()
+        scratch[postings] = True
+        mask = scratch[doc_ids]
+        scratch[postings] = False
+        return mask
+
+    def _query_ids(self, all_of, any_of, none_of):
+        live = np.frombuffer(self._live, dtype=bool)
+
+        if all_of:
+            lists = sorted((self._posting_array(skill) for skill in all_of), key=len)
+            doc_ids = lists[0].copy()
+            for postings in lists[1:]:
+                doc_ids = doc_ids[self._contains(postings, doc_ids)]
+        elif any_of:
+            scratch = self._scratch_mask()
+            for skill in any_of:
+                scratch[self._posting_array(skill)] = True
+            doc_ids = np.flatnonzero(scratch).astype(np.uint32)
+            scratch[doc_ids] = False
+        else:
+            doc_ids = np.flatnonzero(live).astype(np.uint32)
+
+        if all_of and any_of:
+            mask = np.zeros(len(doc_ids), dtype=bool)
+            for skill in any_of:
+                mask |= self._contains(self._posting_array(skill), doc_ids)
+            doc_ids = doc_ids[mask]
+
+        for skill in none_of:
+            doc_ids = doc_ids[~self._contains(self._posting_array(skill), doc_ids)]
+
+        return doc_ids[live[doc_ids]].tolist()
+
+    @contextmanager
+    def _file_lock(self, shared=False):
+        """Hold the lock file shared, to read, or exclusive, to write; a no-op without a path."""
+        if self._lock_file is None or fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _journal_path(self):
+        return self.path + '.journal'
+
+    def _sync(self):
+        """Apply what other processes journaled since the last sync, reloading if one compacted."""
+        if not self.path:
+            return
+        try:
+            stat = os.stat(self._journal_path())
+        except FileNotFoundError:
+            stat = None
+        if stat is None or (stat.st_dev, stat.st_ino) != self._journal_id:
+            self._reset()
+            self._load()
+        elif stat.st_size > self._journal_offset:
+            self._replay()
+
+    def _log(self, entry):
+        if self._journal is None:
+            return
+        line = json.dumps(entry).encode('utf-8') + b'\n'
+        size = os.fstat(self._journal.fileno()).st_size
+        if size > self._journal_offset:
+            # A writer that crashed left a partial line; end it, so it is skipped as corrupt
+            line = b'\n' + line
+        self._journal.write(line)
+        self._journal.flush()
+        self._journal_offset = size + len(line)
+
+    def _write_snapshot(self):
+        """Write the documents and posting lists, then start a new journal file."""
+        skills = sorted(self._postings)
+        header = {
+            'taxonomy': TAXONOMY_DIGEST.hex(),
+            'keys': self._keys,
+            'live': [doc_id for doc_id in range(len(self._keys)) if self._live[doc_id]],
+            'doc_skills': [list(skills_) for skills_ in self._doc_skills],
+            'postings': [[skill, len(self._postings[skill])] for skill in skills]
+        }
+
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            file.write(json.dumps(header).encode('utf-8') + b'\n')
+            for skill in skills:
+                self._postings[skill].tofile(file)
+        os.replace(tmp_path, self.path)
+
+        # A new file rather than a truncated one, so other processes notice and reload
+        open(tmp_path, 'wb').close()
+        os.replace(tmp_path, self._journal_path())
+        self._open_journal()
+
+    def _open_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self._journal_path(), 'ab')
+        stat = os.fstat(self._journal.fileno())
+        self._journal_id = (stat.st_dev, stat.st_ino)
+        self._journal_offset = 0
+
+    def _replay(self):
+        """Apply the complete journal lines past the last offset read."""
+        journal_path = self._journal_path()
+        with open(journal_path, 'rb') as file:
+            file.seek(self._journal_offset)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash can leave a partial line behind
+                logger.warning(f"Skipping corrupt skill index journal line in {journal_path}")
+                continue
+            if entry['op'] == 'add':
+                self._add(entry['key'], entry['skills'])
+            else:
+                self._remove(entry['key'])
+        self._journal_offset += end
+
+    def _reindex(self):
+        """Index the live documents again, after a taxonomy change that may map aliases to other skills."""
+        documents = [(key, self._doc_skills[doc_id]) for key, doc_id in self._doc_ids.items()]
+        self._reset()
+        for key, skills in documents:
+            self._add(key, skills)
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as file:
+                header = json.loads(file.readline())
+                for skill, count in header['postings']:
+                    postings = array('I')
+                    postings.fromfile(file, count)
+                    self._postings[skill] = postings
+
+            self._keys = header['keys']
+            self._doc_skills = [tuple(skills) for skills in header['doc_skills']]
+            self._live = bytearray(len(self._keys))
+            for doc_id in header['live']:
+                self._live[doc_id] = 1
+                self._doc_ids[self._keys[doc_id]] = doc_id
+            self._removed = len(self._keys) - len(self._doc_ids)
+            if header.get('taxonomy') != TAXONOMY_DIGEST.hex():
+                self._reindex()
+
+        self._open_journal()
+        self._replay()
+        logger.debug(f"Loaded skill index with {len(self._doc_ids)} resumes from {self.path}")
@@ -1,80 +1,125 @@
+import heapq
 import logging
-import nltk
-from nltk.corpus import wordnet
+import os
 import random
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from nlp_resources import wordnet
+from taxonomy import TAXONOMY
+from metrics import METRICS
+from models import SkillGapAnalysis, SkillSet
+from tenure import score_experience
+from timing import StageTimer
 
 # Setup logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Download NLTK data if not already present
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
-
-# Dictionary of related skills
-RELATED_SKILLS = {
-    'python': ['django', 'flask', 'fastapi', 'pandas', 'numpy', 'scikit-learn', 'tensorflow'],
-    'java': ['spring', 'hibernate', 'maven', 'gradle', 'junit', 'j2ee'],
-    'javascript': ['typescript', 'react', 'angular', 'vue', 'node', 'express', 'jquery'],
-    'typescript': ['javascript', 'angular', 'react', 'node'],
-    'c++': ['c', 'stl', 'boost', 'qt', 'unreal engine'],
-    'c#': ['.net', 'asp.net', 'entity framework', 'xamarin'],
-    'sql': ['mysql', 'postgresql', 'oracle', 'sql server', 'sqlite'],
-    'html': ['css', 'javascript', 'bootstrap', 'sass', 'less'],
-    'css': ['html', 'sass', 'less', 'bootstrap', 'tailwind'],
-    'react': ['javascript', 'typescript', 'redux', 'nextjs', 'webpack'],
-    'angular': ['typescript', 'rxjs', 'ngrx'],
-    'vue': ['javascript', 'vuex', 'nuxt'],
-    'node': ['javascript', 'express', 'nestjs', 'npm'],
-    'aws': ['ec2', 's3', 'lambda', 'cloudformation', 'dynamodb'],
-    'azure': ['azure functions', 'azure storage', 'azure devops'],
-    'gcp': ['google cloud functions', 'google cloud storage', 'bigquery'],
-    'docker': ['kubernetes', 'containerization', 'docker-compose'],
-    'machine learning': ['deep learning', 'tensorflow', 'pytorch', 'scikit-learn', 'nlp'],
-    'agile': ['scrum', 'kanban', 'jira'],
-    'git': ['github', 'gitlab', 'bitbucket']
-}
-
-# Resources for learning skills
-LEARNING_RESOURCES = {
-    'python': [
-        {'name': 'Python Official Documentation', 'url': 'https://docs.python.org/3/'},
-        {'name': 'Codecademy Python Course', 'url': 'https://www.codecademy.com/learn/learn-python-3'},
-        {'name': 'Coursera Python for Everybody', 'url': 'https://www.coursera.org/specializations/python'}
-    ],
-    'java': [
-        {'name': 'Oracle Java Tutorial', 'url': 'https://docs.oracle.com/javase/tutorial/'},
-        {'name': 'Codecademy Java Course', 'url': 'https://www.codecademy.com/learn/learn-java'},
-        {'name': 'Coursera Java Programming', 'url': 'https://www.coursera.org/specializations/java-programming'}
-    ],
-    'javascript': [
-        {'name': 'Mozilla JavaScript Guide', 'url': 'https://developer.mozilla.org/en-US/docs/Web/JavaScript/Guide'},
-        {'name': 'Codecademy JavaScript Course', 'url': 'https://www.codecademy.com/learn/introduction-to-javascript'},
-        {'name': 'freeCodeCamp JavaScript Algorithms', 'url': 'https://www.freecodecamp.org/learn/javascript-algorithms-and-data-structures/'}
-    ],
-    'html': [
-        {'name': 'Mozilla HTML Guide', 'url': 'https://developer.mozilla.org/en-US/docs/Web/HTML'},
-        {'name': 'W3Schools HTML Tutorial', 'url': 'https://www.w3schools.com/html/'},
-        {'name': 'Codecademy HTML Course', 'url': 'https://www.codecademy.com/learn/learn-html'}
-    ],
-    'css': [
-        {'name': 'Mozilla CSS Guide', 'url': 'https://developer.mozilla.org/en-US/docs/Web/CSS'},
-        {'name': 'W3Schools CSS Tutorial', 'url': 'https://www.w3schools.com/css/'},
-        {'name': 'Codecademy CSS Course', 'url': 'https://www.codecademy.com/learn/learn-css'}
-    ],
-    'sql': [
-        {'name': 'W3Schools SQL Tutorial', 'url': 'https://www.w3schools.com/sql/'},
-        {'name': 'Codecademy SQL Course', 'url': 'https://www.codecademy.com/learn/learn-sql'},
-        {'name': 'Khan Academy SQL Course', 'url': 'https://www.khanacademy.org/computing/computer-programming/sql'}
-    ],
-    'react': [
-        {'name': 'React Official Documentation', 'url': 'https://reactjs.org/docs/getting-started.html'},
-        {'name': 'Codecademy React Course', 'url': 'https://www.codecademy.com/learn/react-101'},
-        {'name': 'React Tutorial on freeCodeCamp', 'url': 'https://www.freecodecamp.org/learn/front-end-libraries/react/'}
-    ],
-}
+# Weeks to learn a skill that has no estimate in the taxonomy
+DEFAULT_LEARNING_WEEKS = 4
+
+# Upper bound on WordNet lookups cached for skills outside the taxonomy
+SIMILARITY_CACHE_SIZE = 4096
+
+# Fraction of a skill's weeks it takes to learn next to a related skill already known
+RELATED_DISCOUNT = float(os.environ.get('RELATED_DISCOUNT', 0.5))
+
+# Weight of a preferred skill in the match percentage, against 1 for a required
+# one; 0 scores the required skills alone
+PREFERRED_SKILL_WEIGHT = float(os.environ.get('PREFERRED_SKILL_WEIGHT', 0.5))
+
+WORDNET_SECONDS = METRICS.histogram('wordnet_lookup_seconds', 'Time spent in WordNet synset lookups.')
+
+def _wordnet_lemmas(skill):
+    """Collect the WordNet lemma names of every synset of a skill."""
+    start = time.perf_counter()
+    try:
+        return frozenset(lemma.name() for syn in wordnet().synsets(skill) for lemma in syn.lemmas())
+    except:
+        # If wordnet lookup fails, just skip this check
+        return frozenset()
+    finally:
+        WORDNET_SECONDS.observe(time.perf_counter() - start)
+
+@lru_cache(maxsize=SIMILARITY_CACHE_SIZE)
+def _cached_wordnet_lemmas(skill):
+    """WordNet lemmas for user-supplied skills, bounded by an LRU cache."""
+    return _wordnet_lemmas(skill)
+
+METRICS.callback(
+    'wordnet_cache_lookups_total', 'WordNet lookups of skills outside the taxonomy, by cache result.',
+    lambda: {('hit',): _cached_wordnet_lemmas.cache_info().hits, ('miss',): _cached_wordnet_lemmas.cache_info().misses},
+    kind='counter', labels=('result',)
+)
+
+def _is_close_substring(skill1, skill2):
+    """Check if one skill contains the other with only a small difference."""
+    skill1_lower = skill1.lower()
+    skill2_lower = skill2.lower()
+    if skill1_lower in skill2_lower or skill2_lower in skill1_lower:
+        # Only consider it a match if the difference is small
+        # (e.g., "java" vs "javascript" should not match)
+        len_diff = abs(len(skill1) - len(skill2))
+        if len_diff < 3 or len_diff / max(len(skill1), len(skill2)) < 0.3:
+            return True
+    return False
+
+class SkillSimilarityIndex:
+    """Precomputed lookups behind is_similar_skill.
+
+    Skill IDs and the symmetric related-skill adjacency come from the shared
+    taxonomy, where aliases resolve to the ID of their canonical skill, and
+    is read from its CSR arrays rather than copied per skill.
+    WordNet lemmas for the taxonomy are read once, on first use, and skills
+    outside the taxonomy go through a bounded LRU cache.
+    """
+
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self.skills = taxonomy.skills()
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+        self._alias_ids = {alias: self.skill_ids[skill] for alias, skill in taxonomy.aliases().items()}
+
+        self._lemmas = None
+
+    def skill_id(self, skill):
+        """Return the canonical ID of a skill or alias, or None if it is unknown."""
+        skill = skill.lower()
+        skill_id = self.skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = self._alias_ids.get(skill)
+        return skill_id
+
+    def related(self, skill):
+        """Return the IDs of the skills related to a skill."""
+        skill_id = self.skill_id(skill)
+        if skill_id is None:
+            return []
+        return self.taxonomy.similar_ids(skill_id).tolist()
+
+    def near(self, skill_id, ids):
+        """Whether a set of skill IDs holds a skill or one of its related skills."""
+        return skill_id in ids or not ids.isdisjoint(self.taxonomy.similar_ids(skill_id).tolist())
+
+    def preload(self):
+        """Read the WordNet lemmas of every taxonomy skill now."""
+        if self._lemmas is None:
+            self._lemmas = [_wordnet_lemmas(name) for name in self.skills]
+
+    def lemmas(self, skill):
+        """Return the WordNet lemma names of a skill."""
+        if self._lemmas is None:
+            self.preload()
+
+        skill_id = self.skill_id(skill)
+        if skill_id is None:
+            return _cached_wordnet_lemmas(skill.lower())
+        return self._lemmas[skill_id]
+
+SIMILARITY_INDEX = SkillSimilarityIndex(TAXONOMY)
 
 def is_similar_skill(skill1, skill2):
     """Check if two skills are similar."""
@@ -83,51 +128,107 @@ def is_similar_skill(skill1, skill2):
         return True
     
     # Check if one is a substring of the other
-    if skill1.lower() in skill2.lower() or skill2.lower() in skill1.lower():
-        # Only consider it a match if the difference is small
-        # (e.g., "java" vs "javascript" should not match)
-        len_diff = abs(len(skill1) - len(skill2))
-        if len_diff < 3 or len_diff / max(len(skill1), len(skill2)) < 0.3:
-            return True
-    
-    # Check if they're related in our predefined dictionary
-    if skill1.lower() in RELATED_SKILLS and skill2.lower() in RELATED_SKILLS[skill1.lower()]:
-        return True
-    if skill2.lower() in RELATED_SKILLS and skill1.lower() in RELATED_SKILLS[skill2.lower()]:
+    if _is_close_substring(skill1, skill2):
         return True
     
-    # If wordnet is available, check for synonyms
-    try:
-        skill1_syns = wordnet.synsets(skill1)
-        skill2_syns = wordnet.synsets(skill2)
-        
-        # Check for shared lemmas
-        skill1_lemmas = set(lemma.name() for syn in skill1_syns for lemma in syn.lemmas())
-        skill2_lemmas = set(lemma.name() for syn in skill2_syns for lemma in syn.lemmas())
-        
-        if skill1_lemmas.intersection(skill2_lemmas):
+    # Check if they're aliases of one skill or related in the taxonomy
+    skill2_id = SIMILARITY_INDEX.skill_id(skill2)
+    if skill2_id is not None:
+        if skill2_id == SIMILARITY_INDEX.skill_id(skill1) or skill2_id in SIMILARITY_INDEX.related(skill1):
             return True
-    except:
-        # If wordnet lookup fails, just skip this check
-        pass
     
-    return False
+    # Check for shared WordNet lemmas
+    return not SIMILARITY_INDEX.lemmas(skill1).isdisjoint(SIMILARITY_INDEX.lemmas(skill2))
 
-def match_skills(resume_skills, job_skills):
-    """Match skills between resume and job requirements."""
+class ResumeSkillIndex:
+    """A resume's skills, indexed once for matching and gap analysis.
+
+    Besides the names, it keeps inverted maps from skill ID and WordNet
+    lemma to the positions of the resume skills, so the resume skills
+    similar to a job skill or one of its related skills are looked up rather
+    than compared one by one. Lookups of related skills are memoized, since
+    missing skills often share them.
+    """
+
+    def __init__(self, resume_skills):
+        self.names = list(resume_skills)
+        self.lower = [skill.lower() for skill in self.names]
+        self.name_set = set(self.lower)
+        self.by_id = {}
+        self.by_lemma = {}
+        for position, skill in enumerate(self.names):
+            skill_id = SIMILARITY_INDEX.skill_id(skill)
+            if skill_id is not None:
+                self.by_id.setdefault(skill_id, []).append(position)
+            for lemma in SIMILARITY_INDEX.lemmas(skill):
+                self.by_lemma.setdefault(lemma, []).append(position)
+        self._similar = {}
+
+    def _substrings(self, skill):
+        """Positions of the resume skills that _is_close_substring pairs with skill."""
+        lower = skill.lower()
+        return [position for position, name in enumerate(self.lower)
+                if (lower in name or name in lower) and _is_close_substring(skill, self.names[position])]
+
+    def matches(self, skill):
+        """Whether some resume skill satisfies a job skill, by the rules of match_skills."""
+        skill_id = SIMILARITY_INDEX.skill_id(skill)
+        return bool(
+            skill.lower() in self.name_set
+            or skill_id is not None and SIMILARITY_INDEX.near(skill_id, self.by_id.keys())
+            or not SIMILARITY_INDEX.lemmas(skill).isdisjoint(self.by_lemma)
+            or self._substrings(skill)
+        )
+
+    def similar_to(self, skill):
+        """The resume skills that is_similar_skill pairs with skill, in resume order."""
+        similar = self._similar.get(skill)
+        if similar is not None:
+            return similar
+        positions = set(self._substrings(skill))
+        lower = skill.lower()
+        positions.update(position for position, name in enumerate(self.lower) if name == lower)
+        skill_id = SIMILARITY_INDEX.skill_id(skill)
+        if skill_id is not None and SIMILARITY_INDEX.near(skill_id, self.by_id.keys()):
+            positions.update(self.by_id.get(skill_id, ()))
+            for related_id in SIMILARITY_INDEX.related(skill):
+                positions.update(self.by_id.get(related_id, ()))
+        for lemma in SIMILARITY_INDEX.lemmas(skill):
+            positions.update(self.by_lemma.get(lemma, ()))
+        similar = [self.names[position] for position in sorted(positions)]
+        self._similar[skill] = similar
+        return similar
+
+    def gap(self, skill, importance=None):
+        """The gap entry of a missing skill, with the resume skills similar to those related to it."""
+        related_resume_skills = []
+        for related in TAXONOMY.related_skills(skill):
+            related_resume_skills.extend(self.similar_to(related))
+        if importance is None:
+            importance = "high" if len(related_resume_skills) == 0 else "medium"
+        return {
+            'skill': skill,
+            'importance': importance,
+            'related_skills': related_resume_skills
+        }
+
+def _split_matches(index, job_skills):
+    """Split job skills into those the indexed resume satisfies and those it misses, keeping their order."""
     matching_skills = []
     missing_skills = []
-    
     for job_skill in job_skills:
-        matched = False
-        for resume_skill in resume_skills:
-            if is_similar_skill(job_skill, resume_skill):
-                matching_skills.append(job_skill)
-                matched = True
-                break
-        
-        if not matched:
+        if index.matches(job_skill):
+            matching_skills.append(job_skill)
+        else:
             missing_skills.append(job_skill)
+    return matching_skills, missing_skills
+
+def match_skills(resume_skills, job_skills):
+    """Match skills between resume and job requirements, given as SkillSets or lists of names."""
+    # Index the resume once, then each job skill costs a few bit tests and set lookups
+    index = ResumeSkillIndex(SkillSet.from_names(resume_skills).names())
+    job_skills = list(job_skills)
+    matching_skills, missing_skills = _split_matches(index, job_skills)
     
     # Calculate match percentage
     if not job_skills:
@@ -139,101 +240,198 @@ def match_skills(resume_skills, job_skills):
 
 def calculate_skill_gaps(resume_skills, job_skills):
     """Calculate the skill gaps between resume and job requirements."""
-    _, matching_skills, missing_skills = match_skills(resume_skills, job_skills)
-    
-    # For each missing skill, determine the relevance
-    skill_gaps = []
+    resume_skills = list(resume_skills)
+    _, _, missing_skills = match_skills(resume_skills, job_skills)
     
-    for skill in missing_skills:
-        # Determine if there are any related skills on the resume
-        related_resume_skills = []
-        skill_lower = skill.lower()
-        
-        # Check if the missing skill has related skills defined
-        if skill_lower in RELATED_SKILLS:
-            related_skills = RELATED_SKILLS[skill_lower]
-            # Check if any of the related skills are in the resume
-            for related in related_skills:
-                for resume_skill in resume_skills:
-                    if is_similar_skill(related, resume_skill):
-                        related_resume_skills.append(resume_skill)
-        
-        # Determine importance (right now just a placeholder)
-        importance = "high" if len(related_resume_skills) == 0 else "medium"
-        
-        skill_gaps.append({
-            'skill': skill,
-            'importance': importance,
-            'related_skills': related_resume_skills
-        })
-    
-    return skill_gaps
+    # A missing skill is less important to fill when the resume has skills related to it
+    index = ResumeSkillIndex(resume_skills)
+    return [index.gap(skill) for skill in missing_skills]
 
-def get_recommendations(missing_skills):
-    """Get recommendations for learning missing skills."""
-    recommendations = []
-    
-    for skill in missing_skills:
-        skill_lower = skill.lower()
-        
-        # Find learning resources
-        resources = LEARNING_RESOURCES.get(skill_lower, [])
-        
-        # If no specific resources, provide general resources
-        if not resources:
-            resources = [
-                {'name': f'Search "{skill} tutorial" on YouTube', 'url': f'https://www.youtube.com/results?search_query={skill}+tutorial'},
-                {'name': f'Take an online course on Coursera, Udemy, or edX', 'url': f'https://www.coursera.org/search?query={skill}'},
-                {'name': f'Find projects on GitHub to practice', 'url': f'https://github.com/search?q={skill}+project'}
-            ]
-        
-        # Find related skills that might be easier to learn first
-        related = RELATED_SKILLS.get(skill_lower, [])
-        
-        # Create a recommendation
-        recommendation = {
+def _general_resources(skill):
+    """Search links for a skill with no curated resources."""
+    return [
+        {'name': f'Search "{skill} tutorial" on YouTube', 'url': f'https://www.youtube.com/results?search_query={skill}+tutorial'},
+        {'name': f'Take an online course on Coursera, Udemy, or edX', 'url': f'https://www.coursera.org/search?query={skill}'},
+        {'name': f'Find projects on GitHub to practice', 'url': f'https://github.com/search?q={skill}+project'}
+    ]
+
+@lru_cache(maxsize=256)
+def _weeks_range(weeks):
+    """Format an estimate in weeks as a range (e.g., "4-6 weeks")."""
+    weeks = max(1, int(round(weeks)))
+    return f"{weeks}-{int(weeks * 1.5)} weeks"
+
+# Missing skills whose searched learning paths, and skills whose recommendation payloads, are kept
+LEARNING_PATH_CACHE_SIZE = int(os.environ.get('LEARNING_PATH_CACHE_SIZE', SIMILARITY_CACHE_SIZE))
+
+class LearningPathPlanner:
+    """Shortest learning paths over the related-skills graph of the taxonomy.
+
+    Learning a skill from scratch costs its estimated weeks, and learning it
+    next to a skill already known costs RELATED_DISCOUNT of that. The
+    cheapest way to a missing skill either starts from a resume skill or
+    from scratch, at whichever skill makes the total smallest. Paths are
+    searched backwards from each missing skill when it is first asked for,
+    and only as far as learning it from scratch costs, since no longer path
+    can win; searches and recommendation payloads are kept in LRU caches.
+    """
+
+    def __init__(self, index, cache_size=LEARNING_PATH_CACHE_SIZE):
+        self.index = index
+        self.taxonomy = index.taxonomy
+        self.weeks = None
+        self._search = lru_cache(maxsize=cache_size)(self._search_to)
+        self._payload = lru_cache(maxsize=cache_size)(self._make_payload)
+
+    def preload(self):
+        """Read the estimated weeks of every skill now."""
+        if self.weeks is None:
+            self.weeks = [float(self.taxonomy.learning_weeks(name) or DEFAULT_LEARNING_WEEKS)
+                          for name in self.index.skills]
+
+    def _search_to(self, target):
+        """Return {skill ID: (weeks from it to target, next skill ID)} for skills that could start its path.
+
+        Dijkstra from the target along related skills, whose links go both
+        ways; a step towards the target costs a discounted learning of the
+        skill stepped to. The target itself is at 0 weeks, with no next step.
+        """
+        weeks = self.weeks
+        limit = weeks[target]
+        reach = {}
+        heap = [(0.0, target, -1)]
+        while heap:
+            distance, skill_id, step = heapq.heappop(heap)
+            if skill_id in reach:
+                continue
+            reach[skill_id] = (distance, step)
+            candidate = distance + weeks[skill_id] * RELATED_DISCOUNT
+            if candidate >= limit:
+                continue
+            for neighbour in self.taxonomy.similar_ids(skill_id).tolist():
+                if neighbour not in reach:
+                    heapq.heappush(heap, (candidate, neighbour, skill_id))
+        return reach
+
+    def _make_payload(self, skill_id):
+        skill = self.index.skills[skill_id]
+        resources = self.taxonomy.learning_resources(skill) or _general_resources(skill)
+        return {
             'skill': skill,
             'resources': resources,
-            'related_skills': related[:3] if related else [],
+            'related_skills': self.taxonomy.related_skills(skill)[:3],
             'estimated_time': estimate_learning_time(skill)
         }
-        
+
+    def _path(self, reach, source):
+        """Skill names to learn, in order, on the searched path from source, source excluded."""
+        path = []
+        step = reach[source][1]
+        while step >= 0:
+            path.append(self.index.skills[step])
+            step = reach[step][1]
+        return path
+
+    def plan(self, resume_skills, missing_skills):
+        """Return (payload, [skills to learn in order], weeks) for each missing skill."""
+        self.preload()
+        known = {skill_id for skill_id in map(self.index.skill_id, resume_skills) if skill_id is not None}
+        plans = []
+        for skill in missing_skills:
+            skill_id = self.index.skill_id(skill)
+            if skill_id is None:
+                plans.append((_unknown_skill_payload(skill), [skill], float(DEFAULT_LEARNING_WEEKS)))
+                continue
+            reach = self._search(skill_id)
+
+            # From scratch: learn some skill in full, then follow related skills from it
+            start = min(reach, key=lambda source: (self.weeks[source] + reach[source][0], source))
+            best_weeks = self.weeks[start] + reach[start][0]
+            path = [self.index.skills[start]] + self._path(reach, start)
+            nearest = min(known.intersection(reach), key=lambda source: (reach[source][0], source), default=None)
+            if nearest is not None and reach[nearest][0] < best_weeks:
+                best_weeks = reach[nearest][0]
+                path = self._path(reach, nearest) or [skill]
+
+            # Keep the job's spelling of the skill at the end of its path
+            if path[-1] != skill:
+                path = path[:-1] + [skill]
+            plans.append((self._payload(skill_id), path, round(best_weeks, 1)))
+        return plans
+
+LEARNING_PLANNER = LearningPathPlanner(SIMILARITY_INDEX)
+
+@lru_cache(maxsize=SIMILARITY_CACHE_SIZE)
+def _unknown_skill_payload(skill):
+    """Recommendation for a skill outside the taxonomy, bounded by an LRU cache."""
+    return {
+        'skill': skill,
+        'resources': _general_resources(skill),
+        'related_skills': [],
+        'estimated_time': estimate_learning_time(skill)
+    }
+
+def get_recommendations(missing_skills, resume_skills=()):
+    """Get recommendations for learning missing skills, quickest first.
+
+    Each recommendation has a learning path: the skills to learn in order,
+    ending with the missing skill, starting next to a resume skill when one
+    is related, and the total estimated weeks along it.
+    """
+    recommendations = []
+    for payload, path, weeks in LEARNING_PLANNER.plan(resume_skills, missing_skills):
+        recommendation = dict(payload)
+        recommendation['skill'] = path[-1]
+        recommendation['learning_path'] = path
+        recommendation['total_weeks'] = weeks
+        recommendation['total_time'] = _weeks_range(weeks)
         recommendations.append(recommendation)
-    
+
+    # Stable, so skills with equal estimates keep the job's order
+    recommendations.sort(key=lambda recommendation: recommendation['total_weeks'])
     return recommendations
 
 def estimate_learning_time(skill):
     """Estimate the time required to learn a skill to a basic level."""
-    # These are rough estimates in weeks
-    skill_difficulty = {
-        'python': 4,
-        'java': 6,
-        'javascript': 4,
-        'typescript': 3,
-        'html': 2,
-        'css': 3,
-        'react': 4,
-        'angular': 5,
-        'vue': 4,
-        'node': 4,
-        'sql': 3,
-        'mongodb': 2,
-        'aws': 6,
-        'azure': 6,
-        'gcp': 6,
-        'docker': 3,
-        'kubernetes': 5,
-        'git': 1,
-        'agile': 2,
-        'machine learning': 8,
-        'deep learning': 10
-    }
-    
-    skill_lower = skill.lower()
-    
-    # Default to 4 weeks if not in our dictionary
-    weeks = skill_difficulty.get(skill_lower, 4)
-    
-    # Generate a range (e.g., "4-6 weeks")
-    upper_bound = int(weeks * 1.5)
-    return f"{weeks}-{upper_bound} weeks"
+    # These are rough estimates in weeks, defaulting when the taxonomy has none
+    return _weeks_range(TAXONOMY.learning_weeks(skill) or DEFAULT_LEARNING_WEEKS)
+
+def analyze_skill_gaps(resume, job, preferred_weight=PREFERRED_SKILL_WEIGHT):
+    """Match a Resume against a JobDescription and return the SkillGapAnalysis.
+
+    The resume is indexed once, and the required and preferred skills of the
+    job are matched, their gaps found and the missing required skills
+    planned against that one index. Preferred skills count preferred_weight
+    of a required one in the match percentage; a missing one is a low
+    importance gap and gets no recommendation.
+    """
+    timer = StageTimer(pipeline='skill_gaps')
+    resume_skills = resume.skills
+    job_skills = job.required_skills
+    preferred_skills = job.preferred_skills
+    with timer.stage('match'):
+        index = ResumeSkillIndex(resume_skills)
+        matching_skills, missing_skills = _split_matches(index, job_skills)
+        matching_preferred, missing_preferred = _split_matches(index, preferred_skills)
+        weight = preferred_weight if preferred_skills else 0
+        total = len(job_skills) + weight * len(preferred_skills)
+        if total:
+            match_percentage = (len(matching_skills) + weight * len(matching_preferred)) / total * 100
+        else:
+            match_percentage = 0
+    with timer.stage('skill_gaps'):
+        skill_gaps = [index.gap(skill) for skill in missing_skills]
+        skill_gaps.extend(index.gap(skill, importance="low") for skill in missing_preferred)
+    with timer.stage('recommendations'):
+        recommendations = get_recommendations(missing_skills, resume_skills)
+    return SkillGapAnalysis(
+        job=job,
+        match_percentage=match_percentage,
+        matching_skills=matching_skills,
+        missing_skills=missing_skills,
+        skill_gaps=skill_gaps,
+        recommendations=recommendations,
+        experience_fit=score_experience(resume.total_experience_years, job.experience_req),
+        matching_preferred_skills=matching_preferred,
+        missing_preferred_skills=missing_preferred
+    )
@@ -0,0 +1,267 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import traceback
+import uuid
+
+from resume_parser import parse_resume
+from job_analyzer import analyze_job_description
+from skill_matcher import analyze_skill_gaps
+from models import Resume, SkillGapAnalysis, pack_parts, unpack_parts
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# Tasks run at the same time, tasks waiting before submissions are refused,
+# seconds a task may run before it is killed, and seconds results are kept
+TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 2))
+TASK_QUEUE_SIZE = int(os.environ.get('TASK_QUEUE_SIZE', 32))
+TASK_TIMEOUT = float(os.environ.get('TASK_TIMEOUT', 60))
+TASK_RESULT_TTL = float(os.environ.get('TASK_RESULT_TTL', 600))
+
+# Directory of task records, shared by every worker of the host so any of them can answer a poll
+TASK_DIR = os.environ.get('TASK_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'tasks'))
+
+# Seconds between scans of TASK_DIR for expired records
+TASK_PRUNE_INTERVAL = 60
+
+# Model each kind of task returns, to decode its stored result
+RESULT_TYPES = {'parse_resume_task': Resume, 'analyze_job_task': SkillGapAnalysis}
+
+FINISHED = ('done', 'failed', 'timeout')
+TASK_ID = re.compile(r'[0-9a-f]{32}')
+
+# Imported once by the fork server, so each task process starts warm
+PRELOAD_MODULES = ['resume_parser', 'job_analyzer', 'skill_matcher', 'task_queue', 'job_comparison']
+
+
+class QueueFull(Exception):
+    """Raised when a task is submitted while the queue is at capacity."""
+
+
+def process_context():
+    """Multiprocessing context for task processes: the preloaded fork server where there is one."""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(PRELOAD_MODULES)
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def parse_resume_task(document):
+    """Parse an uploaded resume given as bytes or a file path."""
+    return parse_resume(document)
+
+
+def analyze_job_task(resume, job_description, job_title):
+    """Analyze a job description and match it against a Resume."""
+    return analyze_skill_gaps(resume, analyze_job_description(job_description, job_title))
+
+
+def _run_task(conn, func, args):
+    """Entry point of a task process: send back ('done', result) or ('failed', error)."""
+    try:
+        conn.send(('done', func(*args)))
+    except Exception as e:
+        conn.send(('failed', f"{type(e).__name__}: {e}"))
+        logger.debug(traceback.format_exc())
+    finally:
+        conn.close()
+
+
+class TaskQueue:
+    """Bounded background queue that runs each task in its own process.
+
+    Up to `workers` dispatcher threads take tasks from a queue of at most
+    `max_pending` entries. Each task runs in a process forked from a fork
+    server that has the parsing modules preloaded, so a task that passes
+    its timeout can be terminated without harming the web worker.
+
+    Task records live in one file per task ID under `directory`, rewritten
+    whole on each change of status, so a poll can be answered by any worker
+    and not only the one running the task. Finished records are removed
+    `result_ttl` seconds after they finish, or once popped.
+    """
+
+    def __init__(self, workers=TASK_WORKERS, max_pending=TASK_QUEUE_SIZE, timeout=TASK_TIMEOUT,
+                 result_ttl=TASK_RESULT_TTL, directory=TASK_DIR):
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self.directory = directory
+        self._pending = queue.Queue(maxsize=max_pending)
+        # Status of the tasks this worker has queued or is running, and counts of those it finished
+        self._active = {}
+        self._finished = {}
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+
+        self._context = process_context()
+        os.makedirs(self.directory, exist_ok=True)
+
+        for i in range(workers):
+            threading.Thread(target=self._dispatch, name=f'task-dispatcher-{i}', daemon=True).start()
+
+    def submit(self, func, *args, owner=None, meta=None):
+        """Queue func(*args) and return its task ID, or raise QueueFull.
+
+        owner and meta are kept with the task for whoever collects the result.
+        """
+        task_id = uuid.uuid4().hex
+        task = {
+            'id': task_id,
+            'kind': func.__name__,
+            'owner': owner,
+            'meta': meta or {},
+            'status': 'queued',
+            'submitted_at': time.time(),
+            'finished_at': None,
+            'result': None,
+            'error': None
+        }
+        self._prune()
+        # Written before it is queued, so the dispatcher's updates land after it
+        self._update(task)
+        try:
+            self._pending.put_nowait((task, func, args))
+        except queue.Full:
+            with self._lock:
+                del self._active[task_id]
+            self._remove(task_id)
+            raise QueueFull(f"{self._pending.maxsize} tasks are already waiting")
+        return task_id
+
+    def get(self, task_id):
+        """Return a task without its result, or None if it is unknown or expired."""
+        return self._read(task_id, self._path(task_id), with_result=False)
+
+    def pop(self, task_id):
+        """Remove a finished task and return it; of concurrent pops, only one gets it."""
+        path = self._path(task_id)
+        if path is None:
+            return None
+        claimed = f"{path}.{os.getpid()}.{threading.get_ident()}.claimed"
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        try:
+            return self._read(task_id, claimed, with_result=True)
+        finally:
+            os.remove(claimed)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._finished)
+            for status in self._active.values():
+                counts[status] = counts.get(status, 0) + 1
+        return {'pending': self._pending.qsize(), 'capacity': self._pending.maxsize, 'tasks': counts}
+
+    def _dispatch(self):
+        while True:
+            task, func, args = self._pending.get()
+            task_id = task['id']
+            self._update(task, status='running')
+            status, value = self._execute(func, args)
+            if status == 'done':
+                self._update(task, status=status, result=value, finished_at=time.time())
+            else:
+                self._update(task, status=status, error=value, finished_at=time.time())
+                logger.error(f"Task {task_id} {status}: {value}")
+
+    def _execute(self, func, args):
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=_run_task, args=(sender, func, args), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(self.timeout):
+                return 'timeout', f"Task exceeded {self.timeout:g} seconds"
+            try:
+                return receiver.recv()
+            except EOFError:
+                process.join()
+                return 'failed', f"Task process exited with code {process.exitcode}"
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    def _update(self, task, **fields):
+        task.update(fields)
+        with self._lock:
+            if task['status'] in FINISHED:
+                self._active.pop(task['id'], None)
+                self._finished[task['status']] = self._finished.get(task['status'], 0) + 1
+            else:
+                self._active[task['id']] = task['status']
+        self._write(task)
+
+    def _path(self, task_id):
+        # Task IDs come from URLs, so only ever join ones shaped like ours
+        if not TASK_ID.fullmatch(task_id):
+            return None
+        return os.path.join(self.directory, task_id + '.task')
+
+    def _remove(self, task_id):
+        try:
+            os.remove(self._path(task_id))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, task):
+        """Write a task record: its fields as JSON, then its result as the model's bytes."""
+        fields = {key: value for key, value in task.items() if key != 'result'}
+        result = task['result'].to_bytes() if task['result'] is not None else b''
+        path = self._path(task['id'])
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(pack_parts([json.dumps(fields).encode('utf-8'), result]))
+            # Atomic rename so a poll never reads a partial record
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Could not write task record {path}: {str(e)}")
+
+    def _read(self, task_id, path, with_result):
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as file:
+                fields, result = unpack_parts(file.read())
+            task = json.loads(str(fields, 'utf-8'))
+            if task['finished_at'] is not None and task['finished_at'] < time.time() - self.result_ttl:
+                return None
+            task['result'] = RESULT_TYPES[task['kind']].from_bytes(result) if with_result and len(result) else None
+            return task
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable task record {path}: {str(e)}")
+            return None
+
+    def _prune(self):
+        """Remove records that finished, or were last written, over result_ttl seconds ago.
+
+        A task still queued or running is rewritten in full when its status
+        changes, so a record removed while it waits comes back.
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._pruned_at < TASK_PRUNE_INTERVAL:
+                return
+            self._pruned_at = now
+        cutoff = now - self.result_ttl
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
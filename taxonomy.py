@@ -0,0 +1,422 @@
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from bisect import bisect_left
+
+import numpy as np
+
+from skill_engine import SkillScanner, build_automaton
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Editable taxonomy sources and the compiled artifact every process maps
+TAXONOMY_SOURCE = os.environ.get('TAXONOMY_SOURCE', os.path.join(ROOT, 'data', 'taxonomy.json'))
+ROLE_PROFILES_PATH = os.environ.get('ROLE_PROFILES_PATH', os.path.join(ROOT, 'Data.txt'))
+TAXONOMY_PATH = os.environ.get('TAXONOMY_PATH', os.path.join(ROOT, 'data', 'taxonomy.bin'))
+
+# Category of skills that only appear in the role profiles
+ROLE_CATEGORY = 'Role Profiles'
+
+# Skill flag: looked for in resumes and job descriptions
+DETECTABLE = 1
+
+MAGIC = b'SKILLTAX'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<8sII')
+
+_ROLE_TITLE = re.compile(r'^\s*\d+\.\s*(.+?)\s*$')
+_EXAMPLES = re.compile(r'\(\s*e\.g\.,?\s*([^)]*)\)', re.IGNORECASE)
+_CONJUNCTION = re.compile(r'\s+(?:or|and)\s+', re.IGNORECASE)
+
+
+def parse_role_profiles(text):
+    """Parse Data.txt style role profiles into title, requirement and skill lists.
+
+    A numbered line ('1.Data Analyst') starts a role and every following
+    non-empty line is one requirement. 'Python or R' names two skills, and
+    '(e.g., Tableau, Power BI)' lists examples of the skill before it.
+    """
+    roles = []
+    for line in text.splitlines():
+        title = _ROLE_TITLE.match(line)
+        if title:
+            roles.append({'title': title.group(1), 'requirements': [], 'skills': [], 'examples': {}})
+            continue
+        line = line.strip()
+        if not line or not roles:
+            continue
+
+        role = roles[-1]
+        role['requirements'].append(line)
+        examples = []
+        for match in _EXAMPLES.finditer(line):
+            examples.extend(example.strip().lower() for example in match.group(1).split(',') if example.strip())
+        for skill in _CONJUNCTION.split(_EXAMPLES.sub('', line).strip()):
+            skill = skill.strip().lower()
+            if skill:
+                role['skills'].append(skill)
+                if examples:
+                    role['examples'][skill] = examples
+        role['skills'].extend(examples)
+
+    for role in roles:
+        role['skills'] = list(dict.fromkeys(role['skills']))
+    return roles
+
+
+def load_sources(source_path=TAXONOMY_SOURCE, roles_path=ROLE_PROFILES_PATH):
+    """Merge the taxonomy JSON and the role profiles into one source dict."""
+    with open(source_path, 'r', encoding='utf-8') as file:
+        source = json.load(file)
+
+    roles = []
+    if roles_path and os.path.exists(roles_path):
+        with open(roles_path, 'r', encoding='utf-8') as file:
+            roles = parse_role_profiles(file.read())
+
+    source.setdefault('aliases', {})
+    source.setdefault('related', {})
+    source.setdefault('learning_resources', {})
+    source.setdefault('learning_weeks', {})
+    source['roles'] = roles
+    return source
+
+
+def _string_table(strings):
+    """Return the UTF-8 blob and uint32 end offsets of a list of strings."""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return b''.join(encoded), offsets
+
+
+def _adjacency(lists):
+    """Return CSR offsets and targets of per-skill ID lists."""
+    offsets = np.zeros(len(lists) + 1, dtype=np.uint32)
+    np.cumsum([len(ids) for ids in lists], out=offsets[1:])
+    targets = np.array([i for ids in lists for i in ids], dtype=np.uint32)
+    return offsets, targets
+
+
+def compile_taxonomy(source):
+    """Compile a source dict into the binary taxonomy artifact."""
+    names = []
+    ids = {}
+    categories = []
+    category_of = []
+    flags = []
+
+    def add(skill, category, flag):
+        skill = skill.strip().lower()
+        if skill not in ids:
+            if category not in categories:
+                categories.append(category)
+            ids[skill] = len(names)
+            names.append(skill)
+            category_of.append(categories.index(category))
+            flags.append(0)
+        flags[ids[skill]] |= flag
+        return ids[skill]
+
+    # Detectable skills get the lowest IDs, in source order, so that
+    # scanner results keep the order of the taxonomy file
+    for category, skills in source['categories'].items():
+        for skill in skills:
+            add(skill, category, DETECTABLE)
+    for role in source['roles']:
+        for skill in role['skills']:
+            add(skill, ROLE_CATEGORY, DETECTABLE)
+
+    related = {}
+    for skill, values in source['related'].items():
+        related.setdefault(skill.lower(), []).extend(value.lower() for value in values)
+    for role in source['roles']:
+        for skill, examples in role['examples'].items():
+            related.setdefault(skill, []).extend(examples)
+    for skill, values in related.items():
+        add(skill, 'Related', 0)
+        for value in values:
+            add(value, 'Related', 0)
+    for skill in list(source['learning_weeks']) + list(source['learning_resources']):
+        add(skill, 'Related', 0)
+
+    directed = [[] for _ in names]
+    similar = [set() for _ in names]
+    for skill, values in related.items():
+        skill_id = ids[skill]
+        for value in dict.fromkeys(values):
+            value_id = ids[value]
+            directed[skill_id].append(value_id)
+            similar[skill_id].add(value_id)
+            similar[value_id].add(skill_id)
+
+    aliases = {}
+    for alias, skill in source['aliases'].items():
+        skill = skill.lower()
+        if skill not in ids:
+            raise ValueError(f"Alias '{alias}' points to unknown skill '{skill}'")
+        aliases[alias.lower()] = skill
+
+    # Every spelling, sorted, so lookups are a binary search over the map
+    keys = sorted(set(names) | set(aliases))
+    key_ids = np.array([ids[aliases.get(key, key)] for key in keys], dtype=np.uint32)
+
+    weeks = np.zeros(len(names), dtype=np.uint8)
+    for skill, value in source['learning_weeks'].items():
+        weeks[ids[skill.lower()]] = value
+
+    detectable = [name for name, flag in zip(names, flags) if flag & DETECTABLE]
+    scanner_aliases = {alias: skill for alias, skill in aliases.items() if flags[ids[skill]] & DETECTABLE}
+    pattern, prefixes = build_automaton(detectable + list(scanner_aliases))
+
+    resources = {}
+    for skill, items in source['learning_resources'].items():
+        resources[str(ids[skill.lower()])] = items
+    roles = [{'title': role['title'], 'requirements': role['requirements'],
+              'skill_ids': [ids[skill] for skill in role['skills']]} for role in source['roles']]
+
+    names_blob, name_offsets = _string_table(names)
+    keys_blob, key_offsets = _string_table(keys)
+    related_offsets, related_targets = _adjacency(directed)
+    similar_offsets, similar_targets = _adjacency([sorted(ids_) for ids_ in similar])
+
+    sections = [
+        ('names', names_blob),
+        ('name_offsets', name_offsets.tobytes()),
+        ('categories', np.array(category_of, dtype=np.uint16).tobytes()),
+        ('flags', np.array(flags, dtype=np.uint8).tobytes()),
+        ('keys', keys_blob),
+        ('key_offsets', key_offsets.tobytes()),
+        ('key_ids', key_ids.tobytes()),
+        ('related_offsets', related_offsets.tobytes()),
+        ('related', related_targets.tobytes()),
+        ('similar_offsets', similar_offsets.tobytes()),
+        ('similar', similar_targets.tobytes()),
+        ('learning_weeks', weeks.tobytes()),
+        ('pattern', pattern.encode('utf-8')),
+        ('prefixes', json.dumps(prefixes).encode('utf-8')),
+        ('aliases', json.dumps(scanner_aliases).encode('utf-8')),
+        ('learning_resources', json.dumps(resources).encode('utf-8')),
+        ('roles', json.dumps(roles).encode('utf-8')),
+    ]
+
+    # Offsets in the header are relative to the first section, which starts
+    # 8-byte aligned right after the header
+    table = {}
+    position = 0
+    for name, data in sections:
+        table[name] = [position, len(data)]
+        position += len(data) + (-len(data) % 8)
+    header = json.dumps({'count': len(names), 'categories': categories, 'sections': table}).encode('utf-8')
+    header += b' ' * (-(len(header) + _PREAMBLE.size) % 8)
+
+    chunks = [_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)), header]
+    for _, data in sections:
+        chunks.append(data)
+        chunks.append(b'\0' * (-len(data) % 8))
+    return b''.join(chunks)
+
+
+def build_taxonomy(path=TAXONOMY_PATH, source_path=TAXONOMY_SOURCE, roles_path=ROLE_PROFILES_PATH):
+    """Compile the sources and atomically replace the artifact at path."""
+    data = compile_taxonomy(load_sources(source_path, roles_path))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+    logger.debug(f"Wrote skill taxonomy to {path} ({len(data)} bytes)")
+    return path
+
+
+class _StringTable:
+    """Read-only sequence over a UTF-8 blob and its end offsets."""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return str(self._blob[self._offsets[i]:self._offsets[i + 1]], 'utf-8')
+
+
+class Taxonomy:
+    """Skill taxonomy read in place from a compiled artifact.
+
+    Names, aliases and the related-skill adjacency stay in the buffer (an
+    mmap of the artifact file), so processes that map the same file share
+    its pages. Skill IDs are positions in the canonical name table and
+    lookups by name are binary searches over the sorted spellings.
+    """
+
+    def __init__(self, buffer):
+        magic, version, header_size = _PREAMBLE.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a version {FORMAT_VERSION} skill taxonomy artifact")
+        header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_size]))
+        base = _PREAMBLE.size + header_size
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._sections = {name: (base + offset, size) for name, (offset, size) in header['sections'].items()}
+        self.count = header['count']
+        self.categories = header['categories']
+
+        self._names = _StringTable(self._bytes('names'), self._array('name_offsets', np.uint32))
+        self._keys = _StringTable(self._bytes('keys'), self._array('key_offsets', np.uint32))
+        self._key_ids = self._array('key_ids', np.uint32)
+        self._category_ids = self._array('categories', np.uint16)
+        self._flags = self._array('flags', np.uint8)
+        self._related_offsets = self._array('related_offsets', np.uint32)
+        self._related = self._array('related', np.uint32)
+        self._similar_offsets = self._array('similar_offsets', np.uint32)
+        self._similar = self._array('similar', np.uint32)
+        self._weeks = self._array('learning_weeks', np.uint8)
+
+        self._json_cache = {}
+        self._skills = None
+        self._scanner = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.count
+
+    def _bytes(self, name):
+        start, size = self._sections[name]
+        return self._view[start:start + size]
+
+    def _array(self, name, dtype):
+        start, size = self._sections[name]
+        return np.frombuffer(self._buffer, dtype=dtype, count=size // np.dtype(dtype).itemsize, offset=start)
+
+    def _json(self, name):
+        if name not in self._json_cache:
+            self._json_cache[name] = json.loads(bytes(self._bytes(name)))
+        return self._json_cache[name]
+
+    def name(self, skill_id):
+        return self._names[skill_id]
+
+    def skill_id(self, skill):
+        """Return the canonical ID of a skill name or alias, or None if it is unknown."""
+        key = skill.strip().lower()
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return int(self._key_ids[i])
+        return None
+
+    def canonical(self, skill):
+        """Return the canonical name of a skill, or None if it is unknown."""
+        skill_id = self.skill_id(skill)
+        return self._names[skill_id] if skill_id is not None else None
+
+    def skills(self):
+        """Return every canonical skill name, indexed by skill ID."""
+        if self._skills is None:
+            self._skills = [self._names[i] for i in range(self.count)]
+        return self._skills
+
+    def detectable_skills(self):
+        """Return the skills looked for in documents, in taxonomy order."""
+        return [self._names[i] for i in np.flatnonzero(self._flags & DETECTABLE)]
+
+    def category(self, skill):
+        skill_id = self.skill_id(skill)
+        return self.categories[self._category_ids[skill_id]] if skill_id is not None else None
+
+    def aliases(self):
+        """Return the aliases of detectable skills as {alias: canonical name}."""
+        return self._json('aliases')
+
+    def related_ids(self, skill_id):
+        """Return the IDs listed as related to a skill, in source order."""
+        return self._related[self._related_offsets[skill_id]:self._related_offsets[skill_id + 1]]
+
+    def similar_ids(self, skill_id):
+        """Return the sorted IDs related to a skill in either direction."""
+        return self._similar[self._similar_offsets[skill_id]:self._similar_offsets[skill_id + 1]]
+
+    def related_skills(self, skill):
+        """Return the names of the skills listed as related to a skill."""
+        skill_id = self.skill_id(skill)
+        if skill_id is None:
+            return []
+        return [self._names[i] for i in self.related_ids(skill_id)]
+
+    def learning_resources(self, skill):
+        skill_id = self.skill_id(skill)
+        return self._json('learning_resources').get(str(skill_id), []) if skill_id is not None else []
+
+    def learning_weeks(self, skill):
+        """Return the estimated weeks to learn a skill, or None if unknown."""
+        skill_id = self.skill_id(skill)
+        if skill_id is None or not self._weeks[skill_id]:
+            return None
+        return int(self._weeks[skill_id])
+
+    def role_profiles(self):
+        """Return the Data.txt roles as title, requirements and skill names."""
+        return [{'title': role['title'], 'requirements': role['requirements'],
+                 'skills': [self._names[i] for i in role['skill_ids']]} for role in self._json('roles')]
+
+    def scanner(self):
+        """Return the shared SkillScanner over the detectable skills."""
+        if self._scanner is None:
+            with self._lock:
+                if self._scanner is None:
+                    self._scanner = SkillScanner(
+                        self.detectable_skills(), self.aliases(),
+                        automaton=(str(self._bytes('pattern'), 'utf-8'), self._json('prefixes'))
+                    )
+        return self._scanner
+
+
+def _is_stale(path, sources):
+    if not os.path.exists(path):
+        return True
+    built_at = os.path.getmtime(path)
+    return any(source and os.path.exists(source) and os.path.getmtime(source) > built_at for source in sources)
+
+
+def load_taxonomy(path=TAXONOMY_PATH, source_path=TAXONOMY_SOURCE, roles_path=ROLE_PROFILES_PATH):
+    """Memory-map the compiled taxonomy.
+
+    The artifact is only written by `python taxonomy.py build`, run as a
+    deploy step, never on import: a deploy may be read-only, and workers
+    would race to rebuild it. A stale artifact is used as it is, with a
+    warning. Without one, the sources are compiled in memory.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"No compiled taxonomy at {path}; compiling it in memory. Run `python taxonomy.py build`.")
+        return Taxonomy(compile_taxonomy(load_sources(source_path, roles_path)))
+    if _is_stale(path, [source_path, roles_path]):
+        logger.warning(f"The compiled taxonomy at {path} is older than its sources. Run `python taxonomy.py build`.")
+
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return Taxonomy(buffer)
+
+
+TAXONOMY = load_taxonomy()
+
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else 'build'
+    if command == 'build':
+        print(build_taxonomy())
+    elif command == 'roles':
+        for role in TAXONOMY.role_profiles():
+            print(f"{role['title']}: {', '.join(role['skills'])}")
+    else:
+        sys.exit("usage: python taxonomy.py [build|roles]")
@@ -0,0 +1,140 @@
+import datetime
+import logging
+import re
+from bisect import bisect_left
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+
+def _date(suffix):
+    """One side of a date range: 06/2020, 06-2020, Jun 2020 or June 2020."""
+    return (rf'(?:(?P<month{suffix}>\d{{1,2}})[/-](?P<year{suffix}>\d{{4}})'
+            rf'|(?P<name{suffix}>{"|".join(MONTHS)})[a-z]* (?P<name_year{suffix}>\d{{4}}))')
+
+
+# Date ranges and "N years" mentions, found in one pass over the document. A
+# range stays on one line, as when the extractors searched line by line. Both
+# start a word with a digit or a month initial, which rules out most
+# positions before any alternative is tried.
+DATE_PATTERN = re.compile(
+    r'\b(?=[\dadfjmnos])'
+    rf'(?:(?P<range>{_date("_start")}[^\S\n]*(?:-|to|–)[^\S\n]*(?:{_date("_end")}|(?P<present>present|current)))'
+    r'|(?P<years>(?P<count>\d+)\+?\s*(?:years|yrs|yr)'
+    r'(?:(?P<experience>(?:\s+of)?\s+(?:experience|exp))(?P<lead>(?:\s+with|\s+in)?\s+)?)?))',
+    re.IGNORECASE
+)
+
+
+def _month(match, suffix):
+    """Months since year 0 for one side of a DATE_PATTERN range, or None if the month is invalid."""
+    if match.group(f'month{suffix}'):
+        month = int(match.group(f'month{suffix}'))
+        year = int(match.group(f'year{suffix}'))
+    else:
+        month = MONTHS.index(match.group(f'name{suffix}').lower()) + 1
+        year = int(match.group(f'name_year{suffix}'))
+    if not 1 <= month <= 12:
+        return None
+    return year * 12 + month - 1
+
+
+class DateIndex:
+    """Date ranges and "N years" mentions of a document, with their offsets.
+
+    ranges holds (start, end, first month, last month) tuples, months
+    counted from year 0, last month None for "Present" and first month None
+    if either date has an invalid month. years holds
+    (start, end, count, skill offset) tuples; skill offset is where the
+    subject of "N years of experience with" starts, -1 if the mention is not
+    about experience and None if nothing follows it.
+    """
+
+    def __init__(self, text):
+        self.ranges = []
+        self.years = []
+        for match in DATE_PATTERN.finditer(text):
+            if match.group('range'):
+                first = _month(match, '_start')
+                last = None if match.group('present') else _month(match, '_end')
+                if last is None and not match.group('present'):
+                    first = None
+                self.ranges.append((match.start(), match.end(), first, last))
+            elif match.group('experience'):
+                self.years.append((match.start(), match.end(), int(match.group('count')),
+                                   match.end('lead') if match.group('lead') else None))
+            else:
+                self.years.append((match.start(), match.end(), int(match.group('count')), -1))
+        self._range_starts = [start for start, _, _, _ in self.ranges]
+
+    def range_in(self, start, end):
+        """The first (start, end, first month, last month) range inside text[start:end], or None."""
+        i = bisect_left(self._range_starts, start)
+        if i < len(self.ranges) and self.ranges[i][1] <= end:
+            return self.ranges[i]
+        return None
+
+    def ranges_in(self, spans):
+        """All ranges inside any of the (start, end) spans."""
+        found = []
+        for start, end in spans:
+            i = bisect_left(self._range_starts, start)
+            while i < len(self.ranges) and self.ranges[i][1] <= end:
+                found.append(self.ranges[i])
+                i += 1
+        return found
+
+
+def current_month(today=None):
+    today = today or datetime.date.today()
+    return today.year * 12 + today.month - 1
+
+
+def merge_intervals(intervals):
+    """Merge (first, last) month intervals, inclusive, that overlap or touch."""
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            if last > merged[-1][1]:
+                merged[-1][1] = last
+        else:
+            merged.append([first, last])
+    return [(first, last) for first, last in merged]
+
+
+def total_years(ranges, today=None):
+    """Years covered by date ranges, counting overlapping periods once.
+
+    "Present" ends in the current month. Ranges with an invalid month, or
+    that end before they start, are ignored.
+    """
+    now = current_month(today)
+    intervals = []
+    for _, _, first, last in ranges:
+        if first is None:
+            continue
+        if last is None:
+            last = now
+        if last >= first:
+            intervals.append((first, min(last, now)))
+    months = sum(last - first + 1 for first, last in merge_intervals(intervals) if last >= first)
+    return round(months / 12, 1)
+
+
+def score_experience(years, experience_req):
+    """Compare a candidate's years of experience with a job's overall requirement.
+
+    Returns None when either is unknown.
+    """
+    required = (experience_req or {}).get('overall')
+    if years is None or required is None:
+        return None
+    return {
+        'required_years': required,
+        'years': years,
+        'meets': years >= required,
+        'shortfall': round(max(0.0, required - years), 1)
+    }
@@ -0,0 +1,65 @@
+"""Authorization and limits of the resume search API."""
+import os
+
+import pytest
+
+# Keep the index the app creates on import out of the repository's data directory
+os.environ.setdefault('SKILL_INDEX_PATH', '')
+
+import app as app_module  # noqa: E402
+from skill_index import SkillIndex  # noqa: E402
+
+TOKEN = 'search-token'
+
+
+@pytest.fixture
+def client(monkeypatch):
+    index = SkillIndex(path='')
+    for i in range(5):
+        index.add(f'user-{i}', ['Python', 'SQL'] if i % 2 else ['Python'])
+    monkeypatch.setattr(app_module, 'skill_index', index)
+    monkeypatch.setattr(app_module, 'SEARCH_API_TOKEN', TOKEN)
+    monkeypatch.setattr(app_module, 'SEARCH_MAX_RESULTS', 3)
+    return app_module.app.test_client()
+
+
+def search(client, query, token=TOKEN):
+    headers = {'Authorization': f'Bearer {token}'} if token is not None else {}
+    return client.get(f'/api/search_resumes?{query}', headers=headers)
+
+
+def test_search_needs_the_token(client, monkeypatch):
+    assert search(client, 'all=python', token=None).status_code == 401
+    assert search(client, 'all=python', token='wrong').status_code == 401
+    assert client.get('/api/search_resumes?all=python', headers={'Authorization': TOKEN}).status_code == 401
+
+    # Without a configured token, search is off rather than open
+    monkeypatch.setattr(app_module, 'SEARCH_API_TOKEN', '')
+    assert search(client, 'all=python', token='').status_code == 401
+
+
+def test_results_are_opaque_handles(client):
+    expected = {app_module.resume_handle(TOKEN, f'user-{i}') for i in (1, 3)}
+
+    response = search(client, 'all=python,sql')
+    assert response.status_code == 200
+    handles = {result['resume'] for result in response.get_json()['results']}
+    assert handles == expected
+    assert not any('user' in handle for handle in handles)
+    # Handles differ between callers
+    assert app_module.resume_handle('other-token', 'user-1') not in handles
+
+
+@pytest.mark.parametrize('limit, count', [('', 3), ('limit=2', 2), ('limit=1000', 3), ('limit=0', 1),
+                                          ('limit=-5', 1), ('limit=abc', 3)])
+def test_limit_is_clamped(client, limit, count):
+    response = search(client, f'all=python&{limit}')
+    assert response.status_code == 200
+    assert len(response.get_json()['results']) == count
+
+    ranked = search(client, f'any=python&rank_by=python,sql&{limit}')
+    assert len(ranked.get_json()['results']) == count
+
+
+def test_search_needs_skills(client):
+    assert search(client, 'none=python').status_code == 400
@@ -0,0 +1,83 @@
+"""Bulk ingestion with workers that crash or hang.
+
+The documents are fake and parse_resume is patched; pool processes are
+forked, so they run the patched parser.
+"""
+import json
+import os
+import signal
+
+import pytest
+
+import bulk_ingest
+from models import Resume
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, 'pthread_sigmask') or not hasattr(os, 'fork'),
+                                reason='needs forked workers and signal masks')
+
+
+def fake_parse_resume(source):
+    text = source.decode('utf-8')
+    if text == 'hang':
+        # Stuck where the per-file alarm cannot interrupt it, like a call inside a C extension
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+        signal.pause()
+    if text == 'crash':
+        os._exit(1)
+    return Resume(name=text)
+
+
+@pytest.fixture
+def documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(bulk_ingest, 'parse_resume', fake_parse_resume)
+    monkeypatch.setattr(bulk_ingest, 'STALL_GRACE_SECONDS', 0.5)
+
+    def make(*texts):
+        source = tmp_path / 'resumes'
+        source.mkdir()
+        for index, text in enumerate(texts):
+            (source / f'{index:02d}-{text}.pdf').write_text(text)
+        return str(source)
+    return make
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as file:
+        return {record['source']: record for record in map(json.loads, file)}
+
+
+def test_stalled_workers_are_killed_and_the_rest_retried(documents, tmp_path):
+    # Both workers hang while units are still queued behind them
+    source = documents('ok', 'hang', 'hang', 'ok', 'ok', 'ok')
+    output = str(tmp_path / 'out.jsonl')
+
+    stats = bulk_ingest.ingest(source, output, workers=2, chunk_size=1, timeout=0.2, progress=False)
+
+    records = read_records(output)
+    assert stats['ok'] == 4 and stats['failed'] == 2
+    for name in ('01-hang.pdf', '02-hang.pdf'):
+        assert records[name]['status'] == 'failed'
+        assert 'stalled' in records[name]['error']
+    assert all(record['status'] == 'ok' for name, record in records.items() if 'hang' not in name)
+
+
+def test_crashed_worker_fails_only_its_file(documents, tmp_path):
+    source = documents('ok', 'crash', 'ok', 'ok')
+    output = str(tmp_path / 'out.jsonl')
+
+    stats = bulk_ingest.ingest(source, output, workers=2, chunk_size=2, timeout=5, progress=False)
+
+    records = read_records(output)
+    assert stats['ok'] == 3 and stats['failed'] == 1
+    assert records['01-crash.pdf']['error'] == 'The worker process parsing this file died'
+
+
+def test_resume_skips_recorded_files_and_drops_a_partial_line(documents, tmp_path):
+    source = documents('ok', 'ok', 'ok')
+    output = tmp_path / 'out.jsonl'
+    output.write_text(json.dumps({'source': '00-ok.pdf', 'status': 'ok'}) + '\n{"source": "01-o')
+
+    stats = bulk_ingest.ingest(source, str(output), workers=1, chunk_size=1, resume=True, progress=False)
+
+    assert stats['skipped'] == 1 and stats['ok'] == 2
+    assert sorted(read_records(output)) == ['00-ok.pdf', '01-ok.pdf', '02-ok.pdf']
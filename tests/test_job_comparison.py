@@ -0,0 +1,76 @@
+"""Deadlines and hung jobs of the comparison pool.
+
+compare_job is patched with jobs that sleep or hang, and the pool forks
+its processes, so they run the patch.
+"""
+import multiprocessing
+import signal
+import time
+
+import pytest
+
+import job_comparison
+from job_comparison import JobComparer
+
+pytestmark = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs forked workers')
+
+
+def fake_compare_job(resume, job_description, job_title):
+    if job_description == 'hang':
+        signal.pause()
+    time.sleep(float(job_description))
+    return job_title
+
+
+@pytest.fixture(autouse=True)
+def forked_pool(monkeypatch):
+    monkeypatch.setattr(job_comparison, 'compare_job', fake_compare_job)
+    monkeypatch.setattr(job_comparison, 'process_context', lambda: multiprocessing.get_context('fork'))
+    monkeypatch.setattr(job_comparison, 'REAP_INTERVAL', 0.1)
+
+
+def wait_idle(comparer, seconds=5):
+    end = time.monotonic() + seconds
+    while comparer.stats()['pending'] and time.monotonic() < end:
+        time.sleep(0.05)
+    return comparer.stats()['pending'] == 0
+
+
+def test_results_in_completion_order_and_timeouts_last():
+    comparer = JobComparer(workers=2)
+    results = list(comparer.compare(None, [('slow', '0.6'), ('fast', '0'), ('late', '30')], timeout=1))
+
+    assert results[0] == (1, 'done', 'fast')
+    assert results[1] == (0, 'done', 'slow')
+    assert results[2][:2] == (2, 'timeout')
+
+
+def test_job_that_started_late_is_not_killed():
+    # The second job waits for the only process; counted from submission it would pass kill_after
+    comparer = JobComparer(workers=1, kill_after=0.8)
+    results = list(comparer.compare(None, [('a', '0.5'), ('b', '0.5')], timeout=5))
+
+    assert sorted(results) == [(0, 'done', 'a'), (1, 'done', 'b')]
+
+
+def test_short_deadline_leaves_the_running_job_alone():
+    comparer = JobComparer(workers=1, kill_after=2)
+    assert list(comparer.compare(None, [('slow', '0.5')], timeout=0.1))[0][:2] == (0, 'timeout')
+    pool = comparer._pool
+
+    assert wait_idle(comparer)
+    assert comparer._pool is pool
+    assert list(comparer.compare(None, [('next', '0')], timeout=5)) == [(0, 'done', 'next')]
+
+
+def test_hung_job_is_killed_and_other_requests_retried():
+    comparer = JobComparer(workers=2, kill_after=1)
+    assert list(comparer.compare(None, [('stuck', 'hang')], timeout=0.5))[0][:2] == (0, 'timeout')
+    pool = comparer._pool
+
+    # Shorter than kill_after, but in flight on the same pool when the hung job is killed
+    results = list(comparer.compare(None, [('healthy', '0.8')], timeout=10))
+
+    assert results == [(0, 'done', 'healthy')]
+    assert comparer._pool is not pool
+    assert wait_idle(comparer)
@@ -0,0 +1,59 @@
+"""Byte round-trips of the models and rejection of bytes they cannot trust."""
+import pytest
+
+import models
+from models import JobDescription, Resume, SkillGapAnalysis, StaleTaxonomy, pack_parts, unpack_parts
+
+
+def make_analysis():
+    job = JobDescription('Data Engineer', 'Acme', 'We need Python and SQL.', ['Python', 'SQL', 'Airflow-ish'],
+                         ['Docker'], {'overall': 3, 'specific': {'python': 2}}, {'degree': 'BS', 'field': 'CS'},
+                         'abc123')
+    return SkillGapAnalysis(job, 50.0, ['Python'], ['SQL', 'Airflow-ish'], [{'skill': 'sql', 'importance': 'high'}],
+                            [{'skill': 'sql', 'total_weeks': 2.0}], {'required': 3, 'candidate': 1},
+                            ['Docker'], ['Kubernetes'])
+
+
+def test_resume_round_trip_with_and_without_text():
+    resume = Resume('Ada', 'ada@example.com', '555-0100', ['Python', 'SQL', 'Quilting'], [{'title': 'Engineer'}],
+                    [{'degree': 'BS'}], 4.5, raw_text='Ada\nPython, SQL')
+
+    copy = Resume.from_bytes(resume.to_bytes())
+    assert copy.to_dict() == resume.to_dict()
+    assert copy.raw_text == 'Ada\nPython, SQL'
+    assert Resume.from_bytes(resume.to_bytes(keep_raw_text=False)).raw_text is None
+
+
+def test_analysis_round_trip_keeps_job_and_preferred_skills():
+    analysis = make_analysis()
+
+    copy = SkillGapAnalysis.from_bytes(analysis.to_bytes())
+    assert copy.to_dict() == analysis.to_dict()
+    assert copy.text_key == 'abc123'
+    assert copy.matching_preferred_skills == ['Docker'] and copy.missing_preferred_skills == ['Kubernetes']
+
+
+def test_bytes_from_another_taxonomy_are_stale(monkeypatch):
+    data = Resume('Ada', skills=['Python']).to_bytes()
+    monkeypatch.setattr(models, 'TAXONOMY_DIGEST', b'\0' * 8)
+
+    with pytest.raises(StaleTaxonomy):
+        Resume.from_bytes(data)
+
+
+def test_first_format_is_stale_and_unknown_formats_are_rejected():
+    data = bytearray(Resume('Ada', skills=['Python']).to_bytes())
+    data[0] = 1
+    with pytest.raises(StaleTaxonomy):
+        Resume.from_bytes(bytes(data))
+    data[0] = 9
+    with pytest.raises(ValueError):
+        Resume.from_bytes(bytes(data))
+
+
+def test_fields_are_unpacked_strictly():
+    job, fields, *ids = unpack_parts(make_analysis().to_bytes())
+    short = pack_parts([bytes(job), bytes(fields)] + [bytes(part) for part in ids[:2]])
+
+    with pytest.raises(ValueError):
+        SkillGapAnalysis.from_bytes(short)
@@ -0,0 +1,86 @@
+"""The parse cache's disk tier: running totals, eviction and entries it must not serve."""
+import os
+import time
+
+import parse_cache
+from models import Resume
+from parse_cache import ParseCache
+
+
+def make_resume(i):
+    return Resume(f'Candidate {i}', skills=['Python'], raw_text='x' * 1000)
+
+
+def entry_size():
+    return len(make_resume(0).to_bytes())
+
+
+def disk_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.bin'))
+
+
+def test_evicts_least_recently_used_down_to_low_water(tmp_path):
+    cache = ParseCache('1', max_entries=1, directory=str(tmp_path), max_bytes=10 * entry_size())
+    for i in range(10):
+        cache.put(f'hash-{i}', make_resume(i))
+        # Distinct modification times, so eviction order is defined
+        os.utime(cache._path(cache.key(f'hash-{i}')), (i, i))
+    assert cache.get('hash-0').name == 'Candidate 0'
+    os.utime(cache._path(cache.key('hash-0')), (100, 100))
+
+    cache.put('hash-10', make_resume(10))
+
+    stats = cache.stats()
+    files = disk_files(tmp_path)
+    low_water = parse_cache.DISK_LOW_WATER * 10 * entry_size()
+    assert stats['disk_entries'] == len(files)
+    assert stats['disk_bytes'] == sum(os.path.getsize(tmp_path / name) for name in files)
+    # Freed to the low-water mark, and no further
+    assert stats['disk_bytes'] <= low_water < stats['disk_bytes'] + entry_size()
+    assert cache.get('hash-0') is not None and cache.get('hash-10') is not None
+    assert cache.get('hash-1') is None and cache.get('hash-2') is None
+
+
+def test_running_totals_follow_puts_without_rescanning(tmp_path, monkeypatch):
+    cache = ParseCache('1', directory=str(tmp_path), max_bytes=100 * entry_size())
+    scans = []
+    usage = cache._disk_usage
+    monkeypatch.setattr(cache, '_disk_usage', lambda: scans.append(1) or usage())
+
+    for i in range(5):
+        cache.put(f'hash-{i}', make_resume(i))
+    cache.put('hash-0', make_resume(0))
+
+    assert scans == []
+    assert cache.stats()['disk_entries'] == 5 and cache.stats()['disk_bytes'] == 5 * entry_size()
+
+
+def test_totals_are_seeded_from_disk_and_rescanned_periodically(tmp_path, monkeypatch):
+    writer = ParseCache('1', directory=str(tmp_path))
+    writer.put('hash-0', make_resume(0))
+    reader = ParseCache('1', directory=str(tmp_path))
+    assert reader.stats()['disk_entries'] == 1
+
+    # Another worker's writes show up once the rescan interval has passed
+    writer.put('hash-1', make_resume(1))
+    monkeypatch.setattr(parse_cache, 'DISK_RESCAN_SECONDS', 0)
+    time.sleep(0.01)
+    reader.put('hash-2', make_resume(2))
+    assert reader.stats()['disk_entries'] == 3
+
+
+def test_shared_across_caches_but_not_across_versions(tmp_path):
+    ParseCache('1', directory=str(tmp_path)).put('hash-0', make_resume(0))
+
+    cache = ParseCache('1', directory=str(tmp_path))
+    assert cache.get('hash-0').name == 'Candidate 0'
+    assert cache.stats()['disk_hits'] == 1
+    assert ParseCache('2', directory=str(tmp_path)).get('hash-0') is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = ParseCache('1', directory=str(tmp_path))
+    with open(cache._path(cache.key('hash-0')), 'wb') as file:
+        file.write(b'\x02garbage')
+
+    assert cache.get('hash-0') is None
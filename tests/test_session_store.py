@@ -0,0 +1,81 @@
+"""Session records: encoding, the memory and SQL stores, and records that must be dropped."""
+import time
+
+import pytest
+
+import models
+from models import Resume
+from session_store import MemorySessionStore, SQLSessionStore, decode_record, encode_record, record_version
+
+
+def make_record(name='Ada', updated_at=1.0):
+    return {'resume': Resume(name, skills=['Python', 'SQL'], raw_text='text'), 'jobs': [], 'updated_at': updated_at}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    deleted = []
+    if request.param == 'memory':
+        store = MemorySessionStore(on_delete=deleted.append)
+    else:
+        store = SQLSessionStore(f"sqlite:///{tmp_path / 'sessions.db'}", on_delete=deleted.append)
+    store.deleted = deleted
+    return store
+
+
+def test_record_round_trip_drops_raw_text_unless_kept():
+    data = encode_record(make_record(updated_at=12.5))
+
+    assert record_version(data) == 12.5
+    record = decode_record(data)
+    assert record['resume'].name == 'Ada' and record['resume'].raw_text is None and record['updated_at'] == 12.5
+    assert decode_record(encode_record(make_record(), keep_raw_text=True))['resume'].raw_text == 'text'
+
+
+def test_unknown_magic_fails_closed():
+    with pytest.raises(ValueError):
+        decode_record(b'RS\x01' + encode_record(make_record())[3:])
+
+
+def test_store_round_trip_and_delete_hook(store):
+    store.put('user-1', make_record())
+
+    assert store.get('user-1')['resume'].name == 'Ada'
+    assert store.version('user-1') == 1.0
+    store.delete('user-1')
+    assert store.get('user-1') is None and store.deleted == ['user-1']
+
+
+def test_stale_taxonomy_record_is_dropped(store, monkeypatch):
+    store.put('user-1', make_record())
+    monkeypatch.setattr(models, 'TAXONOMY_DIGEST', b'\0' * 8)
+
+    assert store.get('user-1') is None
+    assert store.deleted == ['user-1']
+    monkeypatch.undo()
+    assert store.get('user-1') is None
+
+
+def test_expired_records_are_dropped(store):
+    store.ttl = 0.05
+    store.put('user-1', make_record())
+    time.sleep(0.1)
+
+    assert store.get('user-1') is None
+    # The SQL store deletes expired records on its next write
+    store.put('user-2', make_record())
+    assert store.deleted == ['user-1']
+
+
+def test_memory_store_evicts_least_recently_used_within_budget():
+    deleted = []
+    size = len(encode_record(make_record()))
+    store = MemorySessionStore(max_bytes=2 * size, on_delete=deleted.append)
+    store.put('user-1', make_record())
+    store.put('user-2', make_record())
+    store.get('user-1')
+    store.put('user-3', make_record())
+
+    assert deleted == ['user-2']
+    assert store.get('user-1') is not None and store.get('user-2') is None
+    assert store.stats()['bytes'] <= 2 * size
@@ -0,0 +1,73 @@
+"""The skill index journal, as replayed by other processes sharing its path.
+
+Several SkillIndex objects over one path stand for several workers.
+"""
+import pytest
+
+import skill_index
+from skill_index import SkillIndex
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'skill_index.bin')
+
+
+def test_other_index_replays_adds_and_removes(path):
+    writer = SkillIndex(path)
+    reader = SkillIndex(path)
+    writer.add('user-1', ['Python', 'SQL'])
+    writer.add('user-2', ['Python', 'Docker'])
+
+    assert sorted(reader.query(all_of=['python'])) == ['user-1', 'user-2']
+    writer.remove('user-1')
+    assert reader.query(all_of=['python']) == ['user-2']
+    writer.add('user-2', ['Go'])
+    assert reader.skills_of('user-2') == ['go']
+    assert reader.query(any_of=['python', 'docker']) == []
+
+
+def test_reopened_index_replays_the_journal(path):
+    index = SkillIndex(path)
+    index.add('user-1', ['Python'])
+    index.add('user-2', ['SQL'])
+    index.remove('user-2')
+
+    reopened = SkillIndex(path)
+    assert len(reopened) == 1 and reopened.query(any_of=['python', 'sql']) == ['user-1']
+
+
+def test_partial_journal_line_is_skipped(path):
+    index = SkillIndex(path)
+    index.add('user-1', ['Python'])
+    # A writer that crashed mid-line
+    with open(path + '.journal', 'ab') as journal:
+        journal.write(b'{"op": "add", "key": "user-2", "sk')
+    index.add('user-3', ['Python'])
+
+    assert sorted(SkillIndex(path).query(all_of=['python'])) == ['user-1', 'user-3']
+
+
+def test_compaction_starts_a_new_journal_other_indexes_reload(path, monkeypatch):
+    monkeypatch.setattr(skill_index, 'COMPACT_RATIO', 0.1)
+    writer = SkillIndex(path)
+    reader = SkillIndex(path)
+    for i in range(5):
+        writer.add(f'user-{i}', ['Python'])
+    assert len(reader) == 0 and len(reader.query(all_of=['python'])) == 5
+
+    writer.remove('user-0')
+    writer.add('user-5', ['Python'])
+
+    assert sorted(reader.query(all_of=['python'])) == [f'user-{i}' for i in range(1, 6)]
+    assert sorted(SkillIndex(path).query(all_of=['python'])) == [f'user-{i}' for i in range(1, 6)]
+
+
+def test_clear_reaches_other_indexes(path):
+    writer = SkillIndex(path)
+    reader = SkillIndex(path)
+    writer.add('user-1', ['Python'])
+    assert reader.query(all_of=['python']) == ['user-1']
+
+    writer.clear()
+    assert reader.query(all_of=['python']) == []
@@ -0,0 +1,70 @@
+"""Task records shared between the queues of several workers.
+
+Two queues over one directory stand for two gunicorn workers. Tasks run
+in forked processes, so they run the functions defined here.
+"""
+import multiprocessing
+import time
+
+import pytest
+
+import task_queue
+from models import Resume
+from task_queue import TaskQueue
+
+pytestmark = pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs forked workers')
+
+
+def parse_resume_task(document):
+    if document == b'fail':
+        raise ValueError('unreadable upload')
+    return Resume(name=document.decode('utf-8'), skills=['Python'])
+
+
+@pytest.fixture(autouse=True)
+def forked_tasks(monkeypatch):
+    monkeypatch.setattr(task_queue, 'process_context', lambda: multiprocessing.get_context('fork'))
+
+
+def wait_finished(queue, task_id, seconds=10):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        task = queue.get(task_id)
+        if task is None or task['status'] in task_queue.FINISHED:
+            return task
+        time.sleep(0.05)
+    return queue.get(task_id)
+
+
+def test_any_worker_answers_the_poll_and_only_one_gets_the_result(tmp_path):
+    running = TaskQueue(workers=1, directory=str(tmp_path))
+    other = TaskQueue(workers=1, directory=str(tmp_path))
+    task_id = running.submit(parse_resume_task, b'Ada', owner='user-1', meta={'content_hash': 'abc'})
+
+    task = wait_finished(other, task_id)
+    assert task['status'] == 'done' and task['owner'] == 'user-1' and task['meta'] == {'content_hash': 'abc'}
+    assert task['result'] is None
+
+    task = other.pop(task_id)
+    assert task['result'].name == 'Ada' and list(task['result'].skills) == ['Python']
+    assert running.pop(task_id) is None and running.get(task_id) is None
+    assert running.stats()['tasks'] == {'done': 1}
+
+
+def test_failures_and_unknown_ids(tmp_path):
+    queue = TaskQueue(workers=1, directory=str(tmp_path))
+    task_id = queue.submit(parse_resume_task, b'fail', owner='user-1')
+
+    task = wait_finished(queue, task_id)
+    assert task['status'] == 'failed' and 'unreadable upload' in task['error']
+    assert queue.get('0' * 32) is None
+    assert queue.get('../' + task_id) is None
+
+
+def test_finished_records_expire(tmp_path):
+    queue = TaskQueue(workers=1, directory=str(tmp_path), result_ttl=0.2)
+    task_id = queue.submit(parse_resume_task, b'Ada', owner='user-1')
+
+    assert wait_finished(queue, task_id)['status'] == 'done'
+    time.sleep(0.3)
+    assert queue.get(task_id) is None and queue.pop(task_id) is None
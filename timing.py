@@ -0,0 +1,33 @@
+import time
+from contextlib import contextmanager
+
+from metrics import STAGE_SECONDS
+
+
+class StageTimer:
+    """Record the wall-clock seconds spent in each named pipeline stage.
+
+    Timings are accumulated into the dict given to the constructor, and,
+    when a pipeline name is given, observed into the pipeline_stage_seconds
+    histogram. A caller that wants neither passes None and pays nothing.
+    """
+
+    def __init__(self, timings=None, pipeline=None):
+        self.timings = timings
+        self.pipeline = pipeline
+
+    @contextmanager
+    def stage(self, name):
+        if self.timings is None and self.pipeline is None:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if self.timings is not None:
+                self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            if self.pipeline is not None:
+                STAGE_SECONDS.observe(elapsed, pipeline=self.pipeline, stage=name)
@@ -0,0 +1,82 @@
+import logging
+import re
+from array import array
+from bisect import bisect_left
+
+# Setup logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# A run of word characters, joined across single '.', '/', '-', '&' or "'"
+# ("asp.net", "ci/cd", "scikit-learn", "bachelor's"), with any trailing '+'
+# or '#' ("c++", "c#") and a leading '.' after a space (".net", but not
+# "...net"). Other punctuation is dropped rather than turned into tokens.
+TOKEN_PATTERN = re.compile(r"(?<!\w)(?:(?<!\.)\.)?\w+(?:[./&'-]\w+)*[+#]*")
+
+
+class Tokens:
+    """The tokens of a document with their offsets, found in one regex pass.
+
+    tokens[i] is text[starts[i]:ends[i]]. normalized holds the tokens
+    lower-cased and is built on first use, so extractors that share one
+    Tokens share the work.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        self.starts = array('I')
+        self.ends = array('I')
+        for match in TOKEN_PATTERN.finditer(text):
+            start, end = match.span()
+            self.tokens.append(match.group())
+            self.starts.append(start)
+            self.ends.append(end)
+        self._normalized = None
+
+    @classmethod
+    def from_spans(cls, text, starts, ends, token_list=None, normalized=None):
+        """Rebuild the tokens of text from offsets found earlier, without scanning it again."""
+        tokens = cls.__new__(cls)
+        tokens.text = text
+        if token_list is None:
+            token_list = [text[start:end] for start, end in zip(starts, ends)]
+        tokens.tokens = token_list
+        tokens.starts = starts
+        tokens.ends = ends
+        tokens._normalized = normalized
+        return tokens
+
+    def __len__(self):
+        return len(self.tokens)
+
+    @property
+    def normalized(self):
+        if self._normalized is None:
+            self._normalized = [token.lower() for token in self.tokens]
+        return self._normalized
+
+    def index(self, offset):
+        """Return the index of the first token starting at or after offset."""
+        return bisect_left(self.starts, offset)
+
+    def find(self, words, start=0, end=None):
+        """Return the index of the first normalized token in words, from token start up to end, or -1."""
+        normalized = self.normalized
+        for i in range(start, len(normalized) if end is None else min(end, len(normalized))):
+            if normalized[i] in words:
+                return i
+        return -1
+
+    def followed_by(self, i, char):
+        """Whether token i is directly followed by char in the text."""
+        return self.text.startswith(char, self.ends[i])
+
+    def spaced(self, i):
+        """Whether only whitespace separates token i from token i + 1, after the dot of an abbreviation ("B.S.")."""
+        if i + 1 >= len(self.tokens):
+            return False
+        gap = self.text[self.ends[i]:self.starts[i + 1]]
+        if '.' in self.tokens[i]:
+            gap = gap[1:] if gap.startswith('.') else gap
+        return gap.isspace()